@@ -19,10 +19,20 @@ import threading
 import os
 
 # Import from our modules
-from .config import CUSTOM_EVENT_ID, COMMANDS_FILE, STATUS_FILE
-from .utils import write_json
-from .core import PollingThread, ThreadEventHandler
-from .commands import execute_command
+from .config import (
+    CUSTOM_EVENT_ID, COMMANDS_FILE,
+    SOCKET_ENABLED, SOCKET_FAMILY, SOCKET_PATH, SOCKET_HOST, SOCKET_PORT,
+    RING_ENABLED, RING_FILE, RING_CAPACITY, RING_IDLE_SLEEP,
+    METRICS_ENABLED, METRICS_WINDOW, THREAD_JOIN_TIMEOUT
+)
+from .core import (
+    CommandQueue, Metrics, PollingThread, RingServer, SocketServer, ThreadEventHandler,
+    register_design_events, unregister_design_events, write_status
+)
+from .commands import (
+    execute_command, execute_jsonrpc, respond_inline, design_changed, action_lane,
+    THREAD_SAFE_ACTIONS
+)
 
 # Global references (required for Fusion 360 add-in lifecycle)
 app = None
@@ -30,6 +40,10 @@ ui = None
 handlers = []
 stop_flag = None
 custom_event = None
+design_events = []
+threads = []
+socket_server = None
+ring_server = None
 
 
 def _create_command_executor():
@@ -39,37 +53,81 @@ def _create_command_executor():
     return executor
 
 
+def _create_rpc_executor():
+    """Create a JSON-RPC executor closure that captures app and ui."""
+    def executor(payload):
+        return execute_jsonrpc(payload, app, ui)
+    return executor
+
+
 def run(context):
     """Called when add-in starts."""
-    global app, ui, custom_event, stop_flag, handlers
+    global app, ui, custom_event, stop_flag, handlers, design_events, threads
+    global socket_server, ring_server
 
     try:
         app = adsk.core.Application.get()
         ui = app.userInterface
 
         # Write status
-        write_json(STATUS_FILE, {"status": "running", "message": "Bridge active"})
+        write_status("running", "Bridge active")
 
         # Clear old commands
         if os.path.exists(COMMANDS_FILE):
             os.remove(COMMANDS_FILE)
 
+        # Queue of parsed commands handed from the polling thread to the main
+        # thread. Health checks (ping, get_result, cancel) are answered on the
+        # receiving thread without waiting for the main thread.
+        command_queue = CommandQueue(app, action_lane, THREAD_SAFE_ACTIONS, respond_inline)
+        stop_flag = threading.Event()
+
+        # Optional transports are set up before anything is started, so a
+        # failure to bind (port in use, stale socket file) leaves nothing
+        # half-initialised
+        if SOCKET_ENABLED:
+            # Local socket transport next to the file IPC
+            socket_server = SocketServer(
+                stop_flag, command_queue, SOCKET_FAMILY, SOCKET_PATH, SOCKET_HOST, SOCKET_PORT
+            )
+            socket_server.bind()
+        if RING_ENABLED:
+            # Shared-memory ring transport for high-rate command streams
+            ring_server = RingServer(
+                stop_flag, command_queue, RING_FILE, RING_CAPACITY, RING_IDLE_SLEEP
+            )
+
         # Register custom event
         custom_event = app.registerCustomEvent(CUSTOM_EVENT_ID)
 
+        # Throughput/latency collector reported in bridge_status.json
+        metrics = Metrics(METRICS_WINDOW) if METRICS_ENABLED else None
+
         # Create event handler with command executor
-        event_handler = ThreadEventHandler(_create_command_executor())
+        event_handler = ThreadEventHandler(
+            _create_command_executor(), command_queue, _create_rpc_executor(), metrics
+        )
         custom_event.add(event_handler)
         handlers.append(event_handler)
 
-        # Start polling thread
-        stop_flag = threading.Event()
-        polling_thread = PollingThread(stop_flag, app)
+        # Edits made in the Fusion UI invalidate cached results and the entity index
+        design_events = register_design_events(app, ui, design_changed)
+
+        # Start polling thread and transports
+        polling_thread = PollingThread(stop_flag, app, command_queue, metrics)
         polling_thread.start()
+        threads.append(polling_thread)
+        for server in (socket_server, ring_server):
+            if server is not None:
+                server.start()
+                threads.append(server)
+
+        if SOCKET_ENABLED or RING_ENABLED:
+            write_status("running", "Bridge active")
 
         ui.messageBox(
             "Claude Bridge is active!\n\n"
-            "Commands are checked every second.\n"
+            "Commands are picked up as soon as they are written.\n"
             "Claude can now send commands.",
             "Claude Bridge"
         )
@@ -77,16 +135,32 @@ def run(context):
     except:
         if ui:
             ui.messageBox(f'Failed:\n{traceback.format_exc()}')
+        # Undo whatever was set up before the failure
+        stop(context)
 
 
 def stop(context):
     """Called when add-in stops."""
-    global stop_flag, custom_event, handlers
+    global stop_flag, custom_event, handlers, design_events, threads
+    global socket_server, ring_server
 
     try:
-        # Stop the thread
+        # Stop the threads, and let them finish so none writes status after us
         if stop_flag:
             stop_flag.set()
+        for thread in threads:
+            thread.join(THREAD_JOIN_TIMEOUT)
+        threads = []
+        # Release endpoints of transports that never started (running ones
+        # clean up on their own way out)
+        for server in (socket_server, ring_server):
+            if server is not None and not server.is_alive():
+                server.close()
+        socket_server = None
+        ring_server = None
+
+        unregister_design_events(design_events)
+        design_events = []
 
         # Unregister event
         if custom_event and handlers:
@@ -96,7 +170,7 @@ def stop(context):
 
         handlers = []
 
-        write_json(STATUS_FILE, {"status": "stopped", "message": "Bridge stopped"})
+        write_status("stopped", "Bridge stopped")
 
     except:
         pass
@@ -0,0 +1,31 @@
+"""
+Async Python client for the Claude Bridge add-in.
+
+Wraps the bridge protocols (command/result journals, local socket) behind
+an asyncio API with automatic ids, many commands in flight, and per-call
+timeouts. Uses only the standard library, so it can be imported outside
+Fusion 360.
+
+Modules:
+- client: BridgeClient, CommandError
+- transports: FileTransport, SocketTransport, RingTransport
+- ring: Shared-memory ring layout (also used by the add-in)
+- codec: MessagePack encoding with packed float arrays, compression helpers
+  and load_file for session files (also used by the add-in)
+"""
+
+from .client import BridgeClient, CommandError
+from .transports import FileTransport, SocketTransport, RingTransport
+from .codec import packb, unpackb, decompress_record, load_file
+
+__all__ = [
+    'BridgeClient',
+    'CommandError',
+    'FileTransport',
+    'SocketTransport',
+    'RingTransport',
+    'packb',
+    'unpackb',
+    'decompress_record',
+    'load_file',
+]
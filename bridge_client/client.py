@@ -0,0 +1,202 @@
+"""
+Asyncio client for the Claude Bridge add-in.
+"""
+
+import asyncio
+import itertools
+import time
+
+from .codec import decompress_record
+from .transports import FileTransport, SocketTransport, RingTransport
+
+
+class CommandError(Exception):
+    """Raised when the add-in reports that a command failed."""
+
+    def __init__(self, command_id, action, message, record=None):
+        super().__init__(f"{action} (id {command_id}) failed: {message}")
+        self.command_id = command_id
+        self.action = action
+        self.record = record
+
+
+class BridgeClient:
+    """
+    Send commands to the add-in and await their results.
+
+    Ids are allocated automatically and many commands may be in flight at
+    once; each call resolves when the result with its command_id arrives.
+    Compressed payloads (config COMPRESSION) are decompressed transparently.
+
+    Usage:
+        async with BridgeClient.file("/path/to/ClaudeBridge") as bridge:
+            sketch = await bridge.call("create_sketch", {"plane": "xy"})
+            await asyncio.gather(*(
+                bridge.call("draw_circle", {"x": i, "radius": 0.4})
+                for i in range(10)
+            ))
+    """
+
+    def __init__(self, transport, default_timeout=30.0, client=None):
+        """
+        Args:
+            transport: FileTransport, SocketTransport or RingTransport
+            default_timeout: Seconds to wait for a result when call() is not
+                             given an explicit timeout (None waits forever)
+            client: Optional client id. Each client has its own id sequence
+                    and fair share of the main thread, so several agents can
+                    drive one bridge without colliding.
+        """
+        self.transport = transport
+        self.default_timeout = default_timeout
+        self.client = client
+        # Millisecond start keeps ids increasing across client runs
+        self._ids = itertools.count(int(time.time() * 1000))
+        self._pending = {}
+
+    @classmethod
+    def file(cls, base_dir, **kwargs):
+        """Client using the commands.jsonl / results.jsonl file protocol."""
+        return cls(FileTransport(base_dir), **kwargs)
+
+    @classmethod
+    def socket(cls, base_dir, encoding="json", **kwargs):
+        """Client using the socket endpoint published in bridge_status.json."""
+        return cls(SocketTransport.from_status(base_dir, encoding=encoding), **kwargs)
+
+    @classmethod
+    def ring(cls, base_dir, encoding="json", **kwargs):
+        """Client using the shared-memory ring published in bridge_status.json."""
+        return cls(RingTransport.from_status(base_dir, encoding=encoding), **kwargs)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        await self.transport.open(self._on_record)
+
+    async def close(self):
+        await self.transport.close()
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def submit(self, action, params=None, on_partial=None, deadline=None):
+        """
+        Send a command without waiting for it.
+
+        Args:
+            action: Command action name
+            params: Command params dict
+            on_partial: Optional callable receiving partial records of a
+                        streaming command as they arrive
+            deadline: Optional Unix time after which the add-in skips the
+                      command instead of starting it
+
+        Returns:
+            asyncio.Future resolving to the full (final) result record
+        """
+        command_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = (future, action, on_partial)
+        # Forget the id once resolved, cancelled or timed out
+        future.add_done_callback(lambda _: self._pending.pop(command_id, None))
+        cmd = {"id": command_id, "action": action, "params": params or {}}
+        if self.client is not None:
+            cmd["client"] = self.client
+        if deadline is not None:
+            cmd["deadline"] = deadline
+        try:
+            await self.transport.send(cmd)
+        except Exception:
+            del self._pending[command_id]
+            raise
+        return future
+
+    async def call(self, action, params=None, timeout=None):
+        """
+        Send a command and wait for its result.
+
+        The timeout is also sent as the command's deadline, so a command
+        still queued when the caller gives up is skipped, not run.
+
+        Args:
+            action: Command action name
+            params: Command params dict
+            timeout: Seconds to wait (defaults to default_timeout)
+
+        Returns:
+            The command's result payload
+
+        Raises:
+            CommandError: If the command reported failure
+            asyncio.TimeoutError: If no result arrived in time
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.time() + timeout if timeout is not None else None
+        future = await self.submit(action, params, deadline=deadline)
+        record = await asyncio.wait_for(future, timeout)
+        if not record.get("success"):
+            raise CommandError(record.get("command_id"), action, record.get("error"), record)
+        return record.get("result")
+
+    async def stream(self, action, params=None, timeout=None):
+        """
+        Run a paged command with stream=true and yield each chunk as it arrives.
+
+        Args:
+            action: Command action name (e.g. "get_sketch_constraints")
+            params: Command params dict (limit/cursor/chunk_size allowed)
+            timeout: Seconds to wait for each chunk (defaults to default_timeout)
+
+        Yields:
+            Each chunk's result payload (e.g. {"constraints": [...]})
+
+        Raises:
+            CommandError: If the command reported failure
+            asyncio.TimeoutError: If a chunk or the final result is late
+        """
+        chunks = asyncio.Queue()
+        future = await self.submit(action, dict(params or {}, stream=True),
+                                   on_partial=chunks.put_nowait)
+        timeout = self.default_timeout if timeout is None else timeout
+        while True:
+            if not chunks.empty():
+                yield chunks.get_nowait()["result"]
+                continue
+            if future.done():
+                break
+            getter = asyncio.ensure_future(chunks.get())
+            done, _ = await asyncio.wait({getter, future}, timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()["result"]
+                continue
+            getter.cancel()
+            if not done:
+                future.cancel()
+                raise asyncio.TimeoutError()
+        record = future.result()
+        if not record.get("success"):
+            raise CommandError(record.get("command_id"), action, record.get("error"), record)
+
+    def _on_record(self, record):
+        if record.get("client") != self.client:
+            return  # Another client's id space
+        command_id = record.get("command_id")
+        if record.get("partial"):
+            entry = self._pending.get(command_id)
+            if entry and entry[2]:
+                entry[2](decompress_record(record))
+            return
+        entry = self._pending.pop(command_id, None)
+        if entry is None:
+            return  # Not ours (another client, or an earlier timed-out call)
+        future = entry[0]
+        if not future.done():
+            future.set_result(decompress_record(record))
@@ -0,0 +1,357 @@
+"""
+Compact binary message encoding (MessagePack-compatible, pure Python).
+
+Used by the socket and ring transports and by export_session as an
+alternative to pretty-printed JSON. Output is standard MessagePack, plus two
+extension types for geometry:
+
+- EXT_FLOAT_ARRAY (1): a list of floats, stored as packed little-endian float64
+- EXT_POINT_ARRAY (2): a list of equal-length float lists (e.g. [x, y, z]
+  points), stored as u32 width + packed float64 values
+
+Any MessagePack library can read the output; the extensions decode to
+(width, bytes) there, and to plain lists here.
+
+Messages are told apart by their first byte: 0x80-0x9f and 0xdc-0xdf
+begin a MessagePack map or array and never begin JSON text. Anything else
+is read as JSON, falling back to MessagePack when it does not parse (a
+bare MessagePack integer such as 123 is the byte '{').
+
+Also holds the optional zlib/gzip compression used for large result
+payloads and session files, so the client can undo it transparently.
+"""
+
+import base64
+import gzip
+import json
+import os
+import struct
+import zlib
+
+EXT_FLOAT_ARRAY = 1
+EXT_POINT_ARRAY = 2
+
+_U32 = struct.Struct("<I")
+
+
+def _float_list(value):
+    return len(value) >= 2 and all(type(v) is float for v in value)
+
+
+def _point_list(value):
+    if len(value) < 2 or type(value[0]) is not list:
+        return 0
+    width = len(value[0])
+    if width == 0:
+        return 0
+    for row in value:
+        if type(row) is not list or len(row) != width or not all(type(v) is float for v in row):
+            return 0
+    return width
+
+
+class _Packer:
+    def __init__(self):
+        self.out = bytearray()
+
+    def pack(self, obj):
+        out = self.out
+        t = type(obj)
+        if obj is None:
+            out.append(0xc0)
+        elif t is bool:
+            out.append(0xc3 if obj else 0xc2)
+        elif t is int:
+            self._int(obj)
+        elif t is float:
+            out.append(0xcb)
+            out += struct.pack(">d", obj)
+        elif t is str:
+            data = obj.encode("utf-8")
+            n = len(data)
+            if n < 32:
+                out.append(0xa0 | n)
+            elif n < 0x100:
+                out += bytes((0xd9, n))
+            elif n < 0x10000:
+                out += b"\xda" + struct.pack(">H", n)
+            else:
+                out += b"\xdb" + struct.pack(">I", n)
+            out += data
+        elif t in (bytes, bytearray):
+            n = len(obj)
+            if n < 0x100:
+                out += bytes((0xc4, n))
+            elif n < 0x10000:
+                out += b"\xc5" + struct.pack(">H", n)
+            else:
+                out += b"\xc6" + struct.pack(">I", n)
+            out += obj
+        elif t in (list, tuple):
+            self._sequence(list(obj) if t is tuple else obj)
+        elif t is dict:
+            n = len(obj)
+            if n < 16:
+                out.append(0x80 | n)
+            elif n < 0x10000:
+                out += b"\xde" + struct.pack(">H", n)
+            else:
+                out += b"\xdf" + struct.pack(">I", n)
+            for key, value in obj.items():
+                self.pack(key if type(key) is str else str(key))
+                self.pack(value)
+        else:
+            raise TypeError(f"Cannot encode {t.__name__}")
+
+    def _int(self, n):
+        out = self.out
+        if 0 <= n < 0x80:
+            out.append(n)
+        elif -32 <= n < 0:
+            out.append(n & 0xff)
+        elif 0 <= n < 0x100000000:
+            out += b"\xce" + struct.pack(">I", n)
+        elif 0 <= n < 0x10000000000000000:
+            out += b"\xcf" + struct.pack(">Q", n)
+        elif -0x80000000 <= n < 0:
+            out += b"\xd2" + struct.pack(">i", n)
+        elif -0x8000000000000000 <= n < 0:
+            out += b"\xd3" + struct.pack(">q", n)
+        else:
+            raise OverflowError("Integer out of MessagePack range")
+
+    def _ext(self, code, data):
+        n = len(data)
+        if n < 0x100:
+            self.out += bytes((0xc7, n, code))
+        elif n < 0x10000:
+            self.out += b"\xc8" + struct.pack(">H", n) + bytes((code,))
+        else:
+            self.out += b"\xc9" + struct.pack(">I", n) + bytes((code,))
+        self.out += data
+
+    def _sequence(self, items):
+        if _float_list(items):
+            return self._ext(EXT_FLOAT_ARRAY, struct.pack(f"<{len(items)}d", *items))
+        width = _point_list(items)
+        if width:
+            flat = [v for row in items for v in row]
+            return self._ext(EXT_POINT_ARRAY,
+                             _U32.pack(width) + struct.pack(f"<{len(flat)}d", *flat))
+        n = len(items)
+        if n < 16:
+            self.out.append(0x90 | n)
+        elif n < 0x10000:
+            self.out += b"\xdc" + struct.pack(">H", n)
+        else:
+            self.out += b"\xdd" + struct.pack(">I", n)
+        for item in items:
+            self.pack(item)
+
+
+class _Unpacker:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def _take(self, n):
+        start = self.pos
+        self.pos += n
+        if self.pos > len(self.data):
+            raise ValueError("Truncated MessagePack data")
+        return self.data[start:self.pos]
+
+    def _unpack(self, fmt, size):
+        return struct.unpack(fmt, self._take(size))[0]
+
+    def unpack(self):
+        b = self._take(1)[0]
+        if b < 0x80:
+            return b
+        if b >= 0xe0:
+            return b - 0x100
+        if 0x80 <= b <= 0x8f:
+            return self._map(b & 0x0f)
+        if 0x90 <= b <= 0x9f:
+            return [self.unpack() for _ in range(b & 0x0f)]
+        if 0xa0 <= b <= 0xbf:
+            return str(self._take(b & 0x1f), "utf-8")
+        simple = {0xc0: None, 0xc2: False, 0xc3: True}
+        if b in simple:
+            return simple[b]
+        sized = {
+            0xcc: (">B", 1), 0xcd: (">H", 2), 0xce: (">I", 4), 0xcf: (">Q", 8),
+            0xd0: (">b", 1), 0xd1: (">h", 2), 0xd2: (">i", 4), 0xd3: (">q", 8),
+            0xca: (">f", 4), 0xcb: (">d", 8),
+        }
+        if b in sized:
+            return self._unpack(*sized[b])
+        lengths = {0xd9: (">B", 1), 0xda: (">H", 2), 0xdb: (">I", 4)}
+        if b in lengths:
+            return str(self._take(self._unpack(*lengths[b])), "utf-8")
+        lengths = {0xc4: (">B", 1), 0xc5: (">H", 2), 0xc6: (">I", 4)}
+        if b in lengths:
+            return bytes(self._take(self._unpack(*lengths[b])))
+        if b in (0xdc, 0xdd):
+            n = self._unpack(">H", 2) if b == 0xdc else self._unpack(">I", 4)
+            return [self.unpack() for _ in range(n)]
+        if b in (0xde, 0xdf):
+            return self._map(self._unpack(">H", 2) if b == 0xde else self._unpack(">I", 4))
+        lengths = {0xc7: (">B", 1), 0xc8: (">H", 2), 0xc9: (">I", 4)}
+        if b in lengths:
+            n = self._unpack(*lengths[b])
+            code = self._take(1)[0]
+            return self._decode_ext(code, self._take(n))
+        fixext = {0xd4: 1, 0xd5: 2, 0xd6: 4, 0xd7: 8, 0xd8: 16}
+        if b in fixext:
+            code = self._take(1)[0]
+            return self._decode_ext(code, self._take(fixext[b]))
+        raise ValueError(f"Unsupported MessagePack type byte 0x{b:02x}")
+
+    def _map(self, n):
+        result = {}
+        for _ in range(n):
+            key = self.unpack()
+            result[key] = self.unpack()
+        return result
+
+    @staticmethod
+    def _decode_ext(code, data):
+        if code == EXT_FLOAT_ARRAY:
+            if len(data) % 8:
+                raise ValueError("Float array length is not a multiple of 8")
+            return list(struct.unpack(f"<{len(data) // 8}d", data))
+        if code == EXT_POINT_ARRAY:
+            if len(data) < 4 or (len(data) - 4) % 8:
+                raise ValueError("Malformed point array")
+            (width,) = _U32.unpack_from(data)
+            count = (len(data) - 4) // 8
+            if width == 0 or count % width:
+                raise ValueError(f"Point array width {width} does not divide {count} values")
+            flat = struct.unpack(f"<{count}d", data[4:])
+            return [list(flat[i:i + width]) for i in range(0, count, width)]
+        return (code, bytes(data))
+
+
+def packb(obj):
+    """Encode an object as MessagePack bytes."""
+    packer = _Packer()
+    packer.pack(obj)
+    return bytes(packer.out)
+
+
+def unpackb(data):
+    """
+    Decode MessagePack bytes produced by packb (or any MessagePack encoder).
+
+    Raises:
+        ValueError: For any malformed input (truncated, unsupported type,
+                    unhashable map key, bad extension payload, too deep)
+    """
+    unpacker = _Unpacker(data)
+    try:
+        obj = unpacker.unpack()
+    except (struct.error, TypeError, RecursionError) as e:
+        raise ValueError(f"Malformed MessagePack data: {e}") from e
+    if unpacker.pos != len(unpacker.data):
+        raise ValueError("Extra data after MessagePack object")
+    return obj
+
+
+def encode_message(obj, encoding="json"):
+    """Encode a transport message as compact JSON or MessagePack."""
+    if encoding == "msgpack":
+        return packb(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def decode_message(body):
+    """
+    Decode a transport message, detecting its encoding.
+
+    Returns:
+        tuple: (object, "json" or "msgpack")
+
+    Raises:
+        ValueError: If the body is not valid JSON or MessagePack
+    """
+    body = bytes(body)
+    if body[:1] and (0x80 <= body[0] <= 0x9f or 0xdc <= body[0] <= 0xdf):
+        return unpackb(body), "msgpack"
+    try:
+        return json.loads(body), "json"
+    except ValueError:
+        pass
+    return unpackb(body), "msgpack"
+
+
+# Compression codecs and the file suffix each one adds
+COMPRESSIONS = {"gzip": ".gz", "zlib": ".zz"}
+
+
+def compress(data, codec):
+    """Compress bytes with "gzip" or "zlib"."""
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == "zlib":
+        return zlib.compress(data, 6)
+    raise ValueError(f"Unknown compression: {codec}. Use gzip or zlib")
+
+
+def decompress(data, codec):
+    """Undo compress()."""
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown compression: {codec}")
+
+
+def compress_record(record, codec, min_bytes):
+    """
+    Compress a result record's payload if its JSON is at least min_bytes.
+
+    The compressed record keeps command_id/success/error readable; "result"
+    becomes a base64 string of the compressed JSON and "compression" names
+    the codec.
+
+    Returns:
+        The original record, or a compressed copy
+    """
+    if not codec or record.get("result") is None:
+        return record
+    data = json.dumps(record["result"], separators=(",", ":")).encode("utf-8")
+    if len(data) < min_bytes:
+        return record
+    packed = dict(record)
+    packed["result"] = base64.b64encode(compress(data, codec)).decode("ascii")
+    packed["compression"] = codec
+    return packed
+
+
+def decompress_record(record):
+    """Return a record with its payload decompressed (no-op if it is not compressed)."""
+    codec = record.get("compression") if isinstance(record, dict) else None
+    if not codec:
+        return record
+    unpacked = dict(record)
+    del unpacked["compression"]
+    unpacked["result"] = json.loads(decompress(base64.b64decode(record["result"]), codec))
+    return unpacked
+
+
+def load_file(path):
+    """
+    Read a session file written as .json or .msgpack, optionally .gz/.zz compressed.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    root, ext = os.path.splitext(path)
+    for codec, suffix in COMPRESSIONS.items():
+        if ext == suffix:
+            data = decompress(data, codec)
+            root, ext = os.path.splitext(root)
+            break
+    if ext == ".msgpack":
+        return unpackb(data)
+    return json.loads(data)
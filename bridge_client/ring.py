@@ -0,0 +1,201 @@
+"""
+Shared-memory ring buffers used by the ring transport.
+
+A single memory-mapped file (bridge.ring) holds two single-producer /
+single-consumer byte rings: requests (client -> add-in) and responses
+(add-in -> client). Both sides only touch the mapped memory after setup,
+so new entries are detected without any filesystem calls.
+
+Layout:
+    [file header 64B][request ring header 64B][response ring header 64B]
+    [request data (capacity)][response data (capacity)]
+
+The rings have exactly one producer and one consumer each, so only one
+client may be attached at a time. A client holds an exclusive lock on
+bridge.ring.lock while attached (released by the OS if it dies), and a
+second client is refused with ConnectionError.
+
+Ring header: head (bytes ever written), tail (bytes ever consumed) and the
+next record sequence number, all little-endian u64. Records are 8-byte
+aligned: u32 length, u32 reserved, u64 sequence, payload. A length of
+WRAP_MARKER means "skip to the start of the data area".
+"""
+
+import mmap
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MAGIC = b"CBRING01"
+FILE_HEADER = struct.Struct("<8sII")
+RING_HEADER = struct.Struct("<QQQ")
+RECORD_HEADER = struct.Struct("<IIQ")
+HEADER_BLOCK = 64
+WRAP_MARKER = 0xFFFFFFFF
+
+
+def _align8(n):
+    return (n + 7) & ~7
+
+
+def _try_lock(f):
+    """Take an exclusive lock on an open file without blocking; False if it is held."""
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+class ByteRing:
+    """One SPSC ring inside a shared mapping."""
+
+    def __init__(self, buf, header_offset, data_offset, capacity):
+        self.buf = buf
+        self.header_offset = header_offset
+        self.data_offset = data_offset
+        self.capacity = capacity
+
+    def _header(self):
+        return RING_HEADER.unpack_from(self.buf, self.header_offset)
+
+    def _store(self, index, value):
+        struct.pack_into("<Q", self.buf, self.header_offset + 8 * index, value)
+
+    def pending(self):
+        """Return True if there is at least one unread record."""
+        head, tail, _ = self._header()
+        return head != tail
+
+    def write(self, payload):
+        """
+        Append one record.
+
+        Returns:
+            int sequence number, or None if the ring is currently full
+
+        Raises:
+            ValueError: If the payload can never fit in the ring
+        """
+        need = _align8(RECORD_HEADER.size + len(payload))
+        if need > self.capacity // 2:
+            raise ValueError(f"Message of {len(payload)} bytes exceeds ring capacity")
+
+        head, tail, seq = self._header()
+        pos = head % self.capacity
+        to_end = self.capacity - pos
+        wrap = to_end if to_end < need else 0
+        if self.capacity - (head - tail) < need + wrap:
+            return None
+
+        if wrap:
+            struct.pack_into("<I", self.buf, self.data_offset + pos, WRAP_MARKER)
+            head += wrap
+            pos = 0
+        start = self.data_offset + pos
+        RECORD_HEADER.pack_into(self.buf, start, len(payload), 0, seq)
+        self.buf[start + RECORD_HEADER.size:start + RECORD_HEADER.size + len(payload)] = payload
+        self._store(2, seq + 1)
+        # Publishing head last makes the record visible to the consumer
+        self._store(0, head + need)
+        return seq
+
+    def read(self):
+        """
+        Consume one record.
+
+        Returns:
+            (sequence, payload bytes), or None if the ring is empty
+        """
+        head, tail, _ = self._header()
+        while tail != head:
+            pos = tail % self.capacity
+            start = self.data_offset + pos
+            (length,) = struct.unpack_from("<I", self.buf, start)
+            if length == WRAP_MARKER:
+                tail += self.capacity - pos
+                self._store(1, tail)
+                continue
+            _, _, seq = RECORD_HEADER.unpack_from(self.buf, start)
+            body = start + RECORD_HEADER.size
+            payload = bytes(self.buf[body:body + length])
+            self._store(1, tail + _align8(RECORD_HEADER.size + length))
+            return seq, payload
+        return None
+
+
+class SharedRings:
+    """The mapped bridge.ring file with its request and response rings."""
+
+    def __init__(self, path, capacity=None, create=False):
+        """
+        Args:
+            path: Ring file path
+            capacity: Bytes per ring (required when creating)
+            create: Create/reset the file (add-in side) instead of attaching
+
+        Raises:
+            ConnectionError: When attaching while another client is attached
+            ValueError: If path is not a ring file
+        """
+        self.path = path
+        self._lock = None
+        if create:
+            capacity = _align8(capacity)
+            size = HEADER_BLOCK * 3 + capacity * 2
+            with open(path, 'wb') as f:
+                f.truncate(size)
+        else:
+            # Single client: the request ring has one producer, and the
+            # response ring one consumer
+            self._lock = open(f"{path}.lock", 'a+b')
+            if not _try_lock(self._lock):
+                self._release()
+                raise ConnectionError(f"{path} is already attached to another client")
+        try:
+            self._file = open(path, 'r+b')
+        except OSError:
+            self._release()
+            raise
+        try:
+            self.buf = mmap.mmap(self._file.fileno(), 0)
+        except (OSError, ValueError):
+            self._file.close()
+            self._release()
+            raise
+        if create:
+            FILE_HEADER.pack_into(self.buf, 0, MAGIC, 1, capacity)
+        magic, _, capacity = FILE_HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a bridge ring file")
+        self.capacity = capacity
+        data_start = HEADER_BLOCK * 3
+        self.requests = ByteRing(self.buf, HEADER_BLOCK, data_start, capacity)
+        self.responses = ByteRing(self.buf, HEADER_BLOCK * 2, data_start + capacity, capacity)
+
+    def _release(self):
+        if self._lock:
+            self._lock.close()  # Releases the client lock
+            self._lock = None
+
+    def close(self):
+        self.buf.close()
+        self._file.close()
+        self._release()
+
+    def remove(self):
+        """Close the mapping and delete the ring file."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,234 @@
+"""
+Transports used by BridgeClient to reach the add-in.
+
+- FileTransport: commands.jsonl / results.jsonl
+- SocketTransport: length-prefixed JSON or MessagePack over a local socket
+- RingTransport: shared-memory rings in bridge.ring
+
+The socket and ring transports take encoding="msgpack" to exchange compact
+binary messages (see codec.py); responses are decoded either way.
+
+Each transport has the same small asyncio interface:
+    await transport.open(on_record)   # on_record(dict) is called per result
+    await transport.send(cmd)         # cmd: {"id", "action", "params"}
+    await transport.close()
+"""
+
+import asyncio
+import json
+import os
+import struct
+
+from .codec import decode_message, encode_message
+from .ring import SharedRings
+
+_HEADER = struct.Struct(">I")
+
+
+class FileTransport:
+    """
+    File protocol: append to commands.jsonl, tail results.jsonl.
+
+    Only results written after open() are reported, so ids from earlier
+    sessions never resolve a new call.
+    """
+
+    def __init__(self, base_dir, poll_interval=0.005):
+        """
+        Args:
+            base_dir: The add-in directory (where commands.jsonl lives)
+            poll_interval: Seconds between checks of results.jsonl
+        """
+        self.commands_path = os.path.join(base_dir, "commands.jsonl")
+        self.results_path = os.path.join(base_dir, "results.jsonl")
+        self.poll_interval = poll_interval
+        self._task = None
+        self._offset = 0
+        self._inode = None
+        self._partial = b""
+
+    async def open(self, on_record):
+        try:
+            st = os.stat(self.results_path)
+            self._offset, self._inode = st.st_size, st.st_ino
+        except OSError:
+            self._offset, self._inode = 0, None
+        self._task = asyncio.ensure_future(self._tail(on_record))
+
+    async def send(self, cmd):
+        line = (json.dumps(cmd, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(self.commands_path, 'ab') as f:
+            f.write(line)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _read_from(self, path, offset):
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                return f.read()
+        except OSError:
+            return b""
+
+    def _rotated_path(self):
+        root, ext = os.path.splitext(self.results_path)
+        return f"{root}.1{ext}"
+
+    def _poll(self):
+        """Return new complete lines from results.jsonl (following rotation)."""
+        try:
+            st = os.stat(self.results_path)
+        except OSError:
+            return []
+        data = b""
+        if self._inode is not None and st.st_ino != self._inode:
+            # Rotated: finish the old file (now results.1.jsonl) first
+            data = self._read_from(self._rotated_path(), self._offset)
+            self._offset = 0
+        elif st.st_size < self._offset:
+            # Truncated in place (rotation without backups): start over
+            self._offset = 0
+            self._partial = b""
+        self._inode = st.st_ino
+        if st.st_size > self._offset:
+            chunk = self._read_from(self.results_path, self._offset)
+            self._offset += len(chunk)
+            data += chunk
+        if not data:
+            return []
+        data = self._partial + data
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        return data[:end].splitlines()
+
+    async def _tail(self, on_record):
+        while True:
+            for line in self._poll():
+                try:
+                    on_record(json.loads(line))
+                except ValueError:
+                    continue
+            await asyncio.sleep(self.poll_interval)
+
+
+class SocketTransport:
+    """Socket protocol: length-prefixed messages over a Unix socket or loopback TCP."""
+
+    def __init__(self, path=None, host=None, port=None, encoding="json"):
+        """
+        Args:
+            path: Unix socket path, or
+            host/port: Loopback TCP endpoint
+            encoding: "json" or "msgpack" for requests (and therefore responses)
+        """
+        self.path = path
+        self.host = host
+        self.port = port
+        self.encoding = encoding
+        self._reader = None
+        self._writer = None
+        self._task = None
+
+    @classmethod
+    def from_status(cls, base_dir, **kwargs):
+        """Create a transport from the endpoint published in bridge_status.json."""
+        with open(os.path.join(base_dir, "bridge_status.json"), 'r') as f:
+            endpoint = json.load(f).get("socket")
+        if not endpoint:
+            raise ConnectionError("Socket transport is not enabled in the add-in")
+        if endpoint["family"] == "unix":
+            return cls(path=endpoint["path"], **kwargs)
+        return cls(host=endpoint["host"], port=endpoint["port"], **kwargs)
+
+    async def open(self, on_record):
+        if self.path:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._task = asyncio.ensure_future(self._read_loop(on_record))
+
+    async def send(self, cmd):
+        body = encode_message(cmd, self.encoding)
+        self._writer.write(_HEADER.pack(len(body)) + body)
+        await self._writer.drain()
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, ConnectionError):
+                pass
+
+    async def _read_loop(self, on_record):
+        try:
+            while True:
+                header = await self._reader.readexactly(_HEADER.size)
+                (length,) = _HEADER.unpack(header)
+                on_record(decode_message(await self._reader.readexactly(length))[0])
+        except asyncio.IncompleteReadError:
+            pass
+
+
+class RingTransport:
+    """Shared-memory protocol: the request/response rings in bridge.ring."""
+
+    def __init__(self, path, idle_sleep=0.001, encoding="json"):
+        """
+        Args:
+            path: Ring file created by the add-in (see bridge_status.json "ring")
+            idle_sleep: Longest sleep between response checks when idle
+            encoding: "json" or "msgpack" for requests (and therefore responses)
+        """
+        self.path = path
+        self.idle_sleep = idle_sleep
+        self.encoding = encoding
+        self.rings = None
+        self._task = None
+
+    @classmethod
+    def from_status(cls, base_dir, **kwargs):
+        """Create a transport from the ring published in bridge_status.json."""
+        with open(os.path.join(base_dir, "bridge_status.json"), 'r') as f:
+            ring = json.load(f).get("ring")
+        if not ring:
+            raise ConnectionError("Ring transport is not enabled in the add-in")
+        return cls(ring["path"], **kwargs)
+
+    async def open(self, on_record):
+        self.rings = SharedRings(self.path)
+        self._task = asyncio.ensure_future(self._read_loop(on_record))
+
+    async def send(self, cmd):
+        body = encode_message(cmd, self.encoding)
+        while self.rings.requests.write(body) is None:
+            await asyncio.sleep(self.idle_sleep)  # Ring full: wait for the add-in
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self.rings:
+            self.rings.close()
+
+    async def _read_loop(self, on_record):
+        sleep = 0.0
+        while True:
+            entry = self.rings.responses.read()
+            if entry is None:
+                sleep = min(self.idle_sleep, sleep * 2 or 0.00005)
+                await asyncio.sleep(sleep)
+                continue
+            sleep = 0.0
+            on_record(decode_message(entry[1])[0])
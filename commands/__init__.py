@@ -8,9 +8,13 @@ Architecture:
     commands/
     ├── __init__.py          # This file - command registry
     ├── dispatcher.py        # Central command routing
+    ├── control.py           # batch, cancel
+    ├── jsonrpc.py           # JSON-RPC 2.0 front end (method -> action)
     ├── context.py           # Fusion 360 API abstraction
     ├── basic.py             # ping, message
     ├── parameters.py        # set_parameter
+    ├── results.py           # get_result (result journal lookup)
+    ├── profiling.py         # set_profiling, cProfile capture per action
     ├── helpers/             # Shared utilities
     │   ├── geometry.py      # Face/edge/body selection
     │   └── validation.py    # Parameter validation
@@ -41,9 +45,27 @@ To add a new command:
     3. The registry automatically merges all COMMANDS
 """
 
+# Unified command registry, filled from every command module below. Defined
+# first because the dispatcher (used by control.py) looks handlers up here.
+COMMAND_REGISTRY = {}
+
+
+def get_handler(action: str):
+    """Get the handler function for a given action."""
+    return COMMAND_REGISTRY.get(action)
+
+
+def list_actions():
+    """Return list of all registered action names."""
+    return list(COMMAND_REGISTRY.keys())
+
+
 # Core modules (kept at root level)
 from .basic import COMMANDS as BASIC_COMMANDS
+from .control import COMMANDS as CONTROL_COMMANDS
 from .parameters import COMMANDS as PARAM_COMMANDS
+from .results import COMMANDS as RESULT_COMMANDS
+from .profiling import COMMANDS as PROFILING_COMMANDS
 
 # Sub-module packages
 from .queries import COMMANDS as QUERY_COMMANDS
@@ -55,9 +77,11 @@ from .assembly import COMMANDS as ASSEMBLY_COMMANDS
 from .export import COMMANDS as EXPORT_COMMANDS
 
 # Build the unified command registry
-COMMAND_REGISTRY = {}
 COMMAND_REGISTRY.update(BASIC_COMMANDS)
+COMMAND_REGISTRY.update(CONTROL_COMMANDS)
 COMMAND_REGISTRY.update(PARAM_COMMANDS)
+COMMAND_REGISTRY.update(RESULT_COMMANDS)
+COMMAND_REGISTRY.update(PROFILING_COMMANDS)
 COMMAND_REGISTRY.update(QUERY_COMMANDS)
 COMMAND_REGISTRY.update(SKETCH_COMMANDS)
 COMMAND_REGISTRY.update(FEATURE_COMMANDS)
@@ -66,16 +90,8 @@ COMMAND_REGISTRY.update(TIMELINE_COMMANDS)
 COMMAND_REGISTRY.update(ASSEMBLY_COMMANDS)
 COMMAND_REGISTRY.update(EXPORT_COMMANDS)
 
-
-def get_handler(action: str):
-    """Get the handler function for a given action."""
-    return COMMAND_REGISTRY.get(action)
-
-
-def list_actions():
-    """Return list of all registered action names."""
-    return list(COMMAND_REGISTRY.keys())
-
-
-# Export the dispatcher for use by the main module
-from .dispatcher import execute_command
+# Entry points used by the add-in
+from .dispatcher import (
+    execute_command, respond_inline, design_changed, action_lane, THREAD_SAFE_ACTIONS
+)
+from .jsonrpc import execute_jsonrpc
@@ -0,0 +1,236 @@
+"""
+Opt-in accounting of Fusion API property reads and method calls.
+
+With API_TRACE_ENABLED in config.py, CommandContext wraps the app in an
+ApiProxy. Every adsk object reached through it (design, components,
+collections, bodies, points, ...) is wrapped too, so each property read,
+property write and method call is counted against the running command:
+per action, per API attribute ("BRepFace.geometry") and per call site
+("commands/queries/bodies.py:15 _get_body_info"). The polling thread
+writes the summary to API_TRACE_FILE, which makes N+1 access patterns
+(reading a property per item inside a loop) easy to find.
+
+Proxies are unwrapped before they are passed to the API. Code that hands
+entities to objects created outside the proxy (ObjectCollection.create())
+or casts them must use unwrap() and cast() from this module; both are
+no-ops when tracing is off.
+
+Tracing costs a frame lookup per API access; leave it off in normal use.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from ..config import BASE_DIR
+from ..utils import write_json_atomic
+
+
+class ApiTrace:
+    """Thread-safe per-action counters of API accesses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._actions = {}
+        self.version = 0
+        self._written = None
+
+    @contextmanager
+    def command(self, action):
+        """
+        Count API accesses made on this thread while the block runs.
+
+        Commands nest (batch steps); each access is counted for the
+        innermost running command only.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        counts = Counter()
+        stack.append(counts)
+        try:
+            yield counts
+        finally:
+            stack.pop()
+            self._merge(action, counts)
+
+    def record(self, kind, attribute, frame):
+        """
+        Count one access for the running command (ignored outside commands).
+
+        Args:
+            kind: "get", "set" or "call"
+            attribute: API attribute, e.g. "BRepBody.faces"
+            frame: Frame of the code that made the access
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            code = frame.f_code
+            stack[-1][(kind, attribute, code.co_filename, frame.f_lineno, code.co_name)] += 1
+
+    def _merge(self, action, counts):
+        total = sum(counts.values())
+        with self._lock:
+            stats = self._actions.get(action)
+            if stats is None:
+                stats = self._actions[action] = {
+                    "commands": 0, "accesses": Counter(), "max": 0, "sites": Counter()
+                }
+            stats["commands"] += 1
+            stats["max"] = max(stats["max"], total)
+            stats["sites"].update(counts)
+            for (kind, _, _, _, _), count in counts.items():
+                stats["accesses"][kind] += count
+            self.version += 1
+
+    def snapshot(self, top):
+        """
+        Return the per-action summary.
+
+        Args:
+            top: Number of attributes and call sites listed per action
+
+        Returns:
+            Per action: commands traced, gets/sets/calls, average and max
+            accesses per command, and the most used attributes and call
+            sites with their counts
+        """
+        with self._lock:
+            actions = {}
+            for action, stats in self._actions.items():
+                attributes = Counter()
+                for (kind, attribute, _, _, _), count in stats["sites"].items():
+                    attributes[(kind, attribute)] += count
+                total = sum(stats["accesses"].values())
+                actions[action] = {
+                    "commands": stats["commands"],
+                    "gets": stats["accesses"]["get"],
+                    "sets": stats["accesses"]["set"],
+                    "calls": stats["accesses"]["call"],
+                    "per_command": round(total / stats["commands"], 1),
+                    "max_per_command": stats["max"],
+                    "top_attributes": [
+                        {"attribute": attribute, "kind": kind, "count": count}
+                        for (kind, attribute), count in attributes.most_common(top)
+                    ],
+                    "top_sites": [
+                        {"site": _site(filename, line, function), "attribute": attribute,
+                         "kind": kind, "count": count}
+                        for (kind, attribute, filename, line, function), count
+                        in stats["sites"].most_common(top)
+                    ],
+                }
+            return {"actions": actions}
+
+    def write(self, filepath, top):
+        """Write the summary to filepath if anything was traced since the last write."""
+        version = self.version
+        if version == self._written:
+            return
+        write_json_atomic(filepath, self.snapshot(top))
+        self._written = version
+
+
+def _site(filename, line, function):
+    """Format a call site relative to the add-in directory."""
+    try:
+        filename = os.path.relpath(filename, BASE_DIR)
+    except ValueError:
+        pass  # Other drive on Windows
+    return f"{filename.replace(os.sep, '/')}:{line} {function}"
+
+
+def _is_api_object(value):
+    return type(value).__module__.startswith("adsk.")
+
+
+def wrap(value):
+    """Wrap adsk objects (also inside lists and tuples) in an ApiProxy."""
+    if isinstance(value, (list, tuple)):
+        return type(value)(wrap(item) for item in value)
+    if _is_api_object(value):
+        return ApiProxy(value)
+    return value
+
+
+def unwrap(value):
+    """Return the adsk object behind an ApiProxy (also inside lists and tuples)."""
+    if isinstance(value, ApiProxy):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, (list, tuple)):
+        return type(value)(unwrap(item) for item in value)
+    return value
+
+
+def cast(cls, value):
+    """cls.cast(value), keeping the result traced if value was."""
+    if isinstance(value, ApiProxy):
+        return wrap(cls.cast(unwrap(value)))
+    return cls.cast(value)
+
+
+class ApiProxy:
+    """Counting stand-in for an adsk object; see the module docstring."""
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        object.__setattr__(self, "_target", target)
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, "_target")
+        value = getattr(target, name)
+        attribute = f"{type(target).__name__}.{name}"
+        if callable(value) and not _is_api_object(value):
+            def method(*args, **kwargs):
+                api_trace.record("call", attribute, sys._getframe(1))
+                return wrap(value(*unwrap(args), **{k: unwrap(v) for k, v in kwargs.items()}))
+            return method
+        api_trace.record("get", attribute, sys._getframe(1))
+        return wrap(value)
+
+    def __setattr__(self, name, value):
+        target = object.__getattribute__(self, "_target")
+        api_trace.record("set", f"{type(target).__name__}.{name}", sys._getframe(1))
+        setattr(target, name, unwrap(value))
+
+    def __iter__(self):
+        # Collections fetch each item from the API
+        target = object.__getattribute__(self, "_target")
+        attribute = f"{type(target).__name__}.item"
+        frame = sys._getframe(1)
+        for item in target:
+            api_trace.record("call", attribute, frame)
+            yield wrap(item)
+
+    def __len__(self):
+        target = object.__getattribute__(self, "_target")
+        api_trace.record("get", f"{type(target).__name__}.count", sys._getframe(1))
+        return len(target)
+
+    def __getitem__(self, index):
+        target = object.__getattribute__(self, "_target")
+        api_trace.record("call", f"{type(target).__name__}.item", sys._getframe(1))
+        return wrap(target[index])
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, "_target"))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, "_target") == unwrap(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, "_target"))
+
+    def __repr__(self):
+        return f"ApiProxy({object.__getattribute__(self, '_target')!r})"
+
+
+# Shared by all commands
+api_trace = ApiTrace()
@@ -6,7 +6,7 @@ import adsk.core
 import adsk.fusion
 
 from ...utils import write_result
-from ..helpers import get_construction_plane
+from ..helpers import get_construction_plane, entity_token
 
 
 def create_offset_plane(command_id, params, ctx):
@@ -21,6 +21,7 @@ def create_offset_plane(command_id, params, ctx):
     Returns:
         plane_name: Name of the created plane
         plane_index: Index of the created plane
+        plane_token: Entity token of the created plane
     """
     root = ctx.root
 
@@ -52,6 +53,7 @@ def create_offset_plane(command_id, params, ctx):
         write_result(command_id, True, {
             "plane_name": new_plane.name,
             "plane_index": planes.count - 1,
+            "plane_token": entity_token(new_plane),
             "offset": offset,
             "base_plane": plane_name
         })
@@ -73,6 +75,7 @@ def create_plane_at_angle(command_id, params, ctx):
     Returns:
         plane_name: Name of the created plane
         plane_index: Index of the created plane
+        plane_token: Entity token of the created plane
     """
     root = ctx.root
 
@@ -116,6 +119,7 @@ def create_plane_at_angle(command_id, params, ctx):
         write_result(command_id, True, {
             "plane_name": new_plane.name,
             "plane_index": planes.count - 1,
+            "plane_token": entity_token(new_plane),
             "angle_degrees": angle,
             "base_plane": plane_name,
             "axis": axis_name
@@ -1,10 +1,44 @@
 """
 Context object that provides access to Fusion 360 application objects.
+
+In snapshot mode (CONTEXT_SNAPSHOT in config.py) the design, root
+component, active component and common collections are resolved once per
+context and reused. A context lives for one dispatch; batch steps (and the
+requests of a JSON-RPC batch) share their batch's context. Nothing a command
+does on the main thread can switch the active design or component in
+between, and Fusion collections are live views, so the reused objects stay
+current. Counters show how many API round trips were made and avoided.
 """
 
 import adsk.core
 import adsk.fusion
 
+from ..config import API_TRACE_ENABLED
+from .api_trace import wrap, cast
+
+# Per property: (API calls it makes itself, property it is derived from)
+_RESOLVE = {
+    "design": (2, None),                # app.activeProduct, Design.cast
+    "root": (1, "design"),              # design.rootComponent
+    "active_component": (1, "design"),  # design.activeComponent
+    "sketches": (1, "active_component"),
+    "extrudes": (2, "active_component"),  # comp.features.extrudeFeatures
+}
+
+# Lookup counters over all contexts, for bridge_status.json (main thread only)
+_totals = {"api_lookups": 0, "lookups_avoided": 0}
+
+
+def _round_trips(name):
+    """API calls needed to resolve a property from scratch."""
+    calls, parent = _RESOLVE[name]
+    return calls + (_round_trips(parent) if parent else 0)
+
+
+def context_stats():
+    """Return lookup counters summed over every context so far."""
+    return dict(_totals)
+
 
 class CommandContext:
     """
@@ -18,46 +52,81 @@ class CommandContext:
         active_component: The currently active component (if design exists)
         sketches: The sketches collection (from active component)
         extrudes: The extrude features collection (from active component)
+        client: Id of the client that sent the command (None if unnamed)
+        snapshot: True if the objects above are resolved once and reused
+        api_lookups: API calls made to resolve them
+        lookups_avoided: API calls saved by reusing the snapshot
     """
 
-    def __init__(self, app, ui):
-        self.app = app
+    def __init__(self, app, ui, client=None, snapshot=False):
+        # Count API accesses made through this context (see api_trace.py)
+        self.app = wrap(app) if API_TRACE_ENABLED else app
         self.ui = ui
-        self._design = None
-        self._root = None
+        self.client = client
+        self.snapshot = snapshot
+        self.api_lookups = 0
+        self.lookups_avoided = 0
+        self._resolved = {}
+
+    def _lookup(self, name, resolve):
+        """Resolve a property, or reuse its snapshot value."""
+        if self.snapshot and name in self._resolved:
+            saved = _round_trips(name)
+            self.lookups_avoided += saved
+            _totals["lookups_avoided"] += saved
+            return self._resolved[name]
+        value = resolve()
+        calls = _RESOLVE[name][0]
+        self.api_lookups += calls
+        _totals["api_lookups"] += calls
+        if self.snapshot:
+            self._resolved[name] = value
+        return value
+
+    def lookup_stats(self):
+        """Return this context's lookup counters."""
+        return {"api_lookups": self.api_lookups, "lookups_avoided": self.lookups_avoided}
 
     @property
     def design(self):
-        """Get the active design, refreshed each access."""
-        return adsk.fusion.Design.cast(self.app.activeProduct)
+        """Get the active design (refreshed each access unless in snapshot mode)."""
+        return self._lookup("design", lambda: cast(adsk.fusion.Design, self.app.activeProduct))
 
     @property
     def root(self):
         """Get the root component of the active design."""
-        design = self.design
-        return design.rootComponent if design else None
+        def resolve():
+            design = self.design
+            return design.rootComponent if design else None
+        return self._lookup("root", resolve)
 
     @property
     def active_component(self):
         """Get the currently active component (the one being edited)."""
-        design = self.design
-        if not design:
-            return None
-        # Use activeComponent which returns the component being edited
-        # This respects which component the user has activated in the browser
-        return design.activeComponent
+        def resolve():
+            design = self.design
+            if not design:
+                return None
+            # Use activeComponent which returns the component being edited
+            # This respects which component the user has activated in the browser
+            return design.activeComponent
+        return self._lookup("active_component", resolve)
 
     @property
     def sketches(self):
         """Get the sketches collection from active component."""
-        comp = self.active_component
-        return comp.sketches if comp else None
+        def resolve():
+            comp = self.active_component
+            return comp.sketches if comp else None
+        return self._lookup("sketches", resolve)
 
     @property
     def extrudes(self):
         """Get the extrude features collection from active component."""
-        comp = self.active_component
-        return comp.features.extrudeFeatures if comp else None
+        def resolve():
+            comp = self.active_component
+            return comp.features.extrudeFeatures if comp else None
+        return self._lookup("extrudes", resolve)
 
     def require_design(self):
         """
@@ -0,0 +1,133 @@
+"""
+Control commands: batch, cancel
+"""
+
+import time
+
+from ..utils import write_result, capture_results
+from .dispatcher import execute_command, mark_cancelled
+
+
+def batch(command_id, params, ctx):
+    """
+    Execute a list of commands back-to-back in a single main-thread dispatch.
+
+    Params:
+        commands: List of commands, each with 'action', optional 'params'
+                  and optional 'id' (defaults to the step index)
+        stop_on_error: Skip the remaining steps after the first failure
+                       (default: False)
+
+    Returns:
+        steps: Per-step id, action, success, result, error and elapsed_ms
+        succeeded / failed / skipped: Step counts
+        elapsed_ms: Total time for the batch
+
+    Example:
+        {
+            "action": "batch",
+            "params": {
+                "commands": [
+                    {"action": "draw_line", "params": {"x1": 0, "y1": 0, "x2": 1, "y2": 0}},
+                    {"action": "draw_line", "params": {"x1": 1, "y1": 0, "x2": 1, "y2": 1}}
+                ],
+                "stop_on_error": true
+            }
+        }
+    """
+    commands = params.get("commands")
+    stop_on_error = params.get("stop_on_error", False)
+
+    if not isinstance(commands, list) or not commands:
+        return write_result(command_id, False, None, "commands must be a non-empty list")
+
+    steps = []
+    failed = False
+    batch_start = time.perf_counter()
+
+    for i, sub in enumerate(commands):
+        sub_id = sub.get("id", i) if isinstance(sub, dict) else i
+        action = sub.get("action", "") if isinstance(sub, dict) else ""
+
+        if failed and stop_on_error:
+            steps.append({"index": i, "id": sub_id, "action": action, "skipped": True})
+            continue
+
+        if not isinstance(sub, dict):
+            record = {"success": False, "result": None, "error": "Step must be an object"}
+            elapsed = 0.0
+        else:
+            start = time.perf_counter()
+            with capture_results() as results:
+                execute_command({"id": sub_id, "action": action, "client": ctx.client,
+                                 "params": sub.get("params", {})}, ctx.app, ctx.ui, ctx)
+            elapsed = time.perf_counter() - start
+            record = results[-1] if results else {
+                "success": False, "result": None, "error": "Command produced no result"
+            }
+
+        failed = failed or not record["success"]
+        steps.append({
+            "index": i,
+            "id": sub_id,
+            "action": action,
+            "success": record["success"],
+            "result": record["result"],
+            "error": record["error"],
+            "elapsed_ms": round(elapsed * 1000, 3)
+        })
+
+    succeeded = sum(1 for step in steps if step.get("success"))
+    skipped = sum(1 for step in steps if step.get("skipped"))
+    write_result(command_id, not failed, {
+        "steps": steps,
+        "succeeded": succeeded,
+        "failed": len(steps) - succeeded - skipped,
+        "skipped": skipped,
+        "elapsed_ms": round((time.perf_counter() - batch_start) * 1000, 3),
+        "context": ctx.lookup_stats()
+    }, "One or more steps failed" if failed else None)
+
+
+def cancel(command_id, params, ctx):
+    """
+    Cancel commands that have not started yet.
+
+    Cancelled commands are skipped when their turn comes and reported with
+    "skipped": "cancelled". Ids that have not arrived yet are remembered, so
+    a cancel may overtake the command it cancels. Runs off the main thread,
+    so it takes effect even while a long command is executing. A command
+    that has already started is never interrupted.
+
+    Params:
+        command_id (int, optional): A single command id to cancel
+        command_ids (list, optional): Several command ids to cancel
+        client (str, optional): Client the ids belong to (default: the caller)
+
+    Returns:
+        cancelled: Ids marked as cancelled
+        running: Ids that are executing now (too late to cancel)
+        finished: Ids that already ran since the add-in started (too late
+                  to cancel)
+    """
+    ids = params.get("command_ids")
+    if ids is None:
+        if "command_id" not in params:
+            return write_result(command_id, False, None, "command_id or command_ids required")
+        ids = [params["command_id"]]
+
+    client = params.get("client", ctx.client)
+    # Decided from the dispatcher's record of this session's commands: the
+    # result journal also holds earlier sessions, whose ids are reused
+    outcome = {"cancelled": [], "running": [], "finished": []}
+    for cid in ids:
+        outcome[mark_cancelled(client, cid)].append(cid)
+
+    write_result(command_id, True, outcome)
+
+
+# Command registry for this module
+COMMANDS = {
+    "batch": batch,
+    "cancel": cancel,
+}
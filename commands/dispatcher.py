@@ -2,47 +2,294 @@
 Command dispatcher - routes commands to appropriate handlers.
 """
 
-from ..utils import write_result
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from ..config import RESULT_CACHE_ENABLED, CONTEXT_SNAPSHOT, API_TRACE_ENABLED
+from ..utils import write_result, capture_results, result_client
+from .api_trace import api_trace
 from .context import CommandContext
+from .profiling import profiler
+from .helpers import entity_index, token_cache
+from .result_cache import result_cache
 from . import get_handler
 
+# Actions that work without an active design
+# (batch checks the design per sub-command instead)
+NO_DESIGN_ACTIONS = ("ping", "message", "get_result", "batch", "cancel", "set_profiling")
+
+# Priority lanes (core/command_queue.py LANES). Control commands are served
+# first, reads may overtake queued mutations from other callers, and
+# mutate/export run in arrival order. Unlisted actions are "mutate".
+ACTION_LANES = {
+    "ping": "control",
+    "get_result": "control",
+    "cancel": "control",
+    "set_profiling": "control",
+    "get_sketch_constraints": "read",
+    "list_profiles": "read",
+    "export_session": "export",
+}
+
+# Read-only actions whose results are cached until the design changes
+CACHEABLE_ACTIONS = ("get_sketch_constraints", "list_profiles", "export_session")
+
+# Mutations that leave the set of sketches, bodies, features and planes
+# unchanged, or register what they create, so the entity index stays valid
+INDEX_PRESERVING_ACTIONS = (
+    "create_sketch", "create_sketch_on_face",
+    "draw_line", "draw_circle", "draw_rectangle",
+    "draw_arc", "draw_arc_three_points", "draw_arc_sweep",
+    "add_constraint_vertical", "add_constraint_horizontal",
+    "add_constraint_midpoint", "add_constraint_coincident",
+    "add_constraint_coincident_points", "delete_constraint",
+)
+
+# Control commands that never touch the Fusion API, so respond_inline can
+# answer them on the receiving thread while the main thread is busy
+THREAD_SAFE_ACTIONS = ("ping", "get_result", "cancel")
+
+# Command ids cancelled before they ran, and top-level commands that have
+# started ("running") or finished, per (client, id); the oldest entries are
+# dropped past MAX_CANCELLED
+MAX_CANCELLED = 10000
+_cancelled = OrderedDict()
+_progress = OrderedDict()
+_cancel_lock = threading.Lock()
+
+
+def action_lane(action):
+    """Return the priority lane for an action."""
+    return ACTION_LANES.get(action, "mutate")
+
 
-def execute_command(cmd, app, ui):
+def design_changed(action=None):
+    """
+    Drop cached design data after the design changed.
+
+    Args:
+        action: The bridge command that changed it, or None for a change
+                reported by Fusion (UI edit, document switch)
+    """
+    result_cache.invalidate()
+    if action not in INDEX_PRESERVING_ACTIONS:
+        entity_index.invalidate()
+    if action is None:
+        # Objects cached for tokens may belong to another document now
+        token_cache.invalidate()
+
+
+def _remember(entries, key, value):
+    """Store a bounded cancel/progress entry (lock held)."""
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > MAX_CANCELLED:
+        entries.popitem(last=False)
+
+
+def mark_cancelled(client, command_id):
+    """
+    Cancel a command unless it has already started.
+
+    Returns:
+        str: "cancelled" if it will be skipped when its turn comes, or
+             "running"/"finished" if it is too late to cancel it
+    """
+    with _cancel_lock:
+        state = _progress.get((client, command_id))
+        if state is not None:
+            return state
+        _remember(_cancelled, (client, command_id), True)
+        return "cancelled"
+
+
+def _skip_reason(cmd):
+    """
+    Return why a top-level command must not run ("cancelled"/"expired"), or None.
+
+    A command that may run is recorded as "running" in the same step, so a
+    concurrent cancel either skips it or sees it started. A skipped one is
+    recorded as "finished".
+    """
+    key = (cmd.get("client"), cmd.get("id", 0))
+    with _cancel_lock:
+        reason = None
+        if _cancelled.pop(key, None):
+            reason = "cancelled"
+        else:
+            deadline = cmd.get("deadline")
+            if isinstance(deadline, (int, float)) and time.time() > deadline:
+                reason = "expired"
+        # A skipped command has its result already
+        _remember(_progress, key, "finished" if reason else "running")
+    return reason
+
+
+def _finished(cmd):
+    """Record that a tracked command has finished."""
+    with _cancel_lock:
+        _remember(_progress, (cmd.get("client"), cmd.get("id", 0)), "finished")
+
+
+def execute_command(cmd, app, ui, ctx=None):
     """
     Execute a command from Claude.
 
+    Commands cancelled with the cancel action, or whose "deadline" (Unix
+    time in seconds) has passed, are skipped before any Fusion API call and
+    reported as failed with "skipped": "cancelled" or "expired". Steps run
+    with a shared ctx (batch) are not checked; only their batch is.
+
     Args:
         cmd: Command dictionary with 'id', 'action', and 'params'
+             (optional 'deadline' and 'client')
         app: Fusion 360 Application object
         ui: Fusion 360 UserInterface object
+        ctx: Optional CommandContext to reuse (batch steps share their
+             batch's context, so its snapshot is resolved only once)
+
+    Returns:
+        int: The command_id that was processed
+    """
+    with result_client(cmd.get("client")):
+        if API_TRACE_ENABLED:
+            with api_trace.command(cmd.get("action", "")):
+                _profiled(cmd, app, ui, ctx)
+        else:
+            _profiled(cmd, app, ui, ctx)
+    return cmd.get("id", 0)
+
+
+class InlineContext:
+    """The part of CommandContext that THREAD_SAFE_ACTIONS handlers use."""
+
+    __slots__ = ("client",)
+
+    def __init__(self, client):
+        self.client = client
+
+
+def respond_inline(cmd):
+    """
+    Answer a THREAD_SAFE_ACTIONS command on the calling thread.
+
+    Runs the handler directly: no CommandContext, profiler, API trace or
+    metrics, none of which may be used off the main thread.
+
+    Args:
+        cmd: Command dictionary with 'id', 'action', and 'params'
 
     Returns:
         int: The command_id that was processed
     """
+    command_id = cmd.get("id", 0)
+    action = cmd.get("action", "")
+    with result_client(cmd.get("client")):
+        if action not in THREAD_SAFE_ACTIONS:
+            write_result(command_id, False, None, f"{action} cannot run off the main thread")
+        elif not _write_skipped(cmd):
+            try:
+                get_handler(action)(command_id, cmd.get("params", {}),
+                                    InlineContext(cmd.get("client")))
+            except Exception as e:
+                write_result(command_id, False, None, str(e))
+    return command_id
+
+
+def _profiled(cmd, app, ui, ctx):
+    """Run a command, under cProfile if the profiler selects it (see profiling.py)."""
+    action = cmd.get("action", "")
+    profile = profiler.start(action)
+    if profile is None:
+        return _execute(cmd, app, ui, ctx)
+    try:
+        _execute(cmd, app, ui, ctx)
+    finally:
+        profiler.stop(profile, cmd.get("id", 0), action)
+
+
+def _write_skipped(cmd):
+    """Write the result of a cancelled or expired command; False if it must run."""
+    command_id = cmd.get("id", 0)
+    skipped = _skip_reason(cmd)
+    if skipped == "cancelled":
+        write_result(command_id, False, None, "Command was cancelled before it started",
+                     skipped=skipped)
+    elif skipped == "expired":
+        late = time.time() - cmd["deadline"]
+        write_result(command_id, False, None,
+                     f"Deadline passed {late:.3f}s before the command could start",
+                     skipped=skipped)
+    return skipped is not None
+
+
+def _execute(cmd, app, ui, ctx):
+    if ctx is not None:
+        # Batch steps share their batch's context. Their ids are step
+        # indexes, so they never match cancels or progress of real commands.
+        return _run(cmd, app, ui, ctx)
+    if _write_skipped(cmd):
+        return
+    try:
+        _run(cmd, app, ui, ctx)
+    finally:
+        _finished(cmd)
+
+
+def _run(cmd, app, ui, ctx):
     command_id = cmd.get("id", 0)
     action = cmd.get("action", "")
     params = cmd.get("params", {})
 
     try:
         # Create context for this command
-        ctx = CommandContext(app, ui)
+        if ctx is None:
+            ctx = CommandContext(app, ui, cmd.get("client"), snapshot=CONTEXT_SNAPSHOT)
 
-        # Check if design is required (all commands except ping and message)
-        if action not in ("ping", "message"):
+        # Check if design is required (all commands except NO_DESIGN_ACTIONS)
+        if action not in NO_DESIGN_ACTIONS:
             success, error = ctx.require_design()
             if not success:
-                write_result(command_id, False, None, error)
-                return command_id
+                return write_result(command_id, False, None, error)
 
         # Get the handler for this action
         handler = get_handler(action)
 
-        if handler:
-            handler(command_id, params, ctx)
-        else:
+        if not handler:
             write_result(command_id, False, None, f"Unknown action: {action}")
+        elif RESULT_CACHE_ENABLED and action in CACHEABLE_ACTIONS and not params.get("stream"):
+            _run_cached(handler, command_id, action, params, ctx)
+        else:
+            try:
+                handler(command_id, params, ctx)
+            finally:
+                if action_lane(action) == "mutate":
+                    design_changed(action)
 
     except Exception as e:
         write_result(command_id, False, None, str(e))
 
-    return command_id
+
+def _cache_stale(result):
+    """True if a cached result points at files that are gone (e.g. a deleted session folder)."""
+    path = result.get("session_path") if isinstance(result, dict) else None
+    return path is not None and not os.path.isdir(path)
+
+
+def _run_cached(handler, command_id, action, params, ctx):
+    """Answer a read-only command from the result cache, filling it on a miss."""
+    key = result_cache.key(action, params)
+    cached = result_cache.get(key)
+    if cached is not None and not _cache_stale(cached):
+        return write_result(command_id, True, cached, cached=True)
+
+    with capture_results() as results:
+        handler(command_id, params, ctx)
+    if not results:
+        return
+    record = results[-1]
+    if record["success"]:
+        result_cache.put(key, record["result"])
+    write_result(command_id, record["success"], record["result"], record["error"])
@@ -9,10 +9,10 @@ multiple round-trip commands.
 import os
 from datetime import datetime
 
-from ....config import BASE_DIR
+from ....config import BASE_DIR, COMPRESSION, COMPRESSION_MIN_BYTES
 from ....utils import write_result
-from ...helpers import collect_all_components
-from .utils import write_json
+from ...helpers import traverse_components
+from .utils import SessionWriter
 from .collectors import (
     export_design_info,
     export_bodies,
@@ -32,6 +32,11 @@ def export_session(command_id, params, ctx):
 
     Params:
         name (str, optional): Custom session name (default: timestamp)
+        encoding (str, optional): "json" (default) or "msgpack" for compact
+                                  binary data files; manifest.json stays JSON
+        compression (str, optional): "gzip" or "zlib" to compress data files of
+                                     at least COMPRESSION_MIN_BYTES, or "none"
+                                     (default: config COMPRESSION)
 
     Returns:
         session_path: Path to the created session folder
@@ -40,6 +45,16 @@ def export_session(command_id, params, ctx):
     """
     root = ctx.root
     design = ctx.design
+    encoding = params.get("encoding", "json")
+    if encoding not in ("json", "msgpack"):
+        write_result(command_id, False, None, f"Unknown encoding: {encoding}. Use json or msgpack")
+        return
+    compression = params.get("compression", COMPRESSION)
+    if compression == "none":
+        compression = None
+    if compression not in (None, "gzip", "zlib"):
+        write_result(command_id, False, None, f"Unknown compression: {compression}. Use gzip, zlib or none")
+        return
 
     # Create session folder
     sessions_dir = os.path.join(BASE_DIR, "sessions")
@@ -56,33 +71,40 @@ def export_session(command_id, params, ctx):
     os.makedirs(session_dir, exist_ok=True)
 
     try:
-        # Collect all components
-        all_components = collect_all_components(root)
+        # Collect each component once (instanced components are not repeated)
+        instances = traverse_components(root)
+        all_components = [comp for comp, _, _ in instances]
 
         # Export all data
-        design_summary = export_design_info(design, root, all_components, session_dir)
-        body_count = export_bodies(root, all_components, session_dir)
-        sketch_count = export_sketches(root, all_components, session_dir)
-        feature_count = export_features(root, all_components, session_dir)
-        param_count = export_parameters(design, session_dir)
-        plane_count = export_construction_planes(root, session_dir)
+        writer = SessionWriter(session_dir, encoding, compression, COMPRESSION_MIN_BYTES)
+        design_summary = export_design_info(design, root, all_components, writer, instances)
+        body_count = export_bodies(root, all_components, writer)
+        sketch_count = export_sketches(root, all_components, writer)
+        feature_count = export_features(root, all_components, writer)
+        param_count = export_parameters(design, writer)
+        plane_count = export_construction_planes(root, writer)
+
+        files = [writer.file_name(name) for name in [
+            "design_info.json",
+            "bodies.json",
+            "sketches/overview.json",
+            *[f"sketches/sketch_{i}.json" for i in range(sketch_count)],
+            "features.json",
+            "parameters.json",
+            "construction_planes.json"
+        ]]
 
         # Create manifest
         manifest = {
             "session_name": folder_name,
             "design_name": design.rootComponent.name,
             "exported_at": datetime.now().isoformat(),
-            "files": [
-                "design_info.json",
-                "bodies.json",
-                "sketches/overview.json",
-                *[f"sketches/sketch_{i}.json" for i in range(sketch_count)],
-                "features.json",
-                "parameters.json",
-                "construction_planes.json"
-            ],
+            "encoding": encoding,
+            "compression": compression,
+            "files": files,
             "summary": {
                 "components": design_summary["component_count"],
+                "occurrences": design_summary["occurrence_count"],
                 "bodies": body_count,
                 "sketches": sketch_count,
                 "features": feature_count,
@@ -90,7 +112,8 @@ def export_session(command_id, params, ctx):
                 "construction_planes": plane_count
             }
         }
-        write_json(os.path.join(session_dir, "manifest.json"), manifest)
+        # Readers look for manifest.json, so it is never compressed
+        writer.write("manifest.json", manifest, encoding="json", compress=False)
 
         write_result(command_id, True, {
             "session_path": session_dir,
@@ -2,22 +2,24 @@
 Body information collector for session export.
 """
 
-import os
 import math
-from ..utils import write_json, pt
+from ....helpers import entity_token
+from ..utils import pt
 
 
-def export_bodies(root, all_components, session_dir):
+def export_bodies(root, all_components, writer):
     """
     Export detailed body information including circular edges.
 
     Collects comprehensive information about all bodies in the design,
     including geometry, bounding boxes, face types, and circular/elliptical edges.
+    Each body lists the tokens of its faces and edges (face_tokens[i] and
+    edge_tokens[i] are face/edge i), for face_token and edge_tokens params.
 
     Args:
         root: Root component
         all_components: List of all components in the design
-        session_dir: Directory to write output files
+        writer: SessionWriter for the session folder
 
     Returns:
         int: Number of bodies exported
@@ -32,7 +34,9 @@ def export_bodies(root, all_components, session_dir):
 
             # Count face types
             face_types = {}
+            face_tokens = []
             for face in body.faces:
+                face_tokens.append(entity_token(face))
                 ft = face.geometry.surfaceType
                 type_names = {
                     0: "Plane", 1: "Cylinder", 2: "Cone", 3: "Sphere",
@@ -43,7 +47,9 @@ def export_bodies(root, all_components, session_dir):
 
             # Collect circular edges
             circular_edges = []
+            edge_tokens = []
             for edge_idx, edge in enumerate(body.edges):
+                edge_tokens.append(entity_token(edge))
                 geom = edge.geometry
                 curve_type = geom.curveType
 
@@ -54,6 +60,7 @@ def export_bodies(root, all_components, session_dir):
                         diameter_mm = radius_cm * 2 * 10
                         circular_edges.append({
                             "edge_index": edge_idx,
+                            "token": edge_tokens[-1],
                             "type": "circle",
                             "center": pt(center),
                             "radius_cm": round(radius_cm, 4),
@@ -69,6 +76,7 @@ def export_bodies(root, all_components, session_dir):
                         minor = geom.minorRadius
                         circular_edges.append({
                             "edge_index": edge_idx,
+                            "token": edge_tokens[-1],
                             "type": "ellipse",
                             "center": pt(center),
                             "major_radius_cm": round(major, 4),
@@ -82,6 +90,7 @@ def export_bodies(root, all_components, session_dir):
             bodies.append({
                 "name": body.name,
                 "index": global_index,
+                "token": entity_token(body),
                 "component": comp.name,
                 "is_solid": body.isSolid,
                 "volume_cm3": round(body.volume, 4) if body.volume else None,
@@ -99,11 +108,13 @@ def export_bodies(root, all_components, session_dir):
                         round(bbox.maxPoint.z - bbox.minPoint.z, 4)
                     ]
                 },
-                "circular_edges": circular_edges
+                "circular_edges": circular_edges,
+                "face_tokens": face_tokens,
+                "edge_tokens": edge_tokens
             })
             global_index += 1
 
-    write_json(os.path.join(session_dir, "bodies.json"), {
+    writer.write("bodies.json", {
         "bodies": bodies,
         "count": len(bodies)
     })
@@ -2,11 +2,10 @@
 Construction plane information collector for session export.
 """
 
-import os
-from ..utils import write_json
+from ....helpers import entity_token
 
 
-def export_construction_planes(root, session_dir):
+def export_construction_planes(root, writer):
     """
     Export construction plane information.
 
@@ -15,7 +14,7 @@ def export_construction_planes(root, session_dir):
 
     Args:
         root: Root component
-        session_dir: Directory to write output files
+        writer: SessionWriter for the session folder
 
     Returns:
         int: Number of construction planes exported
@@ -27,11 +26,12 @@ def export_construction_planes(root, session_dir):
         plane = planes.item(i)
         plane_list.append({
             "index": i,
+            "token": entity_token(plane),
             "name": plane.name,
             "is_visible": plane.isVisible
         })
 
-    write_json(os.path.join(session_dir, "construction_planes.json"), {
+    writer.write("construction_planes.json", {
         "planes": plane_list,
         "count": planes.count
     })
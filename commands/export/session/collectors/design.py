@@ -2,11 +2,13 @@
 Design information collector for session export.
 """
 
-import os
-from ..utils import write_json
 
+def _transform(occ):
+    """An occurrence's transform relative to its parent, as 16 row-major values."""
+    return [round(v, 6) for v in occ.transform2.asArray()]
 
-def export_design_info(design, root, all_components, session_dir):
+
+def export_design_info(design, root, all_components, writer, instances=None):
     """
     Export design overview information.
 
@@ -16,8 +18,10 @@ def export_design_info(design, root, all_components, session_dir):
     Args:
         design: Fusion 360 Design object
         root: Root component
-        all_components: List of all components in the design
-        session_dir: Directory to write output files
+        all_components: List of all components in the design (each once)
+        writer: SessionWriter for the session folder
+        instances: Optional traverse_components() output, to report each
+                   component's occurrence count and transforms
 
     Returns:
         dict: Summary counts of exported entities
@@ -72,15 +76,20 @@ def export_design_info(design, root, all_components, session_dir):
             })
             global_feature_index += 1
 
-    # Components summary
+    # Components summary (each component once, with where it is placed)
     components = []
-    for comp in all_components:
-        components.append({
+    for i, comp in enumerate(all_components):
+        info = {
             "name": comp.name,
             "bodies": comp.bRepBodies.count,
             "sketches": comp.sketches.count,
             "features": comp.features.count
-        })
+        }
+        if instances:
+            _, occurrences, count = instances[i]
+            info["occurrences"] = count
+            info["transforms"] = [_transform(occ) for occ in occurrences]
+        components.append(info)
 
     # Parameters summary
     params_list = []
@@ -100,6 +109,7 @@ def export_design_info(design, root, all_components, session_dir):
         "parameters": params_list,
         "summary": {
             "component_count": len(all_components),
+            "occurrence_count": sum(count for _, _, count in instances) - 1 if instances else None,
             "body_count": len(bodies),
             "sketch_count": len(sketch_list),
             "feature_count": len(features),
@@ -107,5 +117,5 @@ def export_design_info(design, root, all_components, session_dir):
         }
     }
 
-    write_json(os.path.join(session_dir, "design_info.json"), data)
+    writer.write("design_info.json", data)
     return data["summary"]
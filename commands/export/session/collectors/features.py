@@ -2,11 +2,10 @@
 Feature information collector for session export.
 """
 
-import os
-from ..utils import write_json
+from ....helpers import entity_token
 
 
-def export_features(root, all_components, session_dir):
+def export_features(root, all_components, writer):
     """
     Export feature timeline information.
 
@@ -16,7 +15,7 @@ def export_features(root, all_components, session_dir):
     Args:
         root: Root component
         all_components: List of all components in the design
-        session_dir: Directory to write output files
+        writer: SessionWriter for the session folder
 
     Returns:
         int: Number of features exported
@@ -30,6 +29,7 @@ def export_features(root, all_components, session_dir):
             features.append({
                 "name": feat.name,
                 "index": global_index,
+                "token": entity_token(feat),
                 "component": comp.name,
                 "type": feat.objectType.split("::")[-1].replace("Feature", ""),
                 "is_suppressed": feat.isSuppressed,
@@ -37,7 +37,7 @@ def export_features(root, all_components, session_dir):
             })
             global_index += 1
 
-    write_json(os.path.join(session_dir, "features.json"), {
+    writer.write("features.json", {
         "features": features,
         "count": len(features)
     })
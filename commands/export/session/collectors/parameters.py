@@ -2,11 +2,8 @@
 Parameter information collector for session export.
 """
 
-import os
-from ..utils import write_json
 
-
-def export_parameters(design, session_dir):
+def export_parameters(design, writer):
     """
     Export all parameters (user and model).
 
@@ -15,7 +12,7 @@ def export_parameters(design, session_dir):
 
     Args:
         design: Fusion 360 Design object
-        session_dir: Directory to write output files
+        writer: SessionWriter for the session folder
 
     Returns:
         int: Total number of parameters exported
@@ -60,7 +57,7 @@ def export_parameters(design, session_dir):
             "created_by": created_by
         })
 
-    write_json(os.path.join(session_dir, "parameters.json"), {
+    writer.write("parameters.json", {
         "user_parameters": user_params,
         "model_parameters": model_params,
         "counts": {
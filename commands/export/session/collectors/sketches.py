@@ -2,12 +2,12 @@
 Sketch information collector for session export.
 """
 
-import os
 import math
-from ..utils import write_json, pt
+from ....helpers import entity_token
+from ..utils import pt
 
 
-def export_sketches(root, all_components, session_dir):
+def export_sketches(root, all_components, writer):
     """
     Export sketch overview and individual sketch geometry files.
 
@@ -17,14 +17,11 @@ def export_sketches(root, all_components, session_dir):
     Args:
         root: Root component
         all_components: List of all components in the design
-        session_dir: Directory to write output files
+        writer: SessionWriter for the session folder
 
     Returns:
         int: Number of sketches exported
     """
-    sketches_dir = os.path.join(session_dir, "sketches")
-    os.makedirs(sketches_dir, exist_ok=True)
-
     # Collect all sketches with global indexing
     all_sketches = []
     global_index = 0
@@ -41,6 +38,7 @@ def export_sketches(root, all_components, session_dir):
         overview.append({
             "name": sketch.name,
             "index": idx,
+            "token": entity_token(sketch),
             "component": comp.name,
             "profile_count": sketch.profiles.count,
             "is_visible": sketch.isVisible,
@@ -54,7 +52,7 @@ def export_sketches(root, all_components, session_dir):
             }
         })
 
-    write_json(os.path.join(sketches_dir, "overview.json"), {
+    writer.write("sketches/overview.json", {
         "sketches": overview,
         "count": len(overview)
     })
@@ -69,6 +67,7 @@ def export_sketches(root, all_components, session_dir):
             circle = curves.sketchCircles.item(i)
             circles.append({
                 "index": i,
+                "token": entity_token(circle),
                 "center": pt(circle.centerSketchPoint.geometry),
                 "radius": round(circle.radius, 4),
                 "diameter": round(circle.radius * 2, 4),
@@ -81,6 +80,7 @@ def export_sketches(root, all_components, session_dir):
             line = curves.sketchLines.item(i)
             lines.append({
                 "index": i,
+                "token": entity_token(line),
                 "start": pt(line.startSketchPoint.geometry),
                 "end": pt(line.endSketchPoint.geometry),
                 "length": round(line.length, 4),
@@ -93,6 +93,7 @@ def export_sketches(root, all_components, session_dir):
             arc = curves.sketchArcs.item(i)
             arc_data = {
                 "index": i,
+                "token": entity_token(arc),
                 "center": pt(arc.centerSketchPoint.geometry),
                 "radius": round(arc.radius, 4),
                 "start_point": pt(arc.startSketchPoint.geometry),
@@ -114,6 +115,7 @@ def export_sketches(root, all_components, session_dir):
             ellipse = curves.sketchEllipses.item(i)
             ellipses.append({
                 "index": i,
+                "token": entity_token(ellipse),
                 "center": pt(ellipse.centerSketchPoint.geometry),
                 "major_radius": round(ellipse.majorRadius, 4),
                 "minor_radius": round(ellipse.minorRadius, 4),
@@ -132,8 +134,11 @@ def export_sketches(root, all_components, session_dir):
         sketch_data = {
             "sketch_name": sketch.name,
             "sketch_index": idx,
+            "sketch_token": entity_token(sketch),
             "component": comp.name,
             "plane": plane_info,
+            "profile_tokens": [entity_token(sketch.profiles.item(i))
+                               for i in range(sketch.profiles.count)],
             "circles": circles,
             "lines": lines,
             "arcs": arcs,
@@ -147,6 +152,6 @@ def export_sketches(root, all_components, session_dir):
             }
         }
 
-        write_json(os.path.join(sketches_dir, f"sketch_{idx}.json"), sketch_data)
+        writer.write(f"sketches/sketch_{idx}.json", sketch_data)
 
     return len(all_sketches)
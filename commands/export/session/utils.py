@@ -3,12 +3,71 @@ Utility functions for session export.
 """
 
 import json
+import os
 
+from ....bridge_client.codec import packb, compress as compress_bytes, COMPRESSIONS
 
-def write_json(filepath, data):
-    """Write JSON to file with pretty formatting."""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+EXTENSIONS = {"json": ".json", "msgpack": ".msgpack"}
+
+
+class SessionWriter:
+    """Writes the data files of one session folder in the chosen format."""
+
+    def __init__(self, session_dir, encoding="json", compression=None, min_bytes=0):
+        """
+        Args:
+            session_dir: Session folder the files are written to
+            encoding: "json" or "msgpack"
+            compression: None, "gzip" or "zlib"
+            min_bytes: Only compress files at least this large
+        """
+        if encoding not in EXTENSIONS:
+            raise ValueError(f"Unknown encoding: {encoding}. Use json or msgpack")
+        if compression and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}. Use gzip or zlib")
+        self.session_dir = session_dir
+        self.encoding = encoding
+        self.compression = compression
+        self.min_bytes = min_bytes
+        self._written = {}
+
+    def write(self, name, data, encoding=None, compress=True):
+        """
+        Write session data to a file in the session folder.
+
+        JSON is pretty-printed; with msgpack the extension is swapped and the
+        data is written as compact MessagePack (see bridge_client/codec.py).
+        With compression set, files of at least min_bytes get a .gz/.zz suffix.
+
+        Args:
+            name: File name relative to the session folder, e.g. "sketches/sketch_0.json"
+            data: JSON-serializable data
+            encoding: Overrides the writer's encoding for this file
+            compress: False to never compress this file (manifest.json)
+
+        Returns:
+            Path of the file actually written
+        """
+        filepath = os.path.join(self.session_dir, name)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        if (encoding or self.encoding) == "msgpack":
+            body = packb(data)
+            path = os.path.splitext(filepath)[0] + EXTENSIONS["msgpack"]
+        else:
+            body = json.dumps(data, indent=2).encode("utf-8")
+            path = filepath
+        if compress and self.compression and len(body) >= self.min_bytes:
+            body = compress_bytes(body, self.compression)
+            path += COMPRESSIONS[self.compression]
+        with open(path, 'wb') as f:
+            f.write(body)
+        self._written[os.path.normpath(name)] = path
+        return path
+
+    def file_name(self, name):
+        """Return the name (relative to the session folder) actually written for a .json name."""
+        path = self._written.get(os.path.normpath(name))
+        return os.path.relpath(path, self.session_dir).replace(os.sep, "/") if path else name
 
 
 def pt(point):
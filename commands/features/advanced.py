@@ -6,7 +6,27 @@ import adsk.core
 import adsk.fusion
 
 from ...utils import write_result
-from ..helpers import get_sketch_by_index, get_operation_type
+from ..helpers import (
+    resolve_sketch, resolve_profile, get_operation_type, get_entity, feature_tokens
+)
+
+
+def _add_sections(ctx, loft_input, sections):
+    """Add each section's profile to a loft; returns an error message or None."""
+    for i, section in enumerate(sections):
+        if section.get("sketch_index") is None and section.get("sketch_token") is None:
+            return f"Section {i} missing sketch_index"
+
+        sketch, error = resolve_sketch(ctx, section)
+        if error:
+            return f"Section {i}: {error}"
+
+        profile, error = resolve_profile(ctx, section, sketch)
+        if error:
+            return f"Section {i}: {error}"
+
+        loft_input.loftSections.add(profile)
+    return None
 
 
 def loft(command_id, params, ctx):
@@ -15,8 +35,8 @@ def loft(command_id, params, ctx):
 
     Params:
         sections: List of section definitions, each with:
-            - sketch_index: Index of sketch containing the profile
-            - profile_index: Index of profile within sketch (default: 0)
+            - sketch_index: Index of sketch containing the profile (or sketch_token)
+            - profile_index: Index of profile within sketch (default: 0, or profile_token)
         operation: "new", "join", or "cut" (default: "new")
         is_solid: Whether to create a solid (True) or surface (False). Default: True
         is_closed: Whether the loft is closed (connects last to first). Default: False
@@ -42,7 +62,6 @@ def loft(command_id, params, ctx):
         return write_result(command_id, False, None,
                             "Loft requires at least 2 sections")
 
-    sketches = ctx.sketches
     root = ctx.root
     lofts = root.features.loftFeatures
 
@@ -57,33 +76,17 @@ def loft(command_id, params, ctx):
     loft_input.isClosed = is_closed
 
     # Add each section (profile)
-    for i, section in enumerate(sections):
-        sketch_idx = section.get("sketch_index")
-        profile_idx = section.get("profile_index", 0)
-
-        if sketch_idx is None:
-            return write_result(command_id, False, None,
-                                f"Section {i} missing sketch_index")
-
-        sketch, error = get_sketch_by_index(sketches, sketch_idx)
-        if error:
-            return write_result(command_id, False, None,
-                                f"Section {i}: {error}")
-
-        if profile_idx >= sketch.profiles.count:
-            return write_result(command_id, False, None,
-                                f"Section {i}: Invalid profile_index {profile_idx}. "
-                                f"Sketch has {sketch.profiles.count} profiles")
-
-        profile = sketch.profiles.item(profile_idx)
-        loft_input.loftSections.add(profile)
+    error = _add_sections(ctx, loft_input, sections)
+    if error:
+        return write_result(command_id, False, None, error)
 
     # Create the loft
     try:
         loft_feature = lofts.add(loft_input)
         write_result(command_id, True, {
             "message": f"Created loft with {len(sections)} sections",
-            "feature_name": loft_feature.name
+            "feature_name": loft_feature.name,
+            **feature_tokens(loft_feature)
         })
     except Exception as e:
         write_result(command_id, False, None, f"Loft failed: {str(e)}")
@@ -96,8 +99,8 @@ def loft_rails(command_id, params, ctx):
     Params:
         sections: List of section definitions (same as loft)
         rails: List of rail definitions, each with:
-            - sketch_index: Index of sketch containing the rail curve
-            - curve_index: Index of curve in sketch (default: 0)
+            - sketch_index: Index of sketch containing the rail curve (or sketch_token)
+            - curve_index: Index of curve in sketch (default: 0, or curve_token)
         operation: "new", "join", or "cut" (default: "new")
 
     Example:
@@ -124,7 +127,6 @@ def loft_rails(command_id, params, ctx):
         return write_result(command_id, False, None,
                             "Loft requires at least 2 sections")
 
-    sketches = ctx.sketches
     root = ctx.root
     lofts = root.features.loftFeatures
 
@@ -138,36 +140,27 @@ def loft_rails(command_id, params, ctx):
     loft_input.isSolid = is_solid
 
     # Add sections
-    for i, section in enumerate(sections):
-        sketch_idx = section.get("sketch_index")
-        profile_idx = section.get("profile_index", 0)
-
-        if sketch_idx is None:
-            return write_result(command_id, False, None,
-                                f"Section {i} missing sketch_index")
-
-        sketch, error = get_sketch_by_index(sketches, sketch_idx)
-        if error:
-            return write_result(command_id, False, None,
-                                f"Section {i}: {error}")
-
-        if profile_idx >= sketch.profiles.count:
-            return write_result(command_id, False, None,
-                                f"Section {i}: Invalid profile_index {profile_idx}")
-
-        profile = sketch.profiles.item(profile_idx)
-        loft_input.loftSections.add(profile)
+    error = _add_sections(ctx, loft_input, sections)
+    if error:
+        return write_result(command_id, False, None, error)
 
     # Add rails (guide curves)
     for i, rail in enumerate(rails):
+        if rail.get("curve_token") is not None:
+            curve, error = get_entity(ctx, rail, "curve", None, adsk.fusion.SketchCurve)
+            if error:
+                return write_result(command_id, False, None, f"Rail {i}: {error}")
+            loft_input.centerLineOrRails.addRail(curve)
+            continue
+
         sketch_idx = rail.get("sketch_index")
         curve_idx = rail.get("curve_index", 0)
 
-        if sketch_idx is None:
+        if sketch_idx is None and rail.get("sketch_token") is None:
             return write_result(command_id, False, None,
                                 f"Rail {i} missing sketch_index")
 
-        sketch, error = get_sketch_by_index(sketches, sketch_idx)
+        sketch, error = resolve_sketch(ctx, rail)
         if error:
             return write_result(command_id, False, None,
                                 f"Rail {i}: {error}")
@@ -198,7 +191,8 @@ def loft_rails(command_id, params, ctx):
         loft_feature = lofts.add(loft_input)
         write_result(command_id, True, {
             "message": f"Created loft with {len(sections)} sections and {len(rails)} rails",
-            "feature_name": loft_feature.name
+            "feature_name": loft_feature.name,
+            **feature_tokens(loft_feature)
         })
     except Exception as e:
         write_result(command_id, False, None, f"Loft failed: {str(e)}")
@@ -8,28 +8,37 @@ import adsk.core
 import adsk.fusion
 
 from ...utils import write_result
-from ..helpers import get_sketch_by_index, get_construction_axis, get_operation_type
+from ..helpers import (
+    resolve_sketch, resolve_profile, get_construction_axis, get_operation_type, write_items,
+    get_entity, entity_token, feature_tokens
+)
 
 
 def extrude(command_id, params, ctx):
-    """Extrude a sketch profile to create a 3D body."""
-    sketches = ctx.sketches
+    """
+    Extrude a sketch profile to create a 3D body.
+
+    Params:
+        sketch_index: Index of sketch (default: last sketch), or sketch_token
+        profile_index: Index of profile in sketch (default: 0), or profile_token
+        height: Distance in cm (default: 1)
+        operation: "new", "join", or "cut" (default: "new")
+
+    Returns:
+        feature_token, body_tokens: Entity tokens of the new feature and its bodies
+    """
     extrudes = ctx.extrudes
 
-    idx = params.get("sketch_index", sketches.count - 1)
-    profile_idx = params.get("profile_index", 0)
     height = params.get("height", 1)
     op = params.get("operation", "new")
 
-    sketch, error = get_sketch_by_index(sketches, idx)
+    sketch, error = resolve_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
-    if profile_idx >= sketch.profiles.count:
-        return write_result(command_id, False, None,
-                            f"Invalid profile. Has {sketch.profiles.count}")
-
-    profile = sketch.profiles.item(profile_idx)
+    profile, error = resolve_profile(ctx, params, sketch)
+    if error:
+        return write_result(command_id, False, None, error)
 
     operation, error = get_operation_type(op)
     if error:
@@ -37,9 +46,9 @@ def extrude(command_id, params, ctx):
 
     ext_input = extrudes.createInput(profile, operation)
     ext_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(height))
-    extrudes.add(ext_input)
+    feature = extrudes.add(ext_input)
 
-    write_result(command_id, True, {"message": f"Extruded {height}cm"})
+    write_result(command_id, True, {"message": f"Extruded {height}cm", **feature_tokens(feature)})
 
 
 def revolve(command_id, params, ctx):
@@ -47,32 +56,31 @@ def revolve(command_id, params, ctx):
     Revolve a sketch profile around an axis to create a 3D body.
 
     Params:
-        sketch_index: Index of sketch (default: last sketch)
-        profile_index: Index of profile in sketch (default: 0)
+        sketch_index: Index of sketch (default: last sketch), or sketch_token
+        profile_index: Index of profile in sketch (default: 0), or profile_token
         angle: Angle in degrees (default: 360 for full revolution)
         axis: "x", "y", "z" for construction axes, or "line" for sketch line
-        axis_line_index: Index of sketch line to use as axis (when axis="line")
+        axis_line_index: Index of sketch line to use as axis (when axis="line"),
+                         or axis_line_token
         operation: "new", "join", or "cut" (default: "new")
+
+    Returns:
+        feature_token, body_tokens: Entity tokens of the new feature and its bodies
     """
-    sketches = ctx.sketches
     root = ctx.root
 
-    sketch_index = params.get("sketch_index", sketches.count - 1)
-    profile_index = params.get("profile_index", 0)
     angle = params.get("angle", 360)
     axis = params.get("axis", "x")
     axis_line_index = params.get("axis_line_index", 0)
     operation = params.get("operation", "new")
 
-    sketch, error = get_sketch_by_index(sketches, sketch_index)
+    sketch, error = resolve_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
-    if profile_index >= sketch.profiles.count:
-        return write_result(command_id, False, None,
-                            f"Invalid profile. Has {sketch.profiles.count}")
-
-    profile = sketch.profiles.item(profile_index)
+    profile, error = resolve_profile(ctx, params, sketch)
+    if error:
+        return write_result(command_id, False, None, error)
 
     # Get the axis
     axis_lower = axis.lower()
@@ -82,10 +90,14 @@ def revolve(command_id, params, ctx):
             return write_result(command_id, False, None, error)
     elif axis_lower == "line":
         # Use a sketch line as axis
-        if axis_line_index >= sketch.sketchCurves.sketchLines.count:
-            return write_result(command_id, False, None,
-                                f"Invalid axis line index. Has {sketch.sketchCurves.sketchLines.count} lines")
-        axis_obj = sketch.sketchCurves.sketchLines.item(axis_line_index)
+        def by_index():
+            lines = sketch.sketchCurves.sketchLines
+            if axis_line_index >= lines.count:
+                return None, f"Invalid axis line index. Has {lines.count} lines"
+            return lines.item(axis_line_index), None
+        axis_obj, error = get_entity(ctx, params, "axis_line", by_index, adsk.fusion.SketchLine)
+        if error:
+            return write_result(command_id, False, None, error)
     else:
         return write_result(command_id, False, None, f"Unknown axis: {axis}")
 
@@ -104,27 +116,40 @@ def revolve(command_id, params, ctx):
     angle_value = adsk.core.ValueInput.createByReal(angle_rad)
     rev_input.setAngleExtent(False, angle_value)
 
-    revolves.add(rev_input)
+    feature = revolves.add(rev_input)
 
-    write_result(command_id, True, {"message": f"Revolved {angle}° around {axis} axis"})
+    write_result(command_id, True, {
+        "message": f"Revolved {angle}° around {axis} axis",
+        **feature_tokens(feature)
+    })
 
 
-def list_profiles(command_id, params, ctx):
-    """List all profiles in a sketch with their areas."""
-    sketches = ctx.sketches
+def _profile_info(profile, index):
+    return {
+        "index": index,
+        "area": round(profile.areaProperties().area, 4),
+        "profile_token": entity_token(profile),
+    }
 
-    idx = params.get("sketch_index", sketches.count - 1)
 
-    sketch, error = get_sketch_by_index(sketches, idx)
+def list_profiles(command_id, params, ctx):
+    """
+    List all profiles in a sketch with their areas.
+
+    Params:
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        limit, cursor, stream, chunk_size: Paging/streaming (see helpers/pagination.py)
+    """
+    sketch, error = resolve_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
-    profiles = [
-        {"index": i, "area": round(sketch.profiles.item(i).areaProperties().area, 4)}
-        for i in range(sketch.profiles.count)
-    ]
+    profiles = sketch.profiles
 
-    write_result(command_id, True, {"profiles": profiles})
+    write_items(
+        command_id, params, "profiles", profiles.count,
+        lambda i: _profile_info(profiles.item(i), i)
+    )
 
 
 COMMANDS = {
@@ -6,25 +6,51 @@ import adsk.core
 import adsk.fusion
 
 from ...utils import write_result
-from ..helpers import get_body_by_index, collect_edges, find_top_face
+from ..api_trace import unwrap
+from ..helpers import (
+    resolve_body, collect_edges, collect_edges_by_token, find_top_face,
+    get_by_token, feature_tokens
+)
+
+
+def _get_edges(ctx, params, max_edges):
+    """
+    Edges from edge_tokens, else edge_indices on the body addressed by params
+    (default: all, up to max_edges). The body is only resolved without tokens.
+    """
+    edge_tokens = params.get("edge_tokens", None)
+    if edge_tokens is not None:
+        return collect_edges_by_token(ctx.design, edge_tokens)
+    body, error = resolve_body(ctx, params)
+    if error:
+        return None, error
+    return collect_edges(body, params.get("edge_indices", None), max_edges=max_edges), None
 
 
 def fillet(command_id, params, ctx):
-    """Add fillet to edges of a body."""
+    """
+    Add fillet to edges of a body.
+
+    Params:
+        body_index: Index of the body (default 0), or body_token; not
+                    needed with edge_tokens
+        radius: Fillet radius in cm (default 0.1)
+        edge_indices: Edge indices on the body (default: all, up to 50),
+                      or edge_tokens
+
+    Returns:
+        feature_token, body_tokens: Entity tokens of the new feature and its bodies
+    """
     root = ctx.root
 
-    body_idx = params.get("body_index", 0)
     radius = params.get("radius", 0.1)
-    edge_indices = params.get("edge_indices", None)
-
-    body, error = get_body_by_index(root, body_idx)
-    if error:
-        return write_result(command_id, False, None, error)
 
     fillets = root.features.filletFeatures
     fillet_input = fillets.createInput()
 
-    edges = collect_edges(body, edge_indices, max_edges=50)
+    edges, error = _get_edges(ctx, params, 50)
+    if error:
+        return write_result(command_id, False, None, error)
 
     if edges.count == 0:
         return write_result(command_id, False, None, "No edges to fillet")
@@ -33,26 +59,37 @@ def fillet(command_id, params, ctx):
         edges, adsk.core.ValueInput.createByReal(radius), True
     )
     fillet_input.isRollingBallCorner = True
-    fillets.add(fillet_input)
+    feature = fillets.add(fillet_input)
 
-    write_result(command_id, True, {"message": f"Fillet added, radius {radius}cm"})
+    write_result(command_id, True, {
+        "message": f"Fillet added, radius {radius}cm",
+        **feature_tokens(feature)
+    })
 
 
 def chamfer(command_id, params, ctx):
-    """Add chamfer to edges of a body."""
+    """
+    Add chamfer to edges of a body.
+
+    Params:
+        body_index: Index of the body (default 0), or body_token; not
+                    needed with edge_tokens
+        distance: Chamfer distance in cm (default 0.1)
+        edge_indices: Edge indices on the body (default: all, up to 20),
+                      or edge_tokens
+
+    Returns:
+        feature_token, body_tokens: Entity tokens of the new feature and its bodies
+    """
     root = ctx.root
 
-    body_idx = params.get("body_index", 0)
     distance = params.get("distance", 0.1)
-    edge_indices = params.get("edge_indices", None)
-
-    body, error = get_body_by_index(root, body_idx)
-    if error:
-        return write_result(command_id, False, None, error)
 
     chamfers = root.features.chamferFeatures
 
-    edges = collect_edges(body, edge_indices, max_edges=20)
+    edges, error = _get_edges(ctx, params, 20)
+    if error:
+        return write_result(command_id, False, None, error)
 
     if edges.count == 0:
         return write_result(command_id, False, None, "No edges to chamfer")
@@ -61,41 +98,63 @@ def chamfer(command_id, params, ctx):
     chamfer_input.chamferEdgeSets.addEqualDistanceChamferEdgeSet(
         edges, adsk.core.ValueInput.createByReal(distance), True
     )
-    chamfers.add(chamfer_input)
+    feature = chamfers.add(chamfer_input)
 
-    write_result(command_id, True, {"message": f"Chamfer added, distance {distance}cm"})
+    write_result(command_id, True, {
+        "message": f"Chamfer added, distance {distance}cm",
+        **feature_tokens(feature)
+    })
 
 
 def shell(command_id, params, ctx):
-    """Hollow out a body by removing faces."""
+    """
+    Hollow out a body by removing faces.
+
+    Params:
+        body_index: Index of the body (default 0), or body_token
+        thickness: Wall thickness in cm (default 0.1)
+        face_index: Face to remove, or face_token (default: top face if remove_top)
+        remove_top: Remove the topmost face when no face is given (default True)
+
+    Returns:
+        feature_token, body_tokens: Entity tokens of the new feature and its bodies
+    """
     root = ctx.root
 
-    body_idx = params.get("body_index", 0)
     thickness = params.get("thickness", 0.1)
     face_index = params.get("face_index", None)
+    face_token = params.get("face_token", None)
     remove_top = params.get("remove_top", True)
 
-    body, error = get_body_by_index(root, body_idx)
+    body, error = resolve_body(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
     shells = root.features.shellFeatures
     faces_to_remove = adsk.core.ObjectCollection.create()
 
-    if face_index is not None:
+    if face_token is not None:
+        face, error = get_by_token(ctx.design, face_token, "face", adsk.fusion.BRepFace)
+        if error:
+            return write_result(command_id, False, None, error)
+        faces_to_remove.add(unwrap(face))
+    elif face_index is not None:
         if face_index < body.faces.count:
-            faces_to_remove.add(body.faces.item(face_index))
+            faces_to_remove.add(unwrap(body.faces.item(face_index)))
     elif remove_top:
         # Find top face (highest Z)
         top_face = find_top_face(body)
         if top_face:
-            faces_to_remove.add(top_face)
+            faces_to_remove.add(unwrap(top_face))
 
     shell_input = shells.createInput(faces_to_remove)
     shell_input.insideThickness = adsk.core.ValueInput.createByReal(thickness)
-    shells.add(shell_input)
+    feature = shells.add(shell_input)
 
-    write_result(command_id, True, {"message": f"Shell created, thickness {thickness}cm"})
+    write_result(command_id, True, {
+        "message": f"Shell created, thickness {thickness}cm",
+        **feature_tokens(feature)
+    })
 
 
 COMMANDS = {
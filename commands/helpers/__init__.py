@@ -2,22 +2,36 @@
 Shared helper utilities for command handlers.
 
 Packages:
-- geometry/: Geometry helpers (components, sketches, bodies, edges, faces, planes)
+- geometry/: Geometry helpers (components, entity index, sketches, bodies,
+  edges, faces, planes)
 
 Modules:
 - sketch_curves: Sketch curve access (lines, circles, arcs, etc.)
 - command_utils: Decorators for reducing boilerplate
 - validation: Parameter validation
+- pagination: limit/cursor paging and streaming of collection results
 """
 
 # Geometry helpers (from geometry/ package)
 from .geometry import (
     collect_all_components,
+    traverse_components,
+    entity_index,
     get_all_sketches,
     get_sketch_by_global_index,
     get_body_by_index,
     get_sketch_by_index,
+    resolve_sketch,
+    resolve_global_sketch,
+    resolve_profile,
+    resolve_body,
     collect_edges,
+    collect_edges_by_token,
+    token_cache,
+    entity_token,
+    feature_tokens,
+    get_by_token,
+    get_entity,
     find_top_face,
     get_construction_axis,
     get_construction_plane,
@@ -42,3 +56,6 @@ from .command_utils import with_sketch, with_error_handling
 
 # Validation helpers
 from .validation import require_param, get_operation_type
+
+# Pagination / streaming
+from .pagination import get_page, write_items
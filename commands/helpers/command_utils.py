@@ -11,7 +11,8 @@ def with_sketch(fn):
     Decorator that handles sketch retrieval and error checking.
 
     Injects `sketch` and `comp` keyword arguments into the decorated function.
-    Expects `params` dict to have optional `sketch_index` (defaults to -1 for last).
+    Expects `params` dict to have optional `sketch_token`, or `sketch_index`
+    (defaults to -1 for last).
 
     Usage:
         @with_sketch
@@ -21,9 +22,8 @@ def with_sketch(fn):
     """
     @wraps(fn)
     def wrapper(command_id, params, ctx):
-        from .geometry import get_sketch_by_global_index
-        sketch_index = params.get("sketch_index", -1)
-        sketch, comp, error = get_sketch_by_global_index(ctx.root, sketch_index)
+        from .geometry import resolve_global_sketch
+        sketch, comp, error = resolve_global_sketch(ctx, params)
         if error:
             return write_result(command_id, False, None, error)
         return fn(command_id, params, ctx, sketch=sketch, comp=comp)
@@ -3,27 +3,46 @@ Geometry helpers package for Fusion 360.
 
 This package provides utilities for working with Fusion 360 geometry:
 - components: Component hierarchy traversal
+- entity_index: Cached design-wide index of sketches, bodies, features, planes
 - sketches: Sketch selection and retrieval
 - bodies: Body selection
 - edges: Edge collection
 - faces: Face selection and analysis
 - planes: Construction planes and axes
+- tokens: entityToken handles (token -> object cache, token-or-index params)
 """
 
-from .components import collect_all_components
-from .sketches import get_all_sketches, get_sketch_by_global_index, get_sketch_by_index
-from .bodies import get_body_by_index
-from .edges import collect_edges
+from .components import collect_all_components, traverse_components
+from .entity_index import entity_index
+from .tokens import token_cache, entity_token, feature_tokens, get_by_token, get_entity
+from .sketches import (
+    get_all_sketches, get_sketch_by_global_index, get_sketch_by_index,
+    resolve_sketch, resolve_global_sketch, resolve_profile,
+)
+from .bodies import get_body_by_index, resolve_body
+from .edges import collect_edges, collect_edges_by_token
 from .faces import find_top_face
 from .planes import get_construction_axis, get_construction_plane
 
 __all__ = [
     'collect_all_components',
+    'traverse_components',
+    'entity_index',
     'get_all_sketches',
     'get_sketch_by_global_index',
     'get_sketch_by_index',
+    'resolve_sketch',
+    'resolve_global_sketch',
+    'resolve_profile',
     'get_body_by_index',
+    'resolve_body',
     'collect_edges',
+    'collect_edges_by_token',
+    'token_cache',
+    'entity_token',
+    'feature_tokens',
+    'get_by_token',
+    'get_entity',
     'find_top_face',
     'get_construction_axis',
     'get_construction_plane',
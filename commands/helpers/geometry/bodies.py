@@ -2,6 +2,10 @@
 Body selection and retrieval helpers for Fusion 360.
 """
 
+import adsk.fusion
+
+from .tokens import get_entity
+
 
 def get_body_by_index(root, index):
     """
@@ -17,3 +21,18 @@ def get_body_by_index(root, index):
     if index >= root.bRepBodies.count:
         return None, f"Invalid body index {index}. Design has {root.bRepBodies.count} bodies."
     return root.bRepBodies.item(index), None
+
+
+def resolve_body(ctx, params):
+    """
+    Get the body addressed by params: body_token, else body_index in the root
+    component (default 0).
+
+    Returns:
+        tuple: (body, error_message) - body is None if error
+    """
+    return get_entity(
+        ctx, params, "body",
+        lambda: get_body_by_index(ctx.root, params.get("body_index", 0)),
+        adsk.fusion.BRepBody
+    )
@@ -3,25 +3,62 @@ Component hierarchy helpers for Fusion 360.
 """
 
 
+def traverse_components(root):
+    """
+    Walk the design hierarchy, visiting each component once.
+
+    A component placed by many occurrences (e.g. a fastener instanced 400
+    times) is walked once; its occurrences are collected instead. Components
+    are keyed by entityToken and listed in depth-first order of first visit.
+
+    Args:
+        root: Root component
+
+    Returns:
+        List of tuples: (component, occurrences, instance_count)
+        - occurrences: Occurrence objects placing the component in a parent
+          component, with transforms relative to that parent (empty for root)
+        - instance_count: Times the component appears in the whole assembly,
+          counting nested instances (1 for root)
+    """
+    root_token = root.entityToken
+    order = [(root, root_token)]
+    occurrences = {root_token: []}
+    parents = {}  # token -> parent token, once per occurrence
+
+    def traverse(comp, token):
+        for i in range(comp.occurrences.count):
+            occ = comp.occurrences.item(i)
+            child = occ.component
+            child_token = child.entityToken
+            parents.setdefault(child_token, []).append(token)
+            if child_token in occurrences:
+                occurrences[child_token].append(occ)
+                continue
+            occurrences[child_token] = [occ]
+            order.append((child, child_token))
+            traverse(child, child_token)
+
+    traverse(root, root_token)
+
+    counts = {}
+
+    def instance_count(token):
+        if token not in counts:
+            counts[token] = sum(instance_count(p) for p in parents[token]) if token in parents else 1
+        return counts[token]
+
+    return [(comp, occurrences[token], instance_count(token)) for comp, token in order]
+
+
 def collect_all_components(root):
     """
-    Recursively collect all components in the design hierarchy.
+    Collect each component in the design hierarchy once.
 
     Args:
         root: Root component
 
     Returns:
-        List of all components (including root)
+        List of unique components (including root), see traverse_components()
     """
-    components = [root]
-
-    def traverse_occurrences(occurrences):
-        for i in range(occurrences.count):
-            occ = occurrences.item(i)
-            comp = occ.component
-            components.append(comp)
-            if comp.occurrences.count > 0:
-                traverse_occurrences(comp.occurrences)
-
-    traverse_occurrences(root.occurrences)
-    return components
+    return [comp for comp, _, _ in traverse_components(root)]
@@ -3,6 +3,10 @@ Edge selection and collection helpers for Fusion 360.
 """
 
 import adsk.core
+import adsk.fusion
+
+from ...api_trace import unwrap
+from .tokens import get_by_token
 
 
 def collect_edges(body, edge_indices=None, max_edges=50):
@@ -22,9 +26,29 @@ def collect_edges(body, edge_indices=None, max_edges=50):
     if edge_indices:
         for idx in edge_indices:
             if idx < body.edges.count:
-                edges.add(body.edges.item(idx))
+                edges.add(unwrap(body.edges.item(idx)))
     else:
         for i in range(min(body.edges.count, max_edges)):
-            edges.add(body.edges.item(i))
+            edges.add(unwrap(body.edges.item(i)))
 
     return edges
+
+
+def collect_edges_by_token(design, edge_tokens):
+    """
+    Collect edges given by entity tokens into an ObjectCollection.
+
+    Args:
+        design: Active Design
+        edge_tokens: List of edge entityTokens
+
+    Returns:
+        tuple: (ObjectCollection of edges, error_message) - collection is None if error
+    """
+    edges = adsk.core.ObjectCollection.create()
+    for token in edge_tokens:
+        edge, error = get_by_token(design, token, "edge", adsk.fusion.BRepEdge)
+        if error:
+            return None, error
+        edges.add(unwrap(edge))
+    return edges, None
@@ -0,0 +1,146 @@
+"""
+Cached design-wide index of sketches, bodies, features and construction planes.
+
+Global indices (the numbering used by sketch_index in constraint commands,
+get_bodies_detailed, ...) follow the component traversal order of
+collect_all_components. Resolving one used to walk every component and
+entity of the design; the index walks it once per kind and keeps the result.
+
+The index is kept current by:
+- create_sketch / create_sketch_on_face, which register the new sketch
+  (added()) instead of forcing a rebuild
+- the dispatcher, which calls invalidate() after any other command that may
+  add or remove entities (see INDEX_PRESERVING_ACTIONS in dispatcher.py)
+- Fusion change events (UI commands, document switches), see
+  core/design_events.py
+
+Lookups re-check that the entity they return is still valid and rebuild
+once if not, so an index missed by all of the above heals itself.
+"""
+
+from .components import collect_all_components
+
+# Collection of each indexed kind on a component
+KINDS = {
+    "sketches": lambda comp: comp.sketches,
+    "bodies": lambda comp: comp.bRepBodies,
+    "features": lambda comp: comp.features,
+    "planes": lambda comp: comp.constructionPlanes,
+}
+
+
+class EntityIndex:
+    """Global numbering of design entities, built lazily per kind."""
+
+    def __init__(self):
+        self._components = None
+        self._positions = {}  # component entityToken -> positions in _components
+        self._slots = {}      # kind -> one entity list per component position
+        self._flat = {}       # kind -> [(entity, global_index, component)]
+        self.builds = 0
+        self.updates = 0
+        self.invalidations = 0
+
+    def _ensure(self, root, kind):
+        if self._components is None:
+            self._components = collect_all_components(root)
+            self._positions = {}
+            for position, comp in enumerate(self._components):
+                self._positions.setdefault(comp.entityToken, []).append(position)
+        if kind not in self._slots:
+            collection_of = KINDS[kind]
+            slots = []
+            for comp in self._components:
+                collection = collection_of(comp)
+                slots.append([collection.item(i) for i in range(collection.count)])
+            self._slots[kind] = slots
+            self.builds += 1
+        flat = self._flat.get(kind)
+        if flat is None:
+            flat = []
+            for comp, entities in zip(self._components, self._slots[kind]):
+                for entity in entities:
+                    flat.append((entity, len(flat), comp))
+            self._flat[kind] = flat
+        return flat
+
+    def entries(self, root, kind):
+        """
+        Return every entity of a kind with its global index.
+
+        Args:
+            root: Root component
+            kind: "sketches", "bodies", "features" or "planes"
+
+        Returns:
+            List of tuples: (entity, global_index, component)
+        """
+        return self._ensure(root, kind)
+
+    def get(self, root, kind, index):
+        """
+        Return (entity, component) at a global index.
+
+        Returns:
+            (None, None) if index is out of range, also when a rebuild
+            triggered by an invalid entity leaves fewer entities
+        """
+        flat = self._ensure(root, kind)
+        if not 0 <= index < len(flat):
+            return None, None
+        entity, _, comp = flat[index]
+        if not entity.isValid:
+            # Changed behind our back: rebuild once and look again
+            self.invalidate()
+            flat = self._ensure(root, kind)
+            if index >= len(flat):
+                return None, None
+            entity, _, comp = flat[index]
+        return entity, comp
+
+    def count(self, root, kind):
+        """Return the number of entities of a kind in the design."""
+        return len(self._ensure(root, kind))
+
+    def added(self, kind, entity, comp):
+        """
+        Register an entity the bridge just created in comp.
+
+        Keeps the index current without a rebuild. Kinds that have not been
+        indexed yet are left to be built on first use.
+        """
+        slots = self._slots.get(kind)
+        if slots is None:
+            return
+        positions = self._positions.get(comp.entityToken)
+        if not positions:
+            # Component created since the index was built
+            return self.invalidate()
+        for position in positions:
+            slots[position].append(entity)
+        self._flat.pop(kind, None)
+        self.updates += 1
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt on the next lookup."""
+        self._components = None
+        self._positions = {}
+        self._slots = {}
+        self._flat = {}
+        self.invalidations += 1
+
+    def stats(self):
+        """Return index counters (for diagnostics)."""
+        components = self._components
+        return {
+            "components": len(components) if components is not None else None,
+            "indexed": {kind: sum(len(entities) for entities in slots)
+                        for kind, slots in list(self._slots.items())},
+            "builds": self.builds,
+            "updates": self.updates,
+            "invalidations": self.invalidations,
+        }
+
+
+# Shared by all commands (main thread only)
+entity_index = EntityIndex()
@@ -2,30 +2,25 @@
 Sketch selection and retrieval helpers for Fusion 360.
 """
 
-from .components import collect_all_components
+import adsk.fusion
+
+from .entity_index import entity_index
+from .tokens import get_entity, get_by_token
 
 
 def get_all_sketches(root):
     """
     Get all sketches across all components with global indexing.
 
+    Served from the cached entity index (see entity_index.py).
+
     Args:
         root: Root component
 
     Returns:
         List of tuples: (sketch, global_index, component)
     """
-    all_components = collect_all_components(root)
-    sketches = []
-    global_index = 0
-
-    for comp in all_components:
-        for i in range(comp.sketches.count):
-            sketch = comp.sketches.item(i)
-            sketches.append((sketch, global_index, comp))
-            global_index += 1
-
-    return sketches
+    return entity_index.entries(root, "sketches")
 
 
 def get_sketch_by_global_index(root, index):
@@ -39,18 +34,22 @@ def get_sketch_by_global_index(root, index):
     Returns:
         tuple: (sketch, component, error_message)
     """
-    all_sketches = get_all_sketches(root)
+    count = entity_index.count(root, "sketches")
 
-    if not all_sketches:
+    if not count:
         return None, None, "No sketches in design"
 
     if index is None or index == -1:
-        index = len(all_sketches) - 1
+        index = count - 1
 
-    if index < 0 or index >= len(all_sketches):
-        return None, None, f"Invalid sketch index {index}. Design has {len(all_sketches)} sketches."
+    if index < 0 or index >= count:
+        return None, None, f"Invalid sketch index {index}. Design has {count} sketches."
 
-    sketch, _, comp = all_sketches[index]
+    sketch, comp = entity_index.get(root, "sketches", index)
+    if sketch is None:
+        # The index was rebuilt with fewer sketches
+        count = entity_index.count(root, "sketches")
+        return None, None, f"Invalid sketch index {index}. Design has {count} sketches."
     return sketch, comp, None
 
 
@@ -72,3 +71,65 @@ def get_sketch_by_index(sketches, index):
         return None, f"Invalid sketch index {index}. Design has {sketches.count} sketches."
 
     return sketches.item(index), None
+
+
+def resolve_sketch(ctx, params):
+    """
+    Get the sketch addressed by params: sketch_token, else sketch_index in the
+    active component (default: last sketch).
+
+    Returns:
+        tuple: (sketch, error_message) - sketch is None if error
+    """
+    sketches = ctx.sketches
+    return get_entity(
+        ctx, params, "sketch",
+        lambda: get_sketch_by_index(sketches, params.get("sketch_index", sketches.count - 1)),
+        adsk.fusion.Sketch
+    )
+
+
+def resolve_global_sketch(ctx, params, via=None):
+    """
+    Get the sketch addressed by params: sketch_token, else global
+    sketch_index across all components (default: last sketch).
+
+    Args:
+        via: Optional (params, kind) of a sketch entity token, e.g.
+             (params, "line") for line_token; when params name no sketch and
+             that token is given, the sketch is the entity's parent
+
+    Returns:
+        tuple: (sketch, component, error_message)
+    """
+    token = via[0].get(f"{via[1]}_token") if via else None
+    if token is not None and params.get("sketch_token") is None \
+            and params.get("sketch_index") is None:
+        entity, error = get_by_token(ctx.design, token, via[1])
+        if error:
+            return None, None, error
+        sketch = getattr(entity, "parentSketch", None)
+        if sketch is None:
+            return None, None, f"{via[1]}_token does not refer to a sketch entity"
+        return sketch, sketch.parentComponent, None
+    if params.get("sketch_token") is not None:
+        sketch, error = get_entity(ctx, params, "sketch", None, adsk.fusion.Sketch)
+        return sketch, sketch.parentComponent if sketch else None, error
+    return get_sketch_by_global_index(ctx.root, params.get("sketch_index", -1))
+
+
+def resolve_profile(ctx, params, sketch):
+    """
+    Get the profile addressed by params: profile_token, else profile_index in
+    sketch (default 0).
+
+    Returns:
+        tuple: (profile, error_message) - profile is None if error
+    """
+    def by_index():
+        index = params.get("profile_index", 0)
+        profiles = sketch.profiles
+        if index < 0 or index >= profiles.count:
+            return None, f"Invalid profile_index {index}. Sketch has {profiles.count} profiles"
+        return profiles.item(index), None
+    return get_entity(ctx, params, "profile", by_index, adsk.fusion.Profile)
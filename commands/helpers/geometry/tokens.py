@@ -0,0 +1,142 @@
+"""
+Entity token handles for Fusion 360 entities.
+
+Creating commands return each new entity's entityToken (sketch_token,
+body_tokens, feature_token, ...), and any param that takes an index also
+takes the matching token (sketch_index -> sketch_token, edge_indices ->
+edge_tokens). Tokens survive deletes and recomputes, so clients can keep
+handles between steps instead of re-querying indices.
+
+Tokens are resolved through an LRU token -> object cache, falling back to
+Design.findEntityByToken for unknown tokens and for cached objects that are
+no longer valid. The cache is cleared when Fusion reports a change made
+outside the bridge (see design_changed() in commands/dispatcher.py).
+"""
+
+from collections import OrderedDict
+
+from ....config import TOKEN_CACHE_MAX_ENTRIES
+from ...api_trace import cast
+
+
+class TokenCache:
+    """LRU map of entityToken -> Fusion object."""
+
+    def __init__(self, max_entries):
+        """
+        Args:
+            max_entries: Maximum number of cached objects
+        """
+        self.max_entries = max_entries
+        self._entities = OrderedDict()
+        self.hits = 0
+        self.lookups = 0
+
+    def remember(self, entity):
+        """Cache an entity under its token and return the token."""
+        token = entity.entityToken
+        self._entities[token] = entity
+        self._entities.move_to_end(token)
+        while len(self._entities) > self.max_entries:
+            self._entities.popitem(last=False)
+        return token
+
+    def find(self, design, token):
+        """
+        Return the entity for a token, or None if the design has none.
+
+        Args:
+            design: Active Design (used for findEntityByToken)
+            token: entityToken string
+        """
+        entity = self._entities.get(token)
+        if entity is not None and entity.isValid:
+            self._entities.move_to_end(token)
+            self.hits += 1
+            return entity
+        self.lookups += 1
+        found = design.findEntityByToken(token)
+        if not found:
+            self._entities.pop(token, None)
+            return None
+        entity = found[0]
+        self._entities[token] = entity
+        while len(self._entities) > self.max_entries:
+            self._entities.popitem(last=False)
+        return entity
+
+    def invalidate(self):
+        """Drop every cached object (tokens stay valid; they are looked up again)."""
+        self._entities.clear()
+
+    def stats(self):
+        """Return cache counters (for diagnostics)."""
+        return {"entries": len(self._entities), "hits": self.hits, "lookups": self.lookups}
+
+
+# Shared by all commands (main thread only)
+token_cache = TokenCache(TOKEN_CACHE_MAX_ENTRIES)
+
+
+def entity_token(entity):
+    """Return an entity's entityToken (and cache the entity), or None if it has none."""
+    if entity is None:
+        return None
+    try:
+        return token_cache.remember(entity)
+    except Exception:
+        return None
+
+
+def feature_tokens(feature):
+    """Return tokens of a new feature and of the bodies it created or changed."""
+    bodies = feature.bodies
+    return {
+        "feature_token": entity_token(feature),
+        "body_tokens": [entity_token(bodies.item(i)) for i in range(bodies.count)],
+    }
+
+
+def get_by_token(design, token, kind, expected=None):
+    """
+    Resolve an entity token.
+
+    Args:
+        design: Active Design
+        token: entityToken string
+        kind: Name used in error messages ("sketch", "body", ...)
+        expected: Optional adsk class the entity must cast to (e.g. adsk.fusion.Sketch)
+
+    Returns:
+        tuple: (entity, error_message) - entity is None if error
+    """
+    if not isinstance(token, str) or not token:
+        return None, f"Invalid {kind}_token: expected a non-empty string"
+    entity = token_cache.find(design, token)
+    if entity is None:
+        return None, f"No {kind} found for {kind}_token"
+    if expected is not None:
+        entity = cast(expected, entity)
+        if entity is None:
+            return None, f"{kind}_token does not refer to a {kind}"
+    return entity, None
+
+
+def get_entity(ctx, params, kind, by_index, expected=None):
+    """
+    Resolve "<kind>_token" from params if present, else fall back to an index lookup.
+
+    Args:
+        ctx: CommandContext
+        params: Params dict (or a sub-dict such as a loft section)
+        kind: Param prefix ("sketch", "body", "face", "plane", "line", ...)
+        by_index: Callable returning (entity, error_message) from the index params
+        expected: Optional adsk class the token's entity must cast to
+
+    Returns:
+        tuple: (entity, error_message) - entity is None if error
+    """
+    token = params.get(f"{kind}_token")
+    if token is not None:
+        return get_by_token(ctx.design, token, kind, expected)
+    return by_index()
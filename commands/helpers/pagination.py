@@ -0,0 +1,91 @@
+"""
+Pagination and streaming for commands that return whole collections.
+
+Params understood by paged commands:
+    limit (int, optional): Maximum number of items to return
+    cursor (str, optional): next_cursor from a previous page
+    stream (bool, optional): Emit items in partial results of chunk_size
+                             items as they are produced (see write_partial)
+    chunk_size (int, optional): Items per streamed chunk (default: STREAM_CHUNK_SIZE)
+"""
+
+from ...config import STREAM_CHUNK_SIZE
+from ...utils import write_result, write_partial, can_stream
+
+
+def get_page(params, total):
+    """
+    Resolve limit/cursor params against a collection.
+
+    Args:
+        params: Command params
+        total: Number of items in the collection
+
+    Returns:
+        tuple: (start, stop, next_cursor, error_message)
+    """
+    try:
+        start = int(params.get("cursor") or 0)
+    except (TypeError, ValueError):
+        return 0, 0, None, f"Invalid cursor: {params.get('cursor')}"
+    if start < 0 or start > total:
+        return 0, 0, None, f"Cursor {start} is out of range (collection has {total} items)"
+
+    limit = params.get("limit")
+    if limit is None:
+        return start, total, None, None
+    if not isinstance(limit, int) or limit < 1:
+        return 0, 0, None, "limit must be a positive integer"
+    stop = min(total, start + limit)
+    return start, stop, (str(stop) if stop < total else None), None
+
+
+def write_items(command_id, params, key, total, produce, extra=None):
+    """
+    Write a collection result, honouring limit/cursor and stream params.
+
+    Items are produced one at a time, so a page only touches the entities
+    it returns. In stream mode each chunk is sent as soon as it is built;
+    the final result then carries the page metadata without the items.
+    Streaming falls back to a single result when the caller cannot receive
+    partial records (e.g. inside batch or JSON-RPC).
+
+    Args:
+        command_id: Command id
+        params: Command params
+        key: Result field holding the item list (e.g. "constraints")
+        total: Number of items in the collection
+        produce: Callable(index) -> item dict
+        extra: Other result fields (sketch name, ...)
+
+    Returns:
+        Result: extra fields, key (items), total, next_cursor
+    """
+    start, stop, next_cursor, error = get_page(params, total)
+    if error:
+        return write_result(command_id, False, None, error)
+
+    result = dict(extra or {})
+    result["total"] = total
+    result["next_cursor"] = next_cursor
+
+    if not (params.get("stream") and can_stream()):
+        result[key] = [produce(i) for i in range(start, stop)]
+        return write_result(command_id, True, result)
+
+    chunk_size = max(1, int(params.get("chunk_size", STREAM_CHUNK_SIZE)))
+    chunk = []
+    chunks = 0
+    for i in range(start, stop):
+        chunk.append(produce(i))
+        if len(chunk) >= chunk_size:
+            write_partial(command_id, {key: chunk}, chunks)
+            chunks += 1
+            chunk = []
+    if chunk:
+        write_partial(command_id, {key: chunk}, chunks)
+        chunks += 1
+
+    result["streamed"] = stop - start
+    result["chunks"] = chunks
+    write_result(command_id, True, result)
@@ -0,0 +1,84 @@
+"""
+JSON-RPC 2.0 front end for the command registry.
+
+Maps a request's "method" to a COMMAND_REGISTRY action and its "params"
+(by-name only) to the command params. Batch requests (a JSON array) are run
+in order within a single main-thread dispatch and return an array of
+responses. Notifications (requests without an "id") run but get no response.
+"""
+
+from ..config import CONTEXT_SNAPSHOT
+from ..utils import capture_results
+from . import get_handler
+from .context import CommandContext
+from .dispatcher import execute_command
+
+# Standard JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+# Implementation-defined: the command ran but reported failure
+COMMAND_FAILED = -32000
+
+
+def is_jsonrpc(payload):
+    """Return True if a decoded message should be handled as JSON-RPC."""
+    return isinstance(payload, list) or (isinstance(payload, dict) and "jsonrpc" in payload)
+
+
+def error_response(request_id, code, message):
+    """Build a JSON-RPC error response."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _execute_one(request, app, ui, ctx=None):
+    if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" \
+            or not isinstance(request.get("method"), str):
+        return error_response(None, INVALID_REQUEST, "Invalid Request")
+
+    request_id = request.get("id")
+    is_notification = "id" not in request
+    method = request["method"]
+    params = request.get("params", {})
+
+    if not get_handler(method):
+        response = error_response(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+    elif not isinstance(params, dict):
+        response = error_response(request_id, INVALID_PARAMS, "params must be an object")
+    else:
+        with capture_results() as results:
+            execute_command({"id": request_id, "action": method, "params": params}, app, ui, ctx)
+        record = results[-1] if results else None
+        if record is None:
+            response = error_response(request_id, COMMAND_FAILED, "Command produced no result")
+        elif record["success"]:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": record["result"]}
+        else:
+            response = error_response(request_id, COMMAND_FAILED, record["error"])
+
+    return None if is_notification else response
+
+
+def execute_jsonrpc(payload, app, ui):
+    """
+    Execute a JSON-RPC 2.0 request or batch.
+
+    Args:
+        payload: Decoded JSON-RPC request (dict) or batch (list)
+        app: Fusion 360 Application object
+        ui: Fusion 360 UserInterface object
+
+    Returns:
+        Response dict, list of responses for a batch, or None when there is
+        nothing to send back (notifications only)
+    """
+    if isinstance(payload, list):
+        if not payload:
+            return error_response(None, INVALID_REQUEST, "Empty batch")
+        # The whole batch runs in one dispatch, so it shares one context snapshot
+        ctx = CommandContext(app, ui, snapshot=CONTEXT_SNAPSHOT)
+        responses = [_execute_one(request, app, ui, ctx) for request in payload]
+        responses = [r for r in responses if r is not None]
+        return responses or None
+    return _execute_one(payload, app, ui)
@@ -0,0 +1,181 @@
+"""
+Opt-in cProfile capture of commands.
+
+Commands whose action is in PROFILE_ACTIONS, plus a random PROFILE_SAMPLE_RATE
+share of all commands, run under cProfile. Each profile is written to
+PROFILE_DIR (profiles/ beside sessions/) as a .prof file for pstats or
+snakeviz, with a .txt summary of the PROFILE_TOP functions by cumulative
+time. Only the newest PROFILE_MAX_FILES profiles are kept.
+
+set_profiling changes the actions and sample rate at runtime, so a profile
+of a slow command can be taken on a user's machine without editing the
+add-in. Settings changed this way last until Fusion restarts.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+from datetime import datetime
+
+from ..config import (
+    PROFILE_ACTIONS, PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_MAX_FILES, PROFILE_TOP
+)
+from ..utils import write_result
+
+
+class Profiler:
+    """Decides which commands to profile and writes their profiles."""
+
+    def __init__(self, actions, sample_rate, directory, max_files, top):
+        """
+        Args:
+            actions: Action names that are always profiled
+            sample_rate: Share (0..1) of all other commands that are profiled
+            directory: Where profiles are written
+            max_files: Number of profiles kept (oldest are deleted)
+            top: Functions listed in each text summary
+        """
+        self.actions = set(actions)
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.max_files = max_files
+        self.top = top
+        # cProfile allows one active profiler per process
+        self._lock = threading.Lock()
+        self._active = False
+        self.written = 0
+
+    def start(self, action):
+        """
+        Start profiling a command if it is selected.
+
+        Returns:
+            Enabled cProfile.Profile to pass to stop(), or None
+        """
+        if action not in self.actions and not (
+                self.sample_rate and random.random() < self.sample_rate):
+            return None
+        with self._lock:
+            if self._active:
+                return None  # Batch step, or a command on another thread
+            self._active = True
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger's) is already running
+            with self._lock:
+                self._active = False
+            return None
+        return profile
+
+    def stop(self, profile, command_id, action):
+        """Stop a profile started by start() and write it out."""
+        profile.disable()
+        with self._lock:
+            self._active = False
+        try:
+            self._write(profile, command_id, action)
+        except OSError:
+            pass  # Never fail a command because its profile could not be saved
+
+    def _write(self, profile, command_id, action):
+        os.makedirs(self.directory, exist_ok=True)
+        now = datetime.now()
+        timestamp = f"{now.strftime('%Y-%m-%d_%H-%M-%S')}-{now.microsecond // 1000:03d}"
+        name = re.sub(r"[^\w-]", "_", f"{timestamp}_{action}_{command_id}")
+        path = os.path.join(self.directory, name)
+        profile.dump_stats(f"{path}.prof")
+
+        summary = io.StringIO()
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        with open(f"{path}.txt", "w") as f:
+            f.write(f"action: {action}\ncommand_id: {command_id}\n")
+            f.write(summary.getvalue())
+        self.written += 1
+        self._rotate()
+
+    def _rotate(self):
+        """Delete the oldest profiles beyond max_files (names sort by time)."""
+        names = sorted(n[:-5] for n in os.listdir(self.directory) if n.endswith(".prof"))
+        for name in names[:max(0, len(names) - self.max_files)]:
+            for ext in (".prof", ".txt"):
+                try:
+                    os.remove(os.path.join(self.directory, name + ext))
+                except OSError:
+                    pass
+
+    def recent(self, limit=10):
+        """Return the newest profile file names, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted((n for n in names if n.endswith(".prof")), reverse=True)[:limit]
+
+    def settings(self):
+        """Return the current settings."""
+        return {
+            "actions": sorted(self.actions),
+            "sample_rate": self.sample_rate,
+            "directory": self.directory,
+            "max_files": self.max_files,
+            "profiles_written": self.written,
+        }
+
+
+# Shared by all commands
+profiler = Profiler(PROFILE_ACTIONS, PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_MAX_FILES,
+                    PROFILE_TOP)
+
+
+def set_profiling(command_id, params, ctx):
+    """
+    Change which commands are profiled, without restarting the add-in.
+
+    Params:
+        actions (list, optional): Actions to always profile (replaces the list)
+        add (list, optional): Actions to add to the list
+        remove (list, optional): Actions to remove from the list
+        sample_rate (float, optional): Share 0..1 of all commands to profile
+        off (bool, optional): Stop all profiling (clears actions, rate 0)
+
+    Returns:
+        Current settings and the newest profile files
+    """
+    lists = {}
+    for key in ("actions", "add", "remove"):
+        value = params.get(key)
+        if value is not None:
+            if not isinstance(value, list) or not all(isinstance(a, str) for a in value):
+                return write_result(command_id, False, None, f"{key} must be a list of action names")
+            lists[key] = value
+
+    sample_rate = params.get("sample_rate")
+    if sample_rate is not None:
+        if isinstance(sample_rate, bool) or not isinstance(sample_rate, (int, float)) \
+                or not 0 <= sample_rate <= 1:
+            return write_result(command_id, False, None, "sample_rate must be a number from 0 to 1")
+
+    if params.get("off"):
+        profiler.actions = set()
+        profiler.sample_rate = 0.0
+    if sample_rate is not None:
+        profiler.sample_rate = float(sample_rate)
+    if "actions" in lists:
+        profiler.actions = set(lists["actions"])
+    profiler.actions |= set(lists.get("add", ()))
+    profiler.actions -= set(lists.get("remove", ()))
+
+    write_result(command_id, True, dict(profiler.settings(), recent=profiler.recent()))
+
+
+# Command registry for this module
+COMMANDS = {
+    "set_profiling": set_profiling,
+}
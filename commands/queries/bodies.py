@@ -3,23 +3,7 @@ Body-related query commands.
 """
 
 from ...utils import write_result
-
-
-def _collect_all_components(root):
-    """Recursively collect all components in the design hierarchy."""
-    components = [root]
-
-    def traverse_occurrences(occurrences):
-        for i in range(occurrences.count):
-            occ = occurrences.item(i)
-            comp = occ.component
-            components.append(comp)
-            # Recursively traverse nested occurrences
-            if comp.occurrences.count > 0:
-                traverse_occurrences(comp.occurrences)
-
-    traverse_occurrences(root.occurrences)
-    return components
+from ..helpers import entity_index, entity_token
 
 
 def _get_body_info(body, index, component_name=None):
@@ -40,6 +24,7 @@ def _get_body_info(body, index, component_name=None):
     info = {
         "name": body.name,
         "index": index,
+        "token": entity_token(body),
         "is_solid": body.isSolid,
         "volume_cm3": round(body.volume, 4) if body.volume else None,
         "area_cm2": round(body.area, 4) if body.area else None,
@@ -69,18 +54,10 @@ def get_bodies_detailed(command_id, params, ctx):
     """
     root = ctx.root
 
-    # Collect all components recursively
-    all_components = _collect_all_components(root)
-
+    # All bodies across the component hierarchy, from the entity index
     bodies = []
-    global_index = 0
-
-    for comp in all_components:
-        for i in range(comp.bRepBodies.count):
-            body = comp.bRepBodies.item(i)
-            body_info = _get_body_info(body, global_index, comp.name)
-            bodies.append(body_info)
-            global_index += 1
+    for body, global_index, comp in entity_index.entries(root, "bodies"):
+        bodies.append(_get_body_info(body, global_index, comp.name))
 
     write_result(command_id, True, {"bodies": bodies, "count": len(bodies)})
 
@@ -98,14 +75,8 @@ def get_circular_edges(command_id, params, ctx):
     root = ctx.root
     body_index = params.get("body_index")
 
-    # Collect all components recursively
-    all_components = _collect_all_components(root)
-
-    # Gather all bodies
-    all_bodies = []
-    for comp in all_components:
-        for i in range(comp.bRepBodies.count):
-            all_bodies.append((comp.bRepBodies.item(i), comp.name))
+    # Gather all bodies (from the entity index)
+    all_bodies = [(body, comp.name) for body, _, comp in entity_index.entries(root, "bodies")]
 
     if body_index is not None:
         if body_index >= len(all_bodies):
@@ -3,23 +3,7 @@ Design-level query commands.
 """
 
 from ...utils import write_result
-
-
-def _collect_all_components(root):
-    """Recursively collect all components in the design hierarchy."""
-    components = [root]
-
-    def traverse_occurrences(occurrences):
-        for i in range(occurrences.count):
-            occ = occurrences.item(i)
-            comp = occ.component
-            components.append(comp)
-            # Recursively traverse nested occurrences
-            if comp.occurrences.count > 0:
-                traverse_occurrences(comp.occurrences)
-
-    traverse_occurrences(root.occurrences)
-    return components
+from ..helpers import collect_all_components
 
 
 def get_info(command_id, params, ctx):
@@ -31,7 +15,7 @@ def get_info(command_id, params, ctx):
     design = ctx.design
 
     # Collect all components recursively
-    all_components = _collect_all_components(root)
+    all_components = collect_all_components(root)
 
     bodies = []
     global_index = 0
@@ -66,7 +50,7 @@ def get_full_design(command_id, params, ctx):
     design = ctx.design
 
     # Collect all components recursively
-    all_components = _collect_all_components(root)
+    all_components = collect_all_components(root)
 
     # Bodies summary (across all components)
     bodies = []
@@ -5,7 +5,9 @@ Sketch-related query commands.
 import math
 
 from ...utils import write_result
-from ..helpers import get_all_sketches, get_sketch_by_global_index
+from ..helpers import (
+    get_all_sketches, get_sketch_by_global_index, resolve_global_sketch, entity_token
+)
 
 
 def get_sketches_detailed(command_id, params, ctx):
@@ -22,6 +24,7 @@ def get_sketches_detailed(command_id, params, ctx):
         sketch_list.append({
             "name": sketch.name,
             "index": global_index,
+            "token": entity_token(sketch),
             "component": comp.name,
             "profile_count": sketch.profiles.count,
             "is_visible": sketch.isVisible,
@@ -41,12 +44,14 @@ def get_sketches_detailed(command_id, params, ctx):
 def get_sketch_geometry(command_id, params, ctx):
     """Get detailed geometry coordinates for all curves in a sketch.
 
-    Supports global indexing across all components.
+    Supports global indexing across all components, or sketch_token.
     """
-    root = ctx.root
     sketch_index = params.get("sketch_index", 0)
 
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    if params.get("sketch_token") is not None:
+        sketch, comp, error = resolve_global_sketch(ctx, params)
+    else:
+        sketch, comp, error = get_sketch_by_global_index(ctx.root, sketch_index)
     if error:
         return write_result(command_id, False, None, error)
 
@@ -62,6 +67,7 @@ def get_sketch_geometry(command_id, params, ctx):
         circle = curves.sketchCircles.item(i)
         circles.append({
             "index": i,
+            "token": entity_token(circle),
             "center": pt(circle.centerSketchPoint.geometry),
             "radius": round(circle.radius, 4),
             "diameter": round(circle.radius * 2, 4),
@@ -74,6 +80,7 @@ def get_sketch_geometry(command_id, params, ctx):
         line = curves.sketchLines.item(i)
         lines.append({
             "index": i,
+            "token": entity_token(line),
             "start": pt(line.startSketchPoint.geometry),
             "end": pt(line.endSketchPoint.geometry),
             "length": round(line.length, 4),
@@ -86,6 +93,7 @@ def get_sketch_geometry(command_id, params, ctx):
         arc = curves.sketchArcs.item(i)
         arcs.append({
             "index": i,
+            "token": entity_token(arc),
             "center": pt(arc.centerSketchPoint.geometry),
             "radius": round(arc.radius, 4),
             "start_point": pt(arc.startSketchPoint.geometry),
@@ -101,6 +109,7 @@ def get_sketch_geometry(command_id, params, ctx):
         ellipse = curves.sketchEllipses.item(i)
         ellipses.append({
             "index": i,
+            "token": entity_token(ellipse),
             "center": pt(ellipse.centerSketchPoint.geometry),
             "major_radius": round(ellipse.majorRadius, 4),
             "minor_radius": round(ellipse.minorRadius, 4),
@@ -0,0 +1,94 @@
+"""
+Result cache for read-only commands.
+
+Repeated inspection calls (get_sketch_constraints, list_profiles,
+export_session) return the stored result instead of walking the Fusion API
+again. Entries are keyed by (action, normalized params, design revision).
+The revision is bumped, and the cache cleared, whenever a mutating command
+runs or Fusion reports a change (a UI command finished, another document
+was activated); see design_changed() in commands/dispatcher.py and
+core/design_events.py.
+
+Eviction is LRU, bounded by entry count and by total JSON size.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+from ..config import RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES
+
+
+class ResultCache:
+    """LRU cache of successful read-only results."""
+
+    def __init__(self, max_entries, max_bytes):
+        """
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of cached results (as JSON)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.revision = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key(self, action, params):
+        """Return the cache key for an action and its params at the current revision."""
+        return (action, json.dumps(params, sort_keys=True, default=str), self.revision)
+
+    def get(self, key):
+        """Return the cached result for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result):
+        """Store a result unless the design changed while it was computed."""
+        size = len(json.dumps(result, default=str))
+        with self._lock:
+            if key[2] != self.revision or size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def invalidate(self):
+        """Bump the design revision and drop every cached result."""
+        with self._lock:
+            self.revision += 1
+            self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return cache counters (for diagnostics)."""
+        with self._lock:
+            return {
+                "revision": self.revision,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+# Shared by the dispatcher and the design change handlers
+result_cache = ResultCache(RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES)
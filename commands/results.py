@@ -0,0 +1,44 @@
+"""
+Result journal commands: get_result
+"""
+
+from ..bridge_client.codec import decompress_record
+from ..utils import write_result, result_journal
+
+
+def get_result(command_id, params, ctx):
+    """Look up earlier results from the result journal (results.jsonl).
+
+    Params:
+        command_id (int, optional): A single command id to fetch
+        command_ids (list, optional): Several command ids to fetch
+        client (str, optional): Client the ids belong to (default: the caller)
+
+    Returns:
+        results: List of result records that were found (decompressed; the
+                 response as a whole is compressed again if it is large)
+        missing: Ids with no result in the journal (not run yet, or rotated out)
+    """
+    ids = params.get("command_ids")
+    if ids is None:
+        if "command_id" not in params:
+            return write_result(command_id, False, None, "command_id or command_ids required")
+        ids = [params["command_id"]]
+
+    client = params.get("client", ctx.client)
+    results = []
+    missing = []
+    for cid in ids:
+        record = result_journal.get(cid, client)
+        if record is None:
+            missing.append(cid)
+        else:
+            results.append(decompress_record(record))
+
+    write_result(command_id, True, {"results": results, "missing": missing})
+
+
+# Command registry for this module
+COMMANDS = {
+    "get_result": get_result,
+}
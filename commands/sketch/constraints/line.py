@@ -5,7 +5,9 @@ Commands for constraining lines to be vertical, horizontal, parallel, perpendicu
 """
 
 from ....utils import write_result
-from ...helpers import get_sketch_by_global_index
+import adsk.fusion
+
+from ...helpers import resolve_global_sketch, get_line, get_entity, entity_token
 
 
 def add_constraint_vertical(command_id, params, ctx):
@@ -13,35 +15,33 @@ def add_constraint_vertical(command_id, params, ctx):
     Add a vertical constraint to a line.
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
-        line_index: Index of the line to make vertical
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        line_index: Index of the line to make vertical, or line_token
+
+    Returns:
+        constraint_token: Entity token of the new constraint
 
     Example:
         {"action": "add_constraint_vertical", "params": {"line_index": 5}}
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
     line_index = params.get("line_index", 0)
 
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    sketch, comp, error = resolve_global_sketch(ctx, params, via=(params, "line"))
     if error:
         return write_result(command_id, False, None, error)
 
-    lines = sketch.sketchCurves.sketchLines
-    if line_index < 0 or line_index >= lines.count:
-        return write_result(
-            command_id, False, None,
-            f"Invalid line index {line_index}. Sketch has {lines.count} lines."
-        )
-
-    line = lines.item(line_index)
+    line, error = get_entity(ctx, params, "line", lambda: get_line(sketch, line_index),
+                             adsk.fusion.SketchLine)
+    if error:
+        return write_result(command_id, False, None, error)
 
     try:
         constraints = sketch.geometricConstraints
-        constraints.addVertical(line)
+        constraint = constraints.addVertical(line)
 
         write_result(command_id, True, {
             "message": f"Vertical constraint added to line {line_index}",
+            "constraint_token": entity_token(constraint),
             "sketch_name": sketch.name,
             "component": comp.name
         })
@@ -54,35 +54,33 @@ def add_constraint_horizontal(command_id, params, ctx):
     Add a horizontal constraint to a line.
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
-        line_index: Index of the line to make horizontal
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        line_index: Index of the line to make horizontal, or line_token
+
+    Returns:
+        constraint_token: Entity token of the new constraint
 
     Example:
         {"action": "add_constraint_horizontal", "params": {"line_index": 5}}
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
     line_index = params.get("line_index", 0)
 
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    sketch, comp, error = resolve_global_sketch(ctx, params, via=(params, "line"))
     if error:
         return write_result(command_id, False, None, error)
 
-    lines = sketch.sketchCurves.sketchLines
-    if line_index < 0 or line_index >= lines.count:
-        return write_result(
-            command_id, False, None,
-            f"Invalid line index {line_index}. Sketch has {lines.count} lines."
-        )
-
-    line = lines.item(line_index)
+    line, error = get_entity(ctx, params, "line", lambda: get_line(sketch, line_index),
+                             adsk.fusion.SketchLine)
+    if error:
+        return write_result(command_id, False, None, error)
 
     try:
         constraints = sketch.geometricConstraints
-        constraints.addHorizontal(line)
+        constraint = constraints.addHorizontal(line)
 
         write_result(command_id, True, {
             "message": f"Horizontal constraint added to line {line_index}",
+            "constraint_token": entity_token(constraint),
             "sketch_name": sketch.name,
             "component": comp.name
         })
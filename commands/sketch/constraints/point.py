@@ -4,8 +4,12 @@ Point constraint commands.
 Commands for constraining points to curves, midpoints, and point-to-point relationships.
 """
 
+import adsk.fusion
+
 from ....utils import write_result
-from ...helpers import get_sketch_by_global_index
+from ...helpers import (
+    resolve_global_sketch, get_line, get_circle, get_entity, entity_token
+)
 
 
 def add_constraint_midpoint(command_id, params, ctx):
@@ -15,33 +19,30 @@ def add_constraint_midpoint(command_id, params, ctx):
     This is commonly used to center a line on the origin.
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
-        line_index: Index of the line in the sketch (default: 0)
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        line_index: Index of the line in the sketch (default: 0), or line_token
         point: "origin" to use sketch origin, or {"x": num, "y": num} for a specific point
                (default: "origin")
 
+    Returns:
+        constraint_token: Entity token of the new constraint
+
     Example - center a line on origin:
         {"action": "add_constraint_midpoint", "params": {"line_index": 0}}
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
     line_index = params.get("line_index", 0)
     point_param = params.get("point", "origin")
 
     # Get the sketch
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    sketch, comp, error = resolve_global_sketch(ctx, params, via=(params, "line"))
     if error:
         return write_result(command_id, False, None, error)
 
     # Get the line
-    lines = sketch.sketchCurves.sketchLines
-    if line_index < 0 or line_index >= lines.count:
-        return write_result(
-            command_id, False, None,
-            f"Invalid line index {line_index}. Sketch has {lines.count} lines."
-        )
-
-    line = lines.item(line_index)
+    line, error = get_entity(ctx, params, "line", lambda: get_line(sketch, line_index),
+                             adsk.fusion.SketchLine)
+    if error:
+        return write_result(command_id, False, None, error)
 
     # Get the point to constrain
     if point_param == "origin":
@@ -57,10 +58,11 @@ def add_constraint_midpoint(command_id, params, ctx):
     # Add the midpoint constraint
     try:
         constraints = sketch.geometricConstraints
-        constraints.addMidPoint(point, line)
+        constraint = constraints.addMidPoint(point, line)
 
         write_result(command_id, True, {
             "message": f"Midpoint constraint added: origin to line {line_index}",
+            "constraint_token": entity_token(constraint),
             "sketch_name": sketch.name,
             "component": comp.name
         })
@@ -73,12 +75,16 @@ def add_constraint_coincident(command_id, params, ctx):
     Add a coincident constraint - constrains a point to lie on a curve (line, circle, arc).
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
+        sketch_index: Sketch index (default: last sketch), or sketch_token
         point_type: "line_endpoint" or "circle_center" (what provides the point)
         point_source: For line_endpoint: {"line_index": int, "endpoint": "start"|"end"}
                       For circle_center: {"circle_index": int}
+                      (line_token / circle_token instead of the index)
         target_type: "circle", "line", or "point"
-        target_index: Index of the target curve/point
+        target_index: Index of the target curve/point, or target_token
+
+    Returns:
+        constraint_token: Entity token of the new constraint
 
     Example - constrain line endpoint to circle:
         {"action": "add_constraint_coincident", "params": {
@@ -88,15 +94,19 @@ def add_constraint_coincident(command_id, params, ctx):
             "target_index": 1
         }}
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
     point_type = params.get("point_type", "line_endpoint")
     point_source = params.get("point_source", {})
     target_type = params.get("target_type", "circle")
     target_index = params.get("target_index", 0)
 
-    # Get the sketch
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    # Get the sketch (or the sketch of the first entity given by token)
+    if point_source.get("line_token") is not None:
+        via = (point_source, "line")
+    elif point_source.get("circle_token") is not None:
+        via = (point_source, "circle")
+    else:
+        via = (params, "target")
+    sketch, comp, error = resolve_global_sketch(ctx, params, via=via)
     if error:
         return write_result(command_id, False, None, error)
 
@@ -108,14 +118,11 @@ def add_constraint_coincident(command_id, params, ctx):
         line_index = point_source.get("line_index", 0)
         endpoint = point_source.get("endpoint", "end")
 
-        lines = sketch.sketchCurves.sketchLines
-        if line_index < 0 or line_index >= lines.count:
-            return write_result(
-                command_id, False, None,
-                f"Invalid line index {line_index}. Sketch has {lines.count} lines."
-            )
+        line, error = get_entity(ctx, point_source, "line", lambda: get_line(sketch, line_index),
+                                 adsk.fusion.SketchLine)
+        if error:
+            return write_result(command_id, False, None, error)
 
-        line = lines.item(line_index)
         if endpoint == "start":
             point = line.startSketchPoint
         else:
@@ -124,13 +131,11 @@ def add_constraint_coincident(command_id, params, ctx):
 
     elif point_type == "circle_center":
         circle_index = point_source.get("circle_index", 0)
-        circles = sketch.sketchCurves.sketchCircles
-        if circle_index < 0 or circle_index >= circles.count:
-            return write_result(
-                command_id, False, None,
-                f"Invalid circle index {circle_index}. Sketch has {circles.count} circles."
-            )
-        circle = circles.item(circle_index)
+        circle, error = get_entity(ctx, point_source, "circle",
+                                   lambda: get_circle(sketch, circle_index),
+                                   adsk.fusion.SketchCircle)
+        if error:
+            return write_result(command_id, False, None, error)
         point = circle.centerSketchPoint
         point_desc = f"circle {circle_index} center"
 
@@ -145,23 +150,19 @@ def add_constraint_coincident(command_id, params, ctx):
     target_desc = ""
 
     if target_type == "circle":
-        circles = sketch.sketchCurves.sketchCircles
-        if target_index < 0 or target_index >= circles.count:
-            return write_result(
-                command_id, False, None,
-                f"Invalid circle index {target_index}. Sketch has {circles.count} circles."
-            )
-        target = circles.item(target_index)
+        target, error = get_entity(ctx, params, "target",
+                                   lambda: get_circle(sketch, target_index),
+                                   adsk.fusion.SketchCircle)
+        if error:
+            return write_result(command_id, False, None, error)
         target_desc = f"circle {target_index}"
 
     elif target_type == "line":
-        lines = sketch.sketchCurves.sketchLines
-        if target_index < 0 or target_index >= lines.count:
-            return write_result(
-                command_id, False, None,
-                f"Invalid line index {target_index}. Sketch has {lines.count} lines."
-            )
-        target = lines.item(target_index)
+        target, error = get_entity(ctx, params, "target",
+                                   lambda: get_line(sketch, target_index),
+                                   adsk.fusion.SketchLine)
+        if error:
+            return write_result(command_id, False, None, error)
         target_desc = f"line {target_index}"
 
     else:
@@ -173,10 +174,11 @@ def add_constraint_coincident(command_id, params, ctx):
     # Add the coincident constraint
     try:
         constraints = sketch.geometricConstraints
-        constraints.addCoincident(point, target)
+        constraint = constraints.addCoincident(point, target)
 
         write_result(command_id, True, {
             "message": f"Coincident constraint added: {point_desc} to {target_desc}",
+            "constraint_token": entity_token(constraint),
             "sketch_name": sketch.name,
             "component": comp.name
         })
@@ -189,55 +191,58 @@ def add_constraint_coincident_points(command_id, params, ctx):
     Add a coincident constraint between two line endpoints (point-to-point).
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
-        line1_index: Index of the first line
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        line1_index: Index of the first line, or line1_token
         line1_endpoint: "start" or "end" for the first line
-        line2_index: Index of the second line
+        line2_index: Index of the second line, or line2_token
         line2_endpoint: "start" or "end" for the second line
 
+    Returns:
+        constraint_token: Entity token of the new constraint
+
     Example - connect line 10's end to line 11's start:
         {"action": "add_constraint_coincident_points", "params": {
             "line1_index": 10, "line1_endpoint": "end",
             "line2_index": 11, "line2_endpoint": "start"
         }}
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
     line1_index = params.get("line1_index", 0)
     line1_endpoint = params.get("line1_endpoint", "end")
     line2_index = params.get("line2_index", 1)
     line2_endpoint = params.get("line2_endpoint", "start")
 
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    sketch, comp, error = resolve_global_sketch(ctx, params, via=(params, "line1"))
     if error:
         return write_result(command_id, False, None, error)
 
     lines = sketch.sketchCurves.sketchLines
 
+    def by_index(name, index):
+        if index < 0 or index >= lines.count:
+            return None, f"Invalid {name} {index}. Sketch has {lines.count} lines."
+        return lines.item(index), None
+
     # Get first line and point
-    if line1_index < 0 or line1_index >= lines.count:
-        return write_result(
-            command_id, False, None,
-            f"Invalid line1_index {line1_index}. Sketch has {lines.count} lines."
-        )
-    line1 = lines.item(line1_index)
+    line1, error = get_entity(ctx, params, "line1", lambda: by_index("line1_index", line1_index),
+                              adsk.fusion.SketchLine)
+    if error:
+        return write_result(command_id, False, None, error)
     point1 = line1.startSketchPoint if line1_endpoint == "start" else line1.endSketchPoint
 
     # Get second line and point
-    if line2_index < 0 or line2_index >= lines.count:
-        return write_result(
-            command_id, False, None,
-            f"Invalid line2_index {line2_index}. Sketch has {lines.count} lines."
-        )
-    line2 = lines.item(line2_index)
+    line2, error = get_entity(ctx, params, "line2", lambda: by_index("line2_index", line2_index),
+                              adsk.fusion.SketchLine)
+    if error:
+        return write_result(command_id, False, None, error)
     point2 = line2.startSketchPoint if line2_endpoint == "start" else line2.endSketchPoint
 
     # Add the coincident constraint between the two points
     try:
         constraints = sketch.geometricConstraints
-        constraints.addCoincident(point1, point2)
+        constraint = constraints.addCoincident(point1, point2)
 
         write_result(command_id, True, {
+            "constraint_token": entity_token(constraint),
             "message": f"Coincident constraint added: line {line1_index} {line1_endpoint} to line {line2_index} {line2_endpoint}",
             "sketch_name": sketch.name,
             "component": comp.name
@@ -4,8 +4,69 @@ Constraint query and deletion commands.
 Commands for listing constraints and deleting them.
 """
 
+import adsk.fusion
+
 from ....utils import write_result
-from ...helpers import get_sketch_by_global_index
+from ...helpers import resolve_global_sketch, write_items, get_constraint, get_entity, entity_token
+
+
+# Constraint type mapping
+CONSTRAINT_TYPES = {
+    0: "Coincident",
+    1: "Collinear",
+    2: "Concentric",
+    3: "Equal",
+    4: "Fix",
+    5: "Horizontal",
+    6: "HorizontalPoints",
+    7: "MidPoint",
+    8: "Parallel",
+    9: "Perpendicular",
+    10: "Smooth",
+    11: "Symmetry",
+    12: "Tangent",
+    13: "Vertical",
+    14: "VerticalPoints",
+    15: "CircularPattern",
+    16: "RectangularPattern",
+    17: "Offset",
+    18: "Mirror"
+}
+
+
+def _constraint_info(constraints, i):
+    """Describe constraint i and the entities it connects."""
+    constraint = constraints.item(i)
+    c_type = CONSTRAINT_TYPES.get(constraint.objectType, str(constraint.objectType))
+
+    # Try to get more details about what the constraint connects
+    constraint_info = {
+        "index": i,
+        "token": entity_token(constraint),
+        "type": c_type,
+        "is_deletable": constraint.isDeletable if hasattr(constraint, 'isDeletable') else None,
+    }
+
+    # Try to identify connected entities based on constraint type
+    try:
+        # Different constraints have different properties
+        if hasattr(constraint, 'point'):
+            pt = constraint.point
+            constraint_info["point"] = [round(pt.geometry.x, 4), round(pt.geometry.y, 4)]
+        if hasattr(constraint, 'line'):
+            line = constraint.line
+            constraint_info["line_start"] = [round(line.startSketchPoint.geometry.x, 4),
+                                              round(line.startSketchPoint.geometry.y, 4)]
+            constraint_info["line_end"] = [round(line.endSketchPoint.geometry.x, 4),
+                                            round(line.endSketchPoint.geometry.y, 4)]
+        if hasattr(constraint, 'entityOne'):
+            constraint_info["entity_one"] = str(constraint.entityOne.objectType)
+        if hasattr(constraint, 'entityTwo'):
+            constraint_info["entity_two"] = str(constraint.entityTwo.objectType)
+    except:
+        pass
+
+    return constraint_info
 
 
 def get_sketch_constraints(command_id, params, ctx):
@@ -13,82 +74,28 @@ def get_sketch_constraints(command_id, params, ctx):
     Get all geometric constraints in a sketch.
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        limit, cursor, stream, chunk_size: Paging/streaming (see helpers/pagination.py)
 
-    Returns list of constraints with their types and connected entities.
+    Returns list of constraints with their types, tokens and connected entities.
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
-
     # Get the sketch
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    sketch, comp, error = resolve_global_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
     constraints = sketch.geometricConstraints
-    constraint_list = []
-
-    # Constraint type mapping
-    constraint_types = {
-        0: "Coincident",
-        1: "Collinear",
-        2: "Concentric",
-        3: "Equal",
-        4: "Fix",
-        5: "Horizontal",
-        6: "HorizontalPoints",
-        7: "MidPoint",
-        8: "Parallel",
-        9: "Perpendicular",
-        10: "Smooth",
-        11: "Symmetry",
-        12: "Tangent",
-        13: "Vertical",
-        14: "VerticalPoints",
-        15: "CircularPattern",
-        16: "RectangularPattern",
-        17: "Offset",
-        18: "Mirror"
-    }
-
-    for i in range(constraints.count):
-        constraint = constraints.item(i)
-        c_type = constraint_types.get(constraint.objectType, str(constraint.objectType))
+    total = constraints.count
 
-        # Try to get more details about what the constraint connects
-        constraint_info = {
-            "index": i,
-            "type": c_type,
-            "is_deletable": constraint.isDeletable if hasattr(constraint, 'isDeletable') else None,
+    write_items(
+        command_id, params, "constraints", total,
+        lambda i: _constraint_info(constraints, i),
+        {
+            "sketch_name": sketch.name,
+            "component": comp.name,
+            "constraint_count": total,
         }
-
-        # Try to identify connected entities based on constraint type
-        try:
-            # Different constraints have different properties
-            if hasattr(constraint, 'point'):
-                pt = constraint.point
-                constraint_info["point"] = [round(pt.geometry.x, 4), round(pt.geometry.y, 4)]
-            if hasattr(constraint, 'line'):
-                line = constraint.line
-                constraint_info["line_start"] = [round(line.startSketchPoint.geometry.x, 4),
-                                                  round(line.startSketchPoint.geometry.y, 4)]
-                constraint_info["line_end"] = [round(line.endSketchPoint.geometry.x, 4),
-                                                round(line.endSketchPoint.geometry.y, 4)]
-            if hasattr(constraint, 'entityOne'):
-                constraint_info["entity_one"] = str(constraint.entityOne.objectType)
-            if hasattr(constraint, 'entityTwo'):
-                constraint_info["entity_two"] = str(constraint.entityTwo.objectType)
-        except:
-            pass
-
-        constraint_list.append(constraint_info)
-
-    write_result(command_id, True, {
-        "sketch_name": sketch.name,
-        "component": comp.name,
-        "constraint_count": len(constraint_list),
-        "constraints": constraint_list
-    })
+    )
 
 
 def delete_constraint(command_id, params, ctx):
@@ -96,29 +103,23 @@ def delete_constraint(command_id, params, ctx):
     Delete a geometric constraint by index.
 
     Params:
-        sketch_index: Sketch index (default: last sketch)
-        constraint_index: Index of the constraint to delete
+        sketch_index: Sketch index (default: last sketch), or sketch_token
+        constraint_index: Index of the constraint to delete, or constraint_token
 
     Example:
         {"action": "delete_constraint", "params": {"constraint_index": 14}}
     """
-    root = ctx.root
-    sketch_index = params.get("sketch_index", -1)
     constraint_index = params.get("constraint_index", 0)
 
-    sketch, comp, error = get_sketch_by_global_index(root, sketch_index)
+    sketch, comp, error = resolve_global_sketch(ctx, params, via=(params, "constraint"))
     if error:
         return write_result(command_id, False, None, error)
 
-    constraints = sketch.geometricConstraints
-
-    if constraint_index < 0 or constraint_index >= constraints.count:
-        return write_result(
-            command_id, False, None,
-            f"Invalid constraint index {constraint_index}. Sketch has {constraints.count} constraints."
-        )
-
-    constraint = constraints.item(constraint_index)
+    constraint, error = get_entity(ctx, params, "constraint",
+                                   lambda: get_constraint(sketch, constraint_index),
+                                   adsk.fusion.GeometricConstraint)
+    if error:
+        return write_result(command_id, False, None, error)
 
     if not constraint.isDeletable:
         return write_result(
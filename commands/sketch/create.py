@@ -2,8 +2,12 @@
 Sketch creation commands.
 """
 
+import adsk.fusion
+
 from ...utils import write_result
-from ..helpers import get_construction_plane, get_body_by_index
+from ..helpers import (
+    get_construction_plane, resolve_body, entity_index, entity_token, get_by_token
+)
 
 
 def create_sketch(command_id, params, ctx):
@@ -13,19 +17,27 @@ def create_sketch(command_id, params, ctx):
     Params:
         plane: Base plane ("xy", "xz", "yz") - used if plane_index not provided
         plane_index: Index of a construction plane (from create_offset_plane)
+        plane_token: Entity token of a construction plane (instead of plane_index)
 
     Returns:
         sketch_name: Name of created sketch
         sketch_index: Index of created sketch
+        sketch_token: Entity token of created sketch
     """
     root = ctx.root
     sketches = ctx.sketches
 
     plane_index = params.get("plane_index", None)
+    plane_token = params.get("plane_token", None)
     plane_name = params.get("plane", "xy")
 
     try:
-        if plane_index is not None:
+        if plane_token is not None:
+            plane, error = get_by_token(ctx.design, plane_token, "plane",
+                                        adsk.fusion.ConstructionPlane)
+            if error:
+                return write_result(command_id, False, None, error)
+        elif plane_index is not None:
             # Use a construction plane by index (e.g., from create_offset_plane)
             planes = root.constructionPlanes
             if plane_index >= planes.count:
@@ -39,9 +51,11 @@ def create_sketch(command_id, params, ctx):
                 return write_result(command_id, False, None, error)
 
         sketch = sketches.add(plane)
+        entity_index.added("sketches", sketch, ctx.active_component)
         write_result(command_id, True, {
             "sketch_name": sketch.name,
-            "sketch_index": sketches.count - 1
+            "sketch_index": sketches.count - 1,
+            "sketch_token": entity_token(sketch)
         })
 
     except Exception as e:
@@ -53,55 +67,65 @@ def create_sketch_on_face(command_id, params, ctx):
     Create a new sketch on an existing body face.
 
     Params:
-        body_index: Index of the body (default 0)
-        face_index: Index of the face on that body (default 0)
+        body_index: Index of the body (default 0), or body_token
+        face_index: Index of the face on that body (default 0), or face_token
+                    (which also implies the body)
         use_top_face: If true, automatically find the topmost face (ignores face_index)
 
     Returns:
         sketch_name: Name of created sketch
         sketch_index: Index of created sketch
+        sketch_token: Entity token of created sketch
         face_info: Information about the face used
     """
-    root = ctx.root
     sketches = ctx.sketches
 
     body_index = params.get("body_index", 0)
     face_index = params.get("face_index", 0)
+    face_token = params.get("face_token", None)
     use_top_face = params.get("use_top_face", False)
 
-    # Get the body
-    body, error = get_body_by_index(root, body_index)
-    if error:
-        return write_result(command_id, False, None, error)
-
     try:
-        if use_top_face:
-            # Find the topmost planar face
-            from ..helpers import find_top_face
-            face = find_top_face(body)
-            if face is None:
-                return write_result(command_id, False, None,
-                    f"No planar faces found on body {body_index}")
+        if face_token is not None:
+            face, error = get_by_token(ctx.design, face_token, "face", adsk.fusion.BRepFace)
+            if error:
+                return write_result(command_id, False, None, error)
+            face_index = "token"
         else:
-            # Get face by index
-            if face_index >= body.faces.count:
-                return write_result(command_id, False, None,
-                    f"Invalid face_index {face_index}. Body has {body.faces.count} faces.")
-            face = body.faces.item(face_index)
+            body, error = resolve_body(ctx, params)
+            if error:
+                return write_result(command_id, False, None, error)
+
+            if use_top_face:
+                # Find the topmost planar face
+                from ..helpers import find_top_face
+                face = find_top_face(body)
+                if face is None:
+                    return write_result(command_id, False, None,
+                        f"No planar faces found on body {body_index}")
+                face_index = "top"
+            else:
+                # Get face by index
+                if face_index >= body.faces.count:
+                    return write_result(command_id, False, None,
+                        f"Invalid face_index {face_index}. Body has {body.faces.count} faces.")
+                face = body.faces.item(face_index)
 
         # Create sketch on the face
         sketch = sketches.add(face)
+        entity_index.added("sketches", sketch, ctx.active_component)
 
         # Get face info for response
         bbox = face.boundingBox
         face_info = {
-            "face_index": face_index if not use_top_face else "top",
+            "face_index": face_index,
             "center_z": (bbox.minPoint.z + bbox.maxPoint.z) / 2
         }
 
         write_result(command_id, True, {
             "sketch_name": sketch.name,
             "sketch_index": sketches.count - 1,
+            "sketch_token": entity_token(sketch),
             "body_index": body_index,
             "face_info": face_info
         })
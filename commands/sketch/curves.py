@@ -7,7 +7,7 @@ import math
 import adsk.core
 
 from ...utils import write_result
-from ..helpers import get_sketch_by_index
+from ..helpers import resolve_sketch, entity_token
 
 
 def draw_arc(command_id, params, ctx):
@@ -17,14 +17,11 @@ def draw_arc(command_id, params, ctx):
     The arc is drawn counter-clockwise from start to end around the center.
 
     Params:
-        sketch_index: Index of sketch (default: last sketch)
+        sketch_index: Index of sketch (default: last sketch), or sketch_token
         center_x, center_y: Center point coordinates
         start_x, start_y: Start point coordinates
         end_x, end_y: End point coordinates
     """
-    sketches = ctx.sketches
-
-    idx = params.get("sketch_index", sketches.count - 1)
     center_x = params.get("center_x", 0)
     center_y = params.get("center_y", 0)
     start_x = params.get("start_x", 1)
@@ -32,7 +29,7 @@ def draw_arc(command_id, params, ctx):
     end_x = params.get("end_x", 0)
     end_y = params.get("end_y", 1)
 
-    sketch, error = get_sketch_by_index(sketches, idx)
+    sketch, error = resolve_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
@@ -44,7 +41,8 @@ def draw_arc(command_id, params, ctx):
 
     write_result(command_id, True, {
         "message": f"Arc from ({start_x},{start_y}) to ({end_x},{end_y}) around ({center_x},{center_y})",
-        "radius": round(arc.radius, 4)
+        "radius": round(arc.radius, 4),
+        "arc_token": entity_token(arc)
     })
 
 
@@ -53,14 +51,11 @@ def draw_arc_three_points(command_id, params, ctx):
     Draw an arc passing through three points.
 
     Params:
-        sketch_index: Index of sketch (default: last sketch)
+        sketch_index: Index of sketch (default: last sketch), or sketch_token
         start_x, start_y: Start point of arc
         mid_x, mid_y: Point along the arc (determines curvature)
         end_x, end_y: End point of arc
     """
-    sketches = ctx.sketches
-
-    idx = params.get("sketch_index", sketches.count - 1)
     start_x = params.get("start_x", 0)
     start_y = params.get("start_y", 0)
     mid_x = params.get("mid_x", 0.5)
@@ -68,7 +63,7 @@ def draw_arc_three_points(command_id, params, ctx):
     end_x = params.get("end_x", 1)
     end_y = params.get("end_y", 0)
 
-    sketch, error = get_sketch_by_index(sketches, idx)
+    sketch, error = resolve_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
@@ -84,7 +79,8 @@ def draw_arc_three_points(command_id, params, ctx):
         "center": [
             round(arc.centerSketchPoint.geometry.x, 4),
             round(arc.centerSketchPoint.geometry.y, 4)
-        ]
+        ],
+        "arc_token": entity_token(arc)
     })
 
 
@@ -93,21 +89,18 @@ def draw_arc_sweep(command_id, params, ctx):
     Draw an arc defined by center, start point, and sweep angle.
 
     Params:
-        sketch_index: Index of sketch (default: last sketch)
+        sketch_index: Index of sketch (default: last sketch), or sketch_token
         center_x, center_y: Center point coordinates
         start_x, start_y: Start point coordinates (also defines radius)
         sweep_angle: Sweep angle in degrees (positive = counter-clockwise)
     """
-    sketches = ctx.sketches
-
-    idx = params.get("sketch_index", sketches.count - 1)
     center_x = params.get("center_x", 0)
     center_y = params.get("center_y", 0)
     start_x = params.get("start_x", 1)
     start_y = params.get("start_y", 0)
     sweep_angle = params.get("sweep_angle", 90)
 
-    sketch, error = get_sketch_by_index(sketches, idx)
+    sketch, error = resolve_sketch(ctx, params)
     if error:
         return write_result(command_id, False, None, error)
 
@@ -123,7 +116,8 @@ def draw_arc_sweep(command_id, params, ctx):
     write_result(command_id, True, {
         "message": f"Arc {sweep_angle}° from ({start_x},{start_y}) around ({center_x},{center_y})",
         "radius": round(radius, 4),
-        "sweep_angle": sweep_angle
+        "sweep_angle": sweep_angle,
+        "arc_token": entity_token(arc)
     })
 
 
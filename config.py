@@ -7,8 +7,89 @@ import os
 # File paths - JSON files are stored in this add-in's directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 COMMANDS_FILE = os.path.join(BASE_DIR, "commands.json")
+COMMANDS_JOURNAL_FILE = os.path.join(BASE_DIR, "commands.jsonl")
+COMMANDS_OFFSET_FILE = os.path.join(BASE_DIR, "commands.offset")
 RESULTS_FILE = os.path.join(BASE_DIR, "results.json")
+RESULTS_JOURNAL_FILE = os.path.join(BASE_DIR, "results.jsonl")
 STATUS_FILE = os.path.join(BASE_DIR, "bridge_status.json")
 
 # Custom event identifier
 CUSTOM_EVENT_ID = "ClaudeBridgeEvent"
+
+# Command pickup
+# "auto" watches the command files (inotify on Linux, stat polling elsewhere),
+# "inotify"/"stat" force a watcher, "interval" fires every POLL_INTERVAL.
+WATCH_MODE = "auto"
+POLL_INTERVAL = 1.0
+STAT_POLL_INTERVAL = 0.02
+
+# Main-thread time budget per custom event. Queued commands run until the
+# budget is used up, then the event is re-armed so Fusion can repaint.
+EVENT_TIME_BUDGET_MS = 50
+
+# Minimum seconds between bridge_status.json refreshes
+STATUS_INTERVAL = 1.0
+
+# Seconds stop() waits for each background thread to finish
+THREAD_JOIN_TIMEOUT = 2.0
+
+# Throughput/latency metrics in bridge_status.json (see core/metrics.py);
+# METRICS_WINDOW is the number of recent samples per action for percentiles
+METRICS_ENABLED = True
+METRICS_WINDOW = 500
+
+# Optional compression of large payloads: None (off), "gzip" or "zlib".
+# Applies to results.json/results.jsonl payloads and export_session files
+# whose JSON is at least COMPRESSION_MIN_BYTES.
+COMPRESSION = None
+COMPRESSION_MIN_BYTES = 64 * 1024
+
+# Items per partial result when a paged command is called with stream=true
+STREAM_CHUNK_SIZE = 200
+
+# Resolve the design, root/active component and common collections once per
+# dispatch (or batch) instead of on every access (see commands/context.py)
+CONTEXT_SNAPSHOT = True
+
+# Opt-in Fusion API call accounting (see commands/api_trace.py): counts
+# property reads and method calls per action and call site, and writes the
+# summary to API_TRACE_FILE every STATUS_INTERVAL. Slows every API access.
+API_TRACE_ENABLED = False
+API_TRACE_FILE = os.path.join(BASE_DIR, "api_trace.json")
+API_TRACE_TOP = 20
+
+# Opt-in cProfile capture (see commands/profiling.py): actions always
+# profiled, plus a random share of all commands. Profiles (.prof and a .txt
+# summary of the PROFILE_TOP functions) go to PROFILE_DIR, newest
+# PROFILE_MAX_FILES kept. set_profiling changes actions/rate at runtime.
+PROFILE_ACTIONS = ()
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+PROFILE_MAX_FILES = 50
+PROFILE_TOP = 40
+
+# entityToken -> object cache behind *_token params (see commands/helpers/geometry/tokens.py)
+TOKEN_CACHE_MAX_ENTRIES = 10000
+
+# Result cache for read-only commands (see commands/result_cache.py)
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Result journal rotation (0 backups: results.jsonl is truncated when full)
+RESULTS_JOURNAL_MAX_BYTES = 16 * 1024 * 1024
+RESULTS_JOURNAL_BACKUPS = 3
+
+# Optional local socket transport (see core/socket_server.py)
+# SOCKET_FAMILY: "auto" (Unix domain socket where available), "unix" or "tcp"
+SOCKET_ENABLED = False
+SOCKET_FAMILY = "auto"
+SOCKET_PATH = os.path.join(BASE_DIR, "bridge.sock")
+SOCKET_HOST = "127.0.0.1"
+SOCKET_PORT = 0
+
+# Optional shared-memory ring transport (see core/ring_server.py)
+RING_ENABLED = False
+RING_FILE = os.path.join(BASE_DIR, "bridge.ring")
+RING_CAPACITY = 4 * 1024 * 1024
+RING_IDLE_SLEEP = 0.001
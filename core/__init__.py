@@ -2,5 +2,12 @@
 Core infrastructure for Claude Bridge add-in.
 """
 
+from .command_queue import CommandQueue, QueuedCommand
+from .journal import CommandJournal
 from .polling import PollingThread
 from .event_handler import ThreadEventHandler
+from .status import write_status
+from .metrics import Metrics
+from .design_events import register_design_events, unregister_design_events
+from .socket_server import SocketServer
+from .ring_server import RingServer
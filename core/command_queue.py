@@ -0,0 +1,300 @@
+"""
+Thread-safe queue of parsed commands handed from the polling thread to the main thread.
+
+Wake-ups are coalesced: at most one custom event is outstanding at a time.
+While the main thread is busy (e.g. a 20s export_session), further commands
+are queued without firing more events, and the suppressed wake-ups are
+counted so they can be reported in bridge_status.json.
+
+Commands are kept in priority lanes (LANES; the add-in passes in the
+action-to-lane mapping, commands/dispatcher.py ACTION_LANES):
+- control commands are served first, and the inline actions (ping,
+  get_result, cancel) are answered on the receiving thread by the add-in's
+  inline responder without waiting for the main thread at all
+- a read overtakes queued mutations unless one of them came from the same
+  origin, so callers always read their own writes
+- mutate commands keep their order within an origin, and origins take
+  turns (round-robin), so one busy client cannot starve another
+- export commands (long, read-only) have their own queue, served in
+  arrival order. While exports wait, the export lane takes one turn per
+  round of the mutation round-robin, after every origin with queued
+  mutations has had its turn, so a 30s export does not hold up other
+  clients for long and cannot be starved by them either. Within an origin
+  exports keep their place: an export waits for that origin's earlier
+  mutations, and its later mutations wait for the export
+
+An origin is the command's "client" field when present, otherwise where it
+came from (file, journal, one socket connection, ...).
+"""
+
+import threading
+import json
+import time
+from collections import deque
+
+from ..config import CUSTOM_EVENT_ID
+from ..utils import capture_results
+
+# Priority lanes, highest first (see the module docstring)
+LANES = ("control", "read", "mutate", "export")
+
+
+class QueuedCommand:
+    """A parsed command plus bookkeeping about where it came from."""
+
+    __slots__ = ("cmd", "source", "on_done", "reply", "kind", "enqueued_at",
+                 "lane", "origin", "seq")
+
+    def __init__(self, cmd, source, on_done=None, reply=None, kind="command", origin=None):
+        """
+        Args:
+            cmd: Command dictionary with 'id', 'action', and 'params'
+                 (or a decoded JSON-RPC request/batch when kind is "jsonrpc").
+                 A relative 'timeout' is turned into an absolute 'deadline'.
+            source: Where the command was read from ("file", "journal", "socket", ...)
+            on_done: Optional callable run after execution (on the main
+                     thread, or the receiving thread for inline actions)
+            reply: Optional callable that receives the result record (or the
+                   JSON-RPC response). When set, the result is captured
+                   instead of written to files. Streaming commands also
+                   pass it their partial records first.
+            kind: "command" or "jsonrpc"
+            origin: Caller identity for read-after-write ordering and fair
+                    scheduling (defaults to source; a 'client' field in the
+                    command takes precedence)
+        """
+        if kind == "command" and "deadline" not in cmd:
+            # "timeout" is relative to when the add-in received the command
+            timeout = cmd.get("timeout")
+            if isinstance(timeout, (int, float)) and not isinstance(timeout, bool):
+                cmd["deadline"] = time.time() + timeout
+        self.cmd = cmd
+        self.source = source
+        self.on_done = on_done
+        self.reply = reply
+        self.kind = kind
+        self.enqueued_at = time.monotonic()
+        self.lane = "mutate"  # Set by the queue
+        client = cmd.get("client") if kind == "command" else None
+        self.origin = f"client:{client}" if client else (origin or source)
+        self.seq = 0
+
+
+class CommandQueue:
+    """Priority lanes of QueuedCommand items shared between background threads and the event handler."""
+
+    def __init__(self, app, action_lane=None, inline_actions=(), inline_responder=None):
+        """
+        Args:
+            app: Fusion 360 Application object (used to fire the custom event)
+            action_lane: Callable mapping an action name to one of LANES
+                         (default: everything is "mutate")
+            inline_actions: Actions answered on the receiving thread
+            inline_responder: Callable that takes a command dict and writes its
+                              result without using the Fusion API; required
+                              for inline_actions to take effect
+        """
+        self.app = app
+        self.action_lane = action_lane or (lambda action: "mutate")
+        self.inline_actions = frozenset(inline_actions) if inline_responder else frozenset()
+        self.inline_responder = inline_responder
+        self._lock = threading.Lock()
+        self._event_pending = False
+        self._seq = 0
+        self._control = deque()
+        self._reads = deque()
+        # Queued mutate commands per origin, served round-robin
+        self._writes = {}
+        self._rotation = deque()
+        self._exports = deque()
+        # Mutations served while an export was waiting, since the last export
+        self._passed_exports = 0
+        self._depth = {lane: 0 for lane in LANES}
+        self._waits = {lane: [0, 0.0, 0.0] for lane in LANES}  # served, total, max
+        self.fired_events = 0
+        self.suppressed_events = 0
+        self.rearmed_events = 0
+
+    def _append(self, item):
+        if item.kind == "command":
+            action = item.cmd.get("action")
+            item.lane = self.action_lane(action)
+            if action in self.inline_actions:
+                return False
+        # JSON-RPC requests may hold batches of anything: they stay "mutate"
+        self._seq += 1
+        item.seq = self._seq
+        self._depth[item.lane] += 1
+        if item.lane == "control":
+            self._control.append(item)
+        elif item.lane == "read":
+            self._reads.append(item)
+        elif item.lane == "export":
+            self._exports.append(item)
+        else:
+            if item.origin not in self._writes:
+                self._writes[item.origin] = deque()
+                self._rotation.append(item.origin)
+            self._writes[item.origin].append(item)
+        return True
+
+    def _run_inline(self, items):
+        for item in items:
+            with self._lock:
+                self._record_wait(item)
+            try:
+                if item.reply is None:
+                    self.inline_responder(item.cmd)
+                else:
+                    with capture_results() as results:
+                        self.inline_responder(item.cmd)
+                    item.reply(results[-1] if results else None)
+                if item.on_done:
+                    item.on_done()
+            except Exception:
+                pass  # e.g. a reply to a closed socket; the rest still runs
+
+    def put(self, item):
+        """Queue a QueuedCommand and wake the main thread if needed."""
+        self.put_many([item])
+
+    def put_many(self, items):
+        """Queue several QueuedCommand items with a single wake-up."""
+        if not items:
+            return
+        with self._lock:
+            inline = [item for item in items if not self._append(item)]
+        if len(inline) < len(items):
+            self.wake()
+        # Inline control commands are answered right here
+        self._run_inline(inline)
+
+    def _take_read(self):
+        """Pop the first read whose origin has no earlier mutation still queued."""
+        for i, item in enumerate(self._reads):
+            writes = self._writes.get(item.origin)
+            if not writes or writes[0].seq > item.seq:
+                del self._reads[i]
+                return item
+        return None
+
+    def _export_before(self, origin, seq):
+        """True if origin has an export queued ahead of seq."""
+        return any(item.origin == origin and item.seq < seq for item in self._exports)
+
+    def _take_write(self):
+        """Pop the next mutation, taking turns between origins."""
+        for _ in range(len(self._rotation)):
+            origin = self._rotation.popleft()
+            writes = self._writes[origin]
+            if self._export_before(origin, writes[0].seq):
+                self._rotation.append(origin)  # Waits for its own export
+                continue
+            item = writes.popleft()
+            if writes:
+                self._rotation.append(origin)
+            else:
+                del self._writes[origin]
+            return item
+        return None
+
+    def _take_export(self):
+        """Pop the first export whose origin has no earlier mutation still queued."""
+        for i, item in enumerate(self._exports):
+            writes = self._writes.get(item.origin)
+            if not writes or writes[0].seq > item.seq:
+                del self._exports[i]
+                return item
+        return None
+
+    def _take_turn(self):
+        """Pop the next mutation or export; exports get one turn per round."""
+        item = None
+        if self._exports and self._passed_exports >= len(self._rotation):
+            item = self._take_export()
+        if item is None:
+            item = self._take_write()
+            if item is not None:
+                if self._exports:
+                    self._passed_exports += 1
+                return item
+            item = self._take_export()
+        if item is not None:
+            self._passed_exports = 0
+        return item
+
+    def pop(self):
+        """Remove and return the next QueuedCommand by lane priority, or None if empty."""
+        with self._lock:
+            if self._control:
+                item = self._control.popleft()
+            else:
+                item = self._take_read() or self._take_turn()
+            if item is None:
+                return None
+            self._depth[item.lane] -= 1
+            self._record_wait(item)
+        return item
+
+    def _record_wait(self, item):
+        """Add an item's queue wait to its lane's stats (lock held)."""
+        wait = time.monotonic() - item.enqueued_at
+        stats = self._waits[item.lane]
+        stats[0] += 1
+        stats[1] += wait
+        stats[2] = max(stats[2], wait)
+
+    def wake(self, rearm=False):
+        """
+        Fire the custom event unless one is already waiting to be handled.
+
+        Args:
+            rearm: True when the event handler re-fires the event because its
+                   time budget ran out; counted apart from wake-ups by new
+                   commands
+        """
+        with self._lock:
+            if self._event_pending:
+                if not rearm:
+                    self.suppressed_events += 1
+                return
+            self._event_pending = True
+            if rearm:
+                self.rearmed_events += 1
+            else:
+                self.fired_events += 1
+        try:
+            self.app.fireCustomEvent(CUSTOM_EVENT_ID, json.dumps({"check_commands": True}))
+        except:
+            with self._lock:
+                self._event_pending = False  # App might be shutting down
+
+    def begin_drain(self):
+        """Called by the event handler before draining; re-enables wake-ups."""
+        with self._lock:
+            self._event_pending = False
+
+    def stats(self):
+        """Return wake-up counters and per-lane queue waits for bridge_status.json."""
+        with self._lock:
+            lanes = {}
+            for lane in LANES:
+                served, total, longest = self._waits[lane]
+                lanes[lane] = {
+                    "depth": self._depth[lane],
+                    "served": served,
+                    "wait_avg_ms": round(total / served * 1000, 3) if served else 0.0,
+                    "wait_max_ms": round(longest * 1000, 3),
+                }
+            return {
+                "queue_depth": sum(self._depth.values()),
+                "fired_events": self.fired_events,
+                "suppressed_events": self.suppressed_events,
+                "rearmed_events": self.rearmed_events,
+                "lanes": lanes,
+                "queued_writes_by_origin": {o: len(q) for o, q in self._writes.items()},
+            }
+
+    def __len__(self):
+        with self._lock:
+            return sum(self._depth.values())
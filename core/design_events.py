@@ -0,0 +1,74 @@
+"""
+Fusion 360 event handlers that report design changes made outside the bridge.
+
+Cached data (the result cache, the entity index) is only valid while the
+design is unchanged. Commands run through the bridge invalidate it themselves; these
+handlers cover edits made in the Fusion UI and switching documents.
+"""
+
+import adsk.core
+
+# UI commands that never change the design: selection and view navigation
+IGNORED_COMMANDS = (
+    "SelectCommand",
+    "PanCommand", "ZoomCommand", "ZoomWindowCommand", "FitCommand",
+    "OrbitCommand", "FreeOrbitCommand", "ConstrainedOrbitCommand",
+    "LookAtCommand", "ViewCubeCommand", "ViewCubeHomeCommand",
+    "ViewFrontCommand", "ViewBackCommand", "ViewTopCommand", "ViewBottomCommand",
+    "ViewLeftCommand", "ViewRightCommand", "ViewHomeCommand",
+)
+
+
+class CommandTerminatedHandler(adsk.core.ApplicationCommandEventHandler):
+    """Calls on_change when a Fusion UI command finishes (the user edited something)."""
+
+    def __init__(self, on_change):
+        super().__init__()
+        self.on_change = on_change
+
+    def notify(self, args):
+        try:
+            if args.commandId not in IGNORED_COMMANDS:
+                self.on_change()
+        except:
+            pass
+
+
+class DocumentActivatedHandler(adsk.core.DocumentEventHandler):
+    """Calls on_change when another document becomes active."""
+
+    def __init__(self, on_change):
+        super().__init__()
+        self.on_change = on_change
+
+    def notify(self, args):
+        try:
+            self.on_change()
+        except:
+            pass
+
+
+def register_design_events(app, ui, on_change):
+    """
+    Subscribe on_change to Fusion's design change events.
+
+    Returns:
+        list of (event, handler) pairs; keep a reference and pass it to
+        unregister_design_events() on shutdown
+    """
+    subscriptions = [
+        (ui.commandTerminated, CommandTerminatedHandler(on_change)),
+        (app.documentActivated, DocumentActivatedHandler(on_change)),
+    ]
+    for event, handler in subscriptions:
+        event.add(handler)
+    return subscriptions
+
+
+def unregister_design_events(subscriptions):
+    """Remove handlers added by register_design_events()."""
+    for event, handler in subscriptions:
+        try:
+            event.remove(handler)
+        except:
+            pass
@@ -4,42 +4,88 @@ Custom event handler for processing commands from the worker thread.
 
 import adsk.core
 import json
-import os
+import time
 
-from ..config import COMMANDS_FILE
+from ..config import EVENT_TIME_BUDGET_MS
+from ..utils import capture_results
 
 
 class ThreadEventHandler(adsk.core.CustomEventHandler):
     """Handle events fired from the worker thread."""
 
-    def __init__(self, command_executor):
+    def __init__(self, command_executor, command_queue, rpc_executor=None, metrics=None):
         """
         Initialize the event handler.
 
         Args:
             command_executor: Callable that takes a command dict and returns
                               the command_id that was processed
+            command_queue: CommandQueue filled by the polling thread with
+                           already-parsed QueuedCommand items
+            rpc_executor: Callable that takes a JSON-RPC request or batch and
+                          returns the response(s), for "jsonrpc" items
+            metrics: Optional Metrics collector (see core/metrics.py)
         """
         super().__init__()
         self.command_executor = command_executor
-        self.last_command_id = 0
+        self.command_queue = command_queue
+        self.rpc_executor = rpc_executor
+        self.metrics = metrics
 
     def notify(self, args):
         """Called when a custom event is fired."""
+        if self.metrics:
+            self.metrics.tick()
         try:
             event_args = json.loads(args.additionalInfo)
             if event_args.get("check_commands"):
-                self._check_and_execute_commands()
+                self._execute_pending_commands()
         except:
             pass  # Ignore parse errors
 
-    def _check_and_execute_commands(self):
-        """Check for new commands and execute them."""
-        if os.path.exists(COMMANDS_FILE):
-            with open(COMMANDS_FILE, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    cmd = json.loads(content)
-                    cmd_id = cmd.get("id", 0)
-                    if cmd_id > self.last_command_id:
-                        self.last_command_id = self.command_executor(cmd)
+    def _execute_pending_commands(self):
+        """
+        Execute queued commands until the queue is empty or the time budget runs out.
+
+        At least one command runs per event. When the budget is exhausted
+        with work remaining, the custom event is re-armed and control returns
+        to Fusion so the UI stays responsive during large builds.
+        """
+        # Commands queued from here on are picked up by this drain or trigger
+        # exactly one new event; nothing piles up while we are busy.
+        self.command_queue.begin_drain()
+        deadline = time.perf_counter() + EVENT_TIME_BUDGET_MS / 1000.0
+        item = self.command_queue.pop()
+        while item is not None:
+            try:
+                self._execute(item)
+            except Exception:
+                pass  # e.g. a reply to a closed socket; the rest still runs
+            if time.perf_counter() >= deadline:
+                if len(self.command_queue):
+                    self.command_queue.wake(rearm=True)
+                return
+            item = self.command_queue.pop()
+
+    def _execute(self, item):
+        """Run one queued command, routing its result to the item's reply if any."""
+        token = self.metrics.begin(item) if self.metrics else None
+        try:
+            self._dispatch(item)
+        finally:
+            if token is not None:
+                self.metrics.end(token, item)
+        if item.on_done:
+            item.on_done()
+
+    def _dispatch(self, item):
+        if item.kind == "jsonrpc":
+            # A whole JSON-RPC batch runs within this one dispatch
+            item.reply(self.rpc_executor(item.cmd))
+        elif item.reply is None:
+            self.command_executor(item.cmd)
+        else:
+            # Streaming commands send their chunks through reply as they go
+            with capture_results(on_partial=item.reply) as results:
+                self.command_executor(item.cmd)
+            item.reply(results[-1] if results else None)
@@ -0,0 +1,126 @@
+"""
+Append-only command journal (commands.jsonl).
+
+Clients append one JSON command per line and never wait for results before
+writing the next one. The polling thread reads every complete line past its
+read position; the main thread marks lines as executed, and the committed
+offset is persisted (off the main thread) so a restart resumes after the
+last executed command instead of replaying the journal.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+
+
+class CommandJournal:
+    """Incremental reader for an append-only JSONL command file."""
+
+    def __init__(self, path, offset_path):
+        """
+        Args:
+            path: Journal file clients append commands to
+            offset_path: File holding the byte offset of the last executed line
+        """
+        self.path = path
+        self.offset_path = offset_path
+        self._lock = threading.Lock()
+        self.committed_offset = self._load_offset()
+        self._saved_offset = self.committed_offset
+        self.read_offset = self.committed_offset
+        # End offsets of read-but-unfinished commands, in file order
+        self._outstanding = deque()
+        self._done = set()
+        # Bumped when the journal is truncated; commits from before are stale
+        self.generation = 0
+
+    def _load_offset(self):
+        try:
+            with open(self.offset_path, 'r') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def read_new(self):
+        """
+        Parse all complete lines appended since the last read.
+
+        Returns:
+            list of (command dict, end offset) tuples. Lines that are not
+            valid JSON objects are skipped.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+
+        if size < self.read_offset:
+            # Journal was truncated or replaced: start over from the top
+            with self._lock:
+                self.read_offset = 0
+                self.committed_offset = 0
+                self._outstanding.clear()
+                self._done.clear()
+                self.generation += 1
+        if size == self.read_offset:
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.read_offset)
+            data = f.read(size - self.read_offset)
+
+        commands = []
+        position = self.read_offset
+        # Only consume complete lines; a partial trailing line is re-read later
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines(keepends=True):
+            position += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                cmd = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(cmd, dict):
+                commands.append((cmd, position))
+        self.read_offset = position
+        with self._lock:
+            self._outstanding.extend(offset for _, offset in commands)
+        return commands
+
+    def commit(self, offset, generation=None):
+        """
+        Mark the command ending at offset as executed (cheap; safe on any thread).
+
+        Commands can finish out of file order (priority lanes), so the
+        committed offset only advances past a contiguous run of finished
+        commands; a restart never skips one that had not run yet.
+
+        Args:
+            offset: End offset returned by read_new()
+            generation: The journal's generation when the command was read;
+                        a commit for a truncated journal is ignored
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return  # Read before the journal was truncated
+            self._done.add(offset)
+            while self._outstanding and self._outstanding[0] in self._done:
+                end = self._outstanding.popleft()
+                self._done.discard(end)
+                if end > self.committed_offset:
+                    self.committed_offset = end
+
+    def save_offset(self):
+        """Persist the committed offset if it changed since the last save."""
+        with self._lock:
+            offset = self.committed_offset
+        if offset == self._saved_offset:
+            return
+        tmp_path = f"{self.offset_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+        os.replace(tmp_path, self.offset_path)
+        self._saved_offset = offset
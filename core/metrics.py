@@ -0,0 +1,110 @@
+"""
+Throughput and latency metrics for bridge_status.json.
+
+The event handler records each command's start and finish; the polling
+thread takes a snapshot every STATUS_INTERVAL and writes it with the status.
+Recording is a couple of clock reads and a deque append under a lock, so it
+adds no measurable time to commands. Percentiles are computed only when a
+snapshot is taken, over the last METRICS_WINDOW samples of each action.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Metrics:
+    """Thread-safe collector of command counts, rates and latencies."""
+
+    def __init__(self, window):
+        """
+        Args:
+            window: Latency samples kept per action
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._actions = {}
+        self._running = {}
+        self._completed = 0
+        self._last_tick = None
+        self._rate_mark = (time.monotonic(), 0)
+
+    def tick(self):
+        """Note that the main thread handled a custom event."""
+        self._last_tick = time.monotonic()
+
+    def begin(self, item):
+        """
+        Record that a queued command started running.
+
+        Returns:
+            Token to pass to end()
+        """
+        action = item.cmd.get("action", "") if item.kind == "command" else item.kind
+        token = object()
+        with self._lock:
+            self._running[token] = (action, time.monotonic())
+        return token
+
+    def end(self, token, item):
+        """Record that a command finished (latency is measured from enqueue)."""
+        now = time.monotonic()
+        with self._lock:
+            action, started = self._running.pop(token)
+            samples = self._actions.get(action)
+            if samples is None:
+                samples = self._actions[action] = (
+                    deque(maxlen=self.window), deque(maxlen=self.window), [0]
+                )
+            samples[0].append(now - item.enqueued_at)
+            samples[1].append(now - started)
+            samples[2][0] += 1
+            self._completed += 1
+
+    def snapshot(self):
+        """
+        Return current metrics as a dict (resets the commands/sec window).
+
+        Returns:
+            completed: Commands finished since the add-in started
+            commands_per_sec: Rate since the previous snapshot
+            since_last_tick_ms: Time since the main thread last handled an event
+            current_command: Longest-running command (action, running_ms) or None
+            actions: Per action count and p50/p95/p99 of latency_ms (enqueue to
+                     finish) and exec_ms (run time only)
+        """
+        now = time.monotonic()
+        with self._lock:
+            mark_time, mark_count = self._rate_mark
+            rate = (self._completed - mark_count) / (now - mark_time) if now > mark_time else 0.0
+            self._rate_mark = (now, self._completed)
+
+            current = None
+            if self._running:
+                action, started = min(self._running.values(), key=lambda r: r[1])
+                current = {"action": action, "running_ms": round((now - started) * 1000, 1)}
+
+            actions = {}
+            for action, (latency, execution, count) in self._actions.items():
+                actions[action] = {"count": count[0]}
+                for name, samples in (("latency_ms", latency), ("exec_ms", execution)):
+                    ordered = sorted(samples)
+                    actions[action][name] = {
+                        f"p{p}": round(_percentile(ordered, p / 100) * 1000, 3)
+                        for p in (50, 95, 99)
+                    }
+
+            return {
+                "completed": self._completed,
+                "commands_per_sec": round(rate, 2),
+                "since_last_tick_ms": (round((now - self._last_tick) * 1000, 1)
+                                       if self._last_tick is not None else None),
+                "current_command": current,
+                "actions": actions,
+            }
@@ -1,32 +1,188 @@
 """
 Background polling thread for command checking.
+
+All file I/O and JSON parsing for the command files happens here, so the
+main (UI) thread is only woken when new, already-parsed commands are ready.
+
+Two inputs are read:
+- commands.json: a single command, executed if its id is new
+- commands.jsonl: an append-only journal; every new line is queued
 """
 
 import threading
 import json
+import os
+import time
+import traceback
 
-from ..config import CUSTOM_EVENT_ID
+from ..config import (
+    COMMANDS_FILE, COMMANDS_JOURNAL_FILE, COMMANDS_OFFSET_FILE,
+    WATCH_MODE, POLL_INTERVAL, STAT_POLL_INTERVAL, STATUS_INTERVAL, RESULT_CACHE_ENABLED,
+    CONTEXT_SNAPSHOT, API_TRACE_ENABLED, API_TRACE_FILE, API_TRACE_TOP
+)
+from ..commands.api_trace import api_trace
+from ..commands.context import context_stats
+from ..commands.helpers import entity_index, token_cache
+from ..commands.result_cache import result_cache
+from .command_queue import QueuedCommand
+from .journal import CommandJournal
+from .watcher import create_watcher
+from .status import write_status, set_status_section
 
 
 class PollingThread(threading.Thread):
-    """Background thread that fires events to check for commands."""
+    """Background thread that reads new commands and wakes the main thread."""
 
-    def __init__(self, stop_event, app):
+    def __init__(self, stop_event, app, command_queue, metrics=None):
         """
         Initialize the polling thread.
 
         Args:
             stop_event: threading.Event to signal when to stop
             app: Fusion 360 Application object
+            command_queue: CommandQueue that receives parsed commands
+            metrics: Optional Metrics collector written to bridge_status.json
         """
         threading.Thread.__init__(self)
         self.stopped = stop_event
         self.app = app
+        self.command_queue = command_queue
+        self.metrics = metrics
+        self.journal = CommandJournal(COMMANDS_JOURNAL_FILE, COMMANDS_OFFSET_FILE)
+        self.last_command_ids = {}
+        self._last_stat = None
+        self._last_status = None
+        self._last_status_time = 0.0
 
     def run(self):
-        """Fire event every second to check for commands."""
-        while not self.stopped.wait(1.0):
+        """Check the command files whenever they change (or every interval)."""
+        watcher = create_watcher(
+            [COMMANDS_FILE, COMMANDS_JOURNAL_FILE], WATCH_MODE, STAT_POLL_INTERVAL,
+            append_paths=[COMMANDS_JOURNAL_FILE]
+        )
+        try:
+            # Pick up commands written before the thread started
+            self._guarded(self._check_commands)
+            while not self.stopped.is_set():
+                self._guarded(self._poll, watcher)
+        finally:
+            self._save_journal_offset()
+            if watcher is not None:
+                watcher.close()
+
+    def _guarded(self, step, *args):
+        """
+        Run one loop step; an unexpected error is reported and the loop goes on.
+
+        The traceback is published under polling_error in bridge_status.json.
+        """
+        try:
+            step(*args)
+        except Exception:
+            set_status_section("polling_error", {
+                "at": time.time(), "traceback": traceback.format_exc()
+            })
+            # Don't spin if the error repeats on every step
+            self.stopped.wait(POLL_INTERVAL)
+
+    def _poll(self, watcher):
+        """Wait for a change (or the interval), then read commands and report status."""
+        if watcher is None:
+            if self.stopped.wait(POLL_INTERVAL):
+                return
+            self._check_commands()
+        # Bounded wait so the stop flag is honoured promptly
+        elif watcher.wait(0.25):
+            self._check_commands()
+        self._save_journal_offset()
+        # After stop() the status belongs to it ("stopped")
+        if not self.stopped.is_set():
+            self._report_status()
+
+    def _check_commands(self):
+        """Queue new commands from both the single-command file and the journal."""
+        self._check_command_file()
+        self._check_journal()
+
+    def _check_journal(self):
+        """Queue every complete line appended to the journal since the last read."""
+        items = []
+        commands = self.journal.read_new()
+        generation = self.journal.generation
+        for cmd, offset in commands:
+            on_done = (lambda end=offset, gen=generation: self.journal.commit(end, gen))
+            items.append(QueuedCommand(cmd, "journal", on_done))
+        self.command_queue.put_many(items)
+
+    def _save_journal_offset(self):
+        try:
+            self.journal.save_offset()
+        except OSError:
+            pass  # Retried on the next loop
+
+    def _check_command_file(self):
+        """Read and parse the commands file if it changed; queue a new command."""
+        try:
+            st = os.stat(COMMANDS_FILE)
+        except OSError:
+            return
+        snapshot = (st.st_mtime_ns, st.st_size)
+        if snapshot == self._last_stat:
+            return
+
+        try:
+            with open(COMMANDS_FILE, 'r') as f:
+                content = f.read().strip()
+            cmd = json.loads(content) if content else None
+        except (OSError, ValueError):
+            return  # Partially written; the next change retries
+
+        # Only remember the file state once it parsed cleanly
+        self._last_stat = snapshot
+        if not isinstance(cmd, dict):
+            return
+
+        # Ids increase per client, so one client's ids never shadow another's
+        client = cmd.get("client")
+        cmd_id = cmd.get("id", 0)
+        if not isinstance(cmd_id, int) or isinstance(cmd_id, bool):
+            return  # Malformed: ids must be integers
+        if client is not None and not isinstance(client, str):
+            return  # Malformed: client must be a string
+        if cmd_id > self.last_command_ids.get(client, 0):
+            self.last_command_ids[client] = cmd_id
+            self.command_queue.put(QueuedCommand(cmd, "file"))
+
+    def _report_status(self):
+        """
+        Refresh bridge_status.json every STATUS_INTERVAL.
+
+        Without metrics the file is only rewritten when the event counters
+        changed; with metrics it is refreshed on every interval.
+        """
+        now = time.monotonic()
+        if now - self._last_status_time < STATUS_INTERVAL:
+            return
+        if API_TRACE_ENABLED:
             try:
-                self.app.fireCustomEvent(CUSTOM_EVENT_ID, json.dumps({"check_commands": True}))
-            except:
-                pass  # App might be shutting down
+                api_trace.write(API_TRACE_FILE, API_TRACE_TOP)
+            except OSError:
+                pass
+        stats = self.command_queue.stats()
+        if stats == self._last_status and self.metrics is None:
+            return
+        fields = {"events": stats}
+        if self.metrics is not None:
+            fields["metrics"] = self.metrics.snapshot()
+        if RESULT_CACHE_ENABLED:
+            fields["result_cache"] = result_cache.stats()
+        if CONTEXT_SNAPSHOT:
+            fields["context"] = context_stats()
+        fields["entity_index"] = entity_index.stats()
+        fields["token_cache"] = token_cache.stats()
+        try:
+            write_status("running", "Bridge active", **fields)
+        except OSError:
+            return
+        self._last_status = stats
+        self._last_status_time = now
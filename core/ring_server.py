@@ -0,0 +1,120 @@
+"""
+Shared-memory ring buffer transport for high-rate command streams.
+
+Clients write JSON (or MessagePack) commands into the request ring of
+bridge.ring and read result records from the response ring (see bridge_client/ring.py for the
+layout). This thread watches the request ring's head counter in memory, so
+new entries are found without touching the filesystem.
+
+Futex/eventfd wake-ups are not available across processes on every
+platform Fusion runs on, so the thread polls the counter with an adaptive
+back-off: it spins briefly after activity and sleeps up to
+RING_IDLE_SLEEP when idle.
+
+Responses use the request's encoding unless the command sets "encoding".
+"""
+
+import queue
+import threading
+import time
+
+from ..bridge_client.codec import decode_message, encode_message
+from ..bridge_client.ring import SharedRings
+from .command_queue import QueuedCommand
+from .status import set_status_section
+
+
+class RingServer(threading.Thread):
+    """Background thread moving commands from the request ring to the main thread."""
+
+    def __init__(self, stop_event, command_queue, path, capacity, idle_sleep):
+        """
+        Args:
+            stop_event: threading.Event to signal when to stop
+            command_queue: CommandQueue shared with the event handler
+            path: Ring file to create (e.g. bridge.ring)
+            capacity: Bytes per ring
+            idle_sleep: Longest sleep between checks when idle (seconds)
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.stopped = stop_event
+        self.command_queue = command_queue
+        self.idle_sleep = idle_sleep
+        self.rings = SharedRings(path, capacity, create=True)
+        # Replies come from the main thread; only this thread writes the ring
+        self.outbox = queue.SimpleQueue()
+        self._backlog = []
+        set_status_section("ring", {"path": path, "capacity": self.rings.capacity})
+
+    def run(self):
+        sleep = 0.0
+        try:
+            while not self.stopped.is_set():
+                if self._read_requests() | self._write_responses():
+                    sleep = 0.0
+                    continue
+                # Adaptive back-off: 50us doubling up to idle_sleep
+                sleep = min(self.idle_sleep, sleep * 2 or 0.00005)
+                time.sleep(sleep)
+        finally:
+            self.close()
+
+    def close(self):
+        """Remove the ring file and withdraw it from the status (safe to call twice)."""
+        rings, self.rings = self.rings, None
+        if rings is None:
+            return
+        set_status_section("ring", None)
+        rings.remove()
+
+    def _read_requests(self):
+        items = []
+        entry = self.rings.requests.read()
+        while entry is not None:
+            _, payload = entry
+            try:
+                cmd, encoding = decode_message(payload)
+            except (ValueError, TypeError) as e:
+                self.outbox.put((self._error(None, f"Invalid message: {e}"), "json"))
+            else:
+                if isinstance(cmd, dict):
+                    encoding = cmd.get("encoding", encoding)
+                    items.append(QueuedCommand(cmd, "ring", reply=self._reply_for(cmd, encoding)))
+                else:
+                    self.outbox.put((self._error(None, "Request must be an object"), encoding))
+            entry = self.rings.requests.read()
+        self.command_queue.put_many(items)
+        return bool(items)
+
+    def _write_responses(self):
+        wrote = False
+        while True:
+            if not self._backlog:
+                try:
+                    record, encoding = self.outbox.get_nowait()
+                except queue.Empty:
+                    return wrote
+                self._backlog.append((record.get("command_id"), encoding,
+                                      encode_message(record, encoding)))
+            command_id, encoding, body = self._backlog[0]
+            try:
+                written = self.rings.responses.write(body)
+            except ValueError:
+                written = self.rings.responses.write(encode_message(self._error(
+                    command_id, "Result too large for the ring transport"), encoding))
+            if written is None:
+                return wrote  # Client has not drained the ring yet; retry later
+            self._backlog.pop(0)
+            wrote = True
+
+    def _reply_for(self, cmd, encoding):
+        command_id = cmd.get("id", 0)
+
+        def reply(record):
+            record = record or self._error(command_id, "Command produced no result")
+            self.outbox.put((record, encoding))
+        return reply
+
+    @staticmethod
+    def _error(command_id, message):
+        return {"command_id": command_id, "success": False, "result": None, "error": message}
@@ -0,0 +1,236 @@
+"""
+Local socket transport (Unix domain socket or loopback TCP).
+
+An alternative to the commands.json/results.json file pair with no disk
+writes or polling. Each message is a 4-byte big-endian length followed by
+a UTF-8 JSON body. Requests use the normal command format
+({"id", "action", "params"}); responses are the same records that would
+be written to results.json. A connection may pipeline requests: each one is
+queued for the main thread through the existing custom event, and responses
+are streamed back in completion order on the same connection.
+
+Messages that are JSON-RPC 2.0 requests or batches (see commands/jsonrpc.py)
+are answered with JSON-RPC responses instead; a batch runs in order within
+one main-thread dispatch.
+
+Bodies may also be MessagePack (see bridge_client/codec.py). Responses use
+the encoding of the request, or the request's "encoding" field if set
+("json" or "msgpack"), so geometry-heavy results can be returned in binary.
+"""
+
+import os
+import queue
+import select
+import socket
+import struct
+import threading
+
+from ..bridge_client.codec import decode_message, encode_message
+from ..commands.jsonrpc import is_jsonrpc, error_response, PARSE_ERROR
+from .command_queue import QueuedCommand
+from .status import set_status_section
+
+_HEADER = struct.Struct(">I")
+
+# Refuse frames larger than this (protects against garbage on the port)
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def recv_exact(sock, size):
+    """Read exactly size bytes, or return None if the peer closed."""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(sock):
+    """Read one length-prefixed frame body, or None on EOF."""
+    header = recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {length} bytes exceeds limit")
+    return recv_exact(sock, length)
+
+
+def write_frame(sock, body):
+    """Send one length-prefixed frame."""
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+class SocketServer(threading.Thread):
+    """Background thread accepting local connections and queueing their commands."""
+
+    def __init__(self, stop_event, command_queue, family, path, host, port):
+        """
+        Args:
+            stop_event: threading.Event to signal when to stop
+            command_queue: CommandQueue shared with the event handler
+            family: "unix", "tcp" or "auto" (unix where available)
+            path: Socket file for the unix family
+            host: Bind address for the tcp family (should be loopback)
+            port: TCP port (0 picks a free port)
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.stopped = stop_event
+        self.command_queue = command_queue
+        self.path = path
+        if family == "auto":
+            family = "unix" if hasattr(socket, "AF_UNIX") else "tcp"
+        self.family = family
+        self.host = host
+        self.port = port
+        self.endpoint = None
+        self._listener = None
+
+    def bind(self):
+        """Create the listening socket and publish the endpoint in bridge_status.json."""
+        if self.family == "unix":
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            listener.bind(self.path)
+            self.endpoint = {"family": "unix", "path": self.path}
+        else:
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((self.host, self.port))
+            host, port = listener.getsockname()[:2]
+            self.endpoint = {"family": "tcp", "host": host, "port": port}
+        listener.listen(8)
+        self._listener = listener
+        set_status_section("socket", self.endpoint)
+
+    def run(self):
+        """Accept connections until stopped."""
+        if self._listener is None:
+            self.bind()
+        try:
+            while not self.stopped.is_set():
+                ready, _, _ = select.select([self._listener], [], [], 0.25)
+                if not ready:
+                    continue
+                conn, _ = self._listener.accept()
+                if self.family == "tcp":
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                _Connection(conn, self.command_queue, self.stopped).start()
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the listening socket and withdraw the endpoint (safe to call twice)."""
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.close()
+        set_status_section("socket", None)
+        if self.family == "unix" and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _Connection:
+    """One client connection: a reader thread and a writer thread."""
+
+    # Outbox marker: the reader hit EOF; close once pending replies are sent
+    _EOF = object()
+
+    def __init__(self, conn, command_queue, stop_event):
+        self.conn = conn
+        self.command_queue = command_queue
+        self.stopped = stop_event
+        self.outbox = queue.Queue()
+        self.pending = 0
+        self._lock = threading.Lock()
+        # Each connection is its own caller for read-after-write ordering
+        self.origin = f"socket:{id(self)}"
+
+    def start(self):
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        threading.Thread(target=self._write_loop, daemon=True).start()
+
+    def _read_loop(self):
+        try:
+            while not self.stopped.is_set():
+                body = read_frame(self.conn)
+                if body is None:
+                    break
+                self._handle(body)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.outbox.put(self._EOF)
+
+    def _handle(self, body):
+        try:
+            cmd, encoding = decode_message(body)
+        except (ValueError, TypeError) as e:
+            if body.lstrip().startswith(b"[") or b'"jsonrpc"' in body:
+                self.outbox.put((error_response(None, PARSE_ERROR, f"Parse error: {e}"), "json"))
+            else:
+                self.outbox.put((self._error(None, f"Invalid message: {e}"), "json"))
+            return
+        if is_jsonrpc(cmd):
+            item = QueuedCommand(cmd, "socket", reply=self._reply_rpc(encoding), kind="jsonrpc",
+                                 origin=self.origin)
+        elif isinstance(cmd, dict):
+            encoding = cmd.get("encoding", encoding)
+            item = QueuedCommand(cmd, "socket", reply=self._reply_for(cmd, encoding),
+                                 origin=self.origin)
+        else:
+            self.outbox.put((self._error(None, "Request must be an object"), encoding))
+            return
+        with self._lock:
+            self.pending += 1
+        self.command_queue.put(item)
+
+    def _reply_for(self, cmd, encoding):
+        command_id = cmd.get("id", 0)
+
+        def reply(record):
+            # Runs on the main thread: just hand the record to the writer thread
+            with self._lock:
+                if record and record.get("partial"):
+                    self.outbox.put((record, encoding))  # More records follow
+                    return
+                self.pending -= 1
+                record = record or self._error(command_id, "Command produced no result")
+                self.outbox.put((record, encoding))
+        return reply
+
+    def _reply_rpc(self, encoding):
+        def reply(response):
+            # Notification-only requests produce no response at all
+            with self._lock:
+                self.pending -= 1
+                if response is not None:
+                    self.outbox.put((response, encoding))
+        return reply
+
+    @staticmethod
+    def _error(command_id, message):
+        return {"command_id": command_id, "success": False, "result": None, "error": message}
+
+    def _write_loop(self):
+        closing = False
+        try:
+            while True:
+                entry = self.outbox.get()
+                if entry is self._EOF:
+                    closing = True
+                else:
+                    record, encoding = entry
+                    write_frame(self.conn, encode_message(record, encoding))
+                if closing:
+                    with self._lock:
+                        if self.pending == 0 and self.outbox.empty():
+                            break
+        except OSError:
+            pass
+        finally:
+            self.conn.close()
@@ -0,0 +1,38 @@
+"""
+Writer for bridge_status.json.
+"""
+
+import threading
+import time
+
+from ..config import STATUS_FILE
+from ..utils import write_json_atomic
+
+# Sections that persist across writes (e.g. the socket endpoint)
+_sections = {}
+_lock = threading.Lock()
+
+
+def set_status_section(name, value):
+    """Set a section included in every subsequent status write (None removes it)."""
+    with _lock:
+        if value is None:
+            _sections.pop(name, None)
+        else:
+            _sections[name] = value
+
+
+def write_status(status, message, **fields):
+    """
+    Atomically write the bridge status file.
+
+    Args:
+        status: "running" or "stopped"
+        message: Human-readable status message
+        **fields: Extra sections to include (e.g. event counters)
+    """
+    data = {"status": status, "message": message, "updated_at": time.time()}
+    with _lock:
+        data.update(_sections)
+        data.update(fields)
+        write_json_atomic(STATUS_FILE, data)
@@ -0,0 +1,159 @@
+"""
+File-change watchers used to wake the bridge as soon as a command is written.
+
+Watchers take a list of paths (e.g. commands.json and commands.jsonl) and
+report when any of them changed.
+
+Two implementations share the same small interface:
+- InotifyWatcher: kernel notifications on Linux (no polling at all)
+- StatWatcher: portable fallback that compares os.stat() snapshots
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify constants (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class StatWatcher:
+    """Detect file changes by polling os.stat() on the calling thread."""
+
+    def __init__(self, paths, interval):
+        """
+        Args:
+            paths: Files to watch (they do not need to exist yet)
+            interval: Seconds between stat() checks
+        """
+        self.paths = list(paths)
+        self.interval = interval
+        self._last = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                snapshot.append(None)
+                continue
+            snapshot.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return snapshot
+
+    def wait(self, timeout):
+        """
+        Block until a watched file changes or the timeout expires.
+
+        Returns:
+            bool: True if a file changed
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            if current != self._last:
+                self._last = current
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Detect completed writes to files with Linux inotify."""
+
+    def __init__(self, paths, append_paths=()):
+        """
+        Args:
+            paths: Files to watch. Their parent directories are watched so
+                   that files replaced by rename (atomic writes) are still seen.
+            append_paths: Those of paths that writers may keep open and
+                          append to (e.g. the journal); every write to them
+                          counts, not only closing the file
+
+        Raises:
+            OSError: If inotify is unavailable
+        """
+        self.names = {os.fsencode(os.path.basename(path)) for path in paths}
+        self.append_names = {os.fsencode(os.path.basename(path)) for path in append_paths}
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directories = {os.path.dirname(os.path.abspath(path)) for path in paths}
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory),
+                                      IN_CLOSE_WRITE | IN_MOVED_TO | IN_MODIFY) < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        """
+        Block until a watched file is written or the timeout expires.
+
+        Returns:
+            bool: True if a file changed
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = data[start:start + name_len].rstrip(b"\0")
+            if mask & IN_MODIFY and not mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                # Partial writes only count for append-only files
+                if name in self.append_names:
+                    changed = True
+            elif name in self.names:
+                changed = True
+            offset = start + name_len
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(paths, mode, stat_interval, append_paths=()):
+    """
+    Create a watcher for the given mode.
+
+    Args:
+        paths: Files to watch
+        append_paths: Those of paths that are appended to while kept open
+        mode: "auto", "inotify", "stat" or "interval"
+        stat_interval: Poll period for the stat fallback
+
+    Returns:
+        A watcher, or None for the legacy fixed-interval mode
+    """
+    if mode == "interval":
+        return None
+    if mode in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths, append_paths)
+        except (OSError, AttributeError):
+            pass  # Fall back to stat polling
+    return StatWatcher(paths, stat_interval)
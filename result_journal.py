@@ -0,0 +1,113 @@
+"""
+Append-only result journal (results.jsonl).
+
+Every result is appended as one compact JSON line keyed by command_id (and
+client, since each client has its own id sequence), so
+pipelined clients can read results in bulk and never lose one because
+results.json was overwritten by a later command. The journal is rotated by
+size (results.jsonl -> results.1.jsonl -> ...), and an in-memory index of
+line offsets gives random access for the get_result command.
+"""
+
+import json
+import os
+import threading
+
+
+class ResultJournal:
+    """Size-rotated JSONL file of command results with an id -> offset index."""
+
+    def __init__(self, path, max_bytes, backups):
+        """
+        Args:
+            path: Active journal file (e.g. results.jsonl)
+            max_bytes: Rotate once the active file grows past this size
+            backups: Number of rotated files to keep (results.1.jsonl, ...);
+                     0 truncates the active file when it is full
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._index = {}
+
+    def _rotated_path(self, n):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{n}{ext}"
+
+    def _path_for(self, generation):
+        age = self._generation - generation
+        if age == 0:
+            return self.path
+        if 0 < age <= self.backups:
+            return self._rotated_path(age)
+        return None
+
+    def _rotate(self):
+        if self.backups == 0:
+            # No backups: start the active file over
+            open(self.path, 'wb').close()
+        for n in range(self.backups, 0, -1):
+            src = self.path if n == 1 else self._rotated_path(n - 1)
+            if os.path.exists(src):
+                os.replace(src, self._rotated_path(n))
+        self._generation += 1
+        oldest = self._generation - self.backups
+        self._index = {k: v for k, v in self._index.items() if v[0] >= oldest}
+
+    def append(self, record):
+        """Append a result record (must contain 'command_id')."""
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                self._rotate()
+                size = 0
+            with open(self.path, 'ab') as f:
+                f.write(line)
+            self._index[(record.get("client"), record.get("command_id"))] = (self._generation, size)
+
+    def get(self, command_id, client=None):
+        """
+        Look up the most recent result for a command id.
+
+        Args:
+            command_id: Command id
+            client: Client the id belongs to (ids are per client)
+
+        Returns:
+            dict or None if the result is not in the journal (or was rotated out)
+        """
+        with self._lock:
+            entry = self._index.get((client, command_id))
+            path = self._path_for(entry[0]) if entry else None
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(entry[1])
+                    return json.loads(f.readline())
+            except (OSError, ValueError):
+                pass
+        return self._scan(command_id, client)
+
+    def _scan(self, command_id, client):
+        """Fallback for results written before this session: scan newest first."""
+        paths = [self.path] + [self._rotated_path(n) for n in range(1, self.backups + 1)]
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in reversed(lines):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("command_id") == command_id and record.get("client") == client:
+                    return record
+        return None
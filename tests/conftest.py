@@ -0,0 +1,28 @@
+"""
+Tests for the standalone bridge_client package and the add-in's adsk-free
+modules (command queue, command journal, result journal).
+
+The add-in needs Fusion 360 (adsk) as a whole. Its directory is registered
+as the package "addin" without running core/__init__.py, so modules that
+only use the standard library can be imported as addin.core.command_queue,
+addin.result_journal, ...
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import bridge_client from the repository root
+sys.path.insert(0, ROOT)
+
+
+def _namespace(name, path):
+    module = types.ModuleType(name)
+    module.__path__ = [path]
+    sys.modules[name] = module
+
+
+_namespace("addin", ROOT)
+_namespace("addin.core", os.path.join(ROOT, "core"))
@@ -0,0 +1,248 @@
+"""BridgeClient against local stand-ins for the add-in."""
+
+import asyncio
+import json
+import os
+import struct
+
+import pytest
+
+from bridge_client import BridgeClient, CommandError, RingTransport, SocketTransport
+from bridge_client.codec import decode_message, encode_message
+from bridge_client.ring import SharedRings
+
+
+def _answer(cmd):
+    """What the stand-in add-in replies to a command (None: never answers)."""
+    action = cmd.get("action")
+    record = {"command_id": cmd.get("id"), "success": True, "result": None, "error": None}
+    if cmd.get("client") is not None:
+        record["client"] = cmd["client"]
+    if action == "echo":
+        record["result"] = cmd.get("params")
+    elif action == "fail":
+        record.update(success=False, error="boom")
+    elif action == "hang":
+        return None
+    return record
+
+
+class FileStandIn:
+    """Speaks the file protocol: reads commands.jsonl, appends results.jsonl.
+
+    Each batch of commands read together is answered in reverse order, so
+    results arrive out of order.
+    """
+
+    def __init__(self, base_dir):
+        self.commands_path = os.path.join(base_dir, "commands.jsonl")
+        self.results_path = os.path.join(base_dir, "results.jsonl")
+        self.received = []
+        self._offset = 0
+
+    def poll(self):
+        try:
+            with open(self.commands_path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        commands = [json.loads(line) for line in data[:end].splitlines()]
+        self.received.extend(commands)
+        records = [r for r in map(_answer, reversed(commands)) if r is not None]
+        with open(self.results_path, 'ab') as f:
+            for record in records:
+                f.write((json.dumps(record) + "\n").encode())
+
+    async def run(self):
+        while True:
+            self.poll()
+            await asyncio.sleep(0.002)
+
+
+def run_with_file_bridge(tmp_path, scenario, **client_kwargs):
+    """Run scenario(bridge, stand_in) with a client on the file protocol."""
+    async def main():
+        stand_in = FileStandIn(str(tmp_path))
+        task = asyncio.ensure_future(stand_in.run())
+        try:
+            async with BridgeClient.file(str(tmp_path), **client_kwargs) as bridge:
+                return await scenario(bridge, stand_in)
+        finally:
+            task.cancel()
+    return asyncio.run(main())
+
+
+def test_ids_are_allocated_automatically_and_increase(tmp_path):
+    async def scenario(bridge, stand_in):
+        for i in range(5):
+            assert await bridge.call("echo", {"i": i}) == {"i": i}
+        return [cmd["id"] for cmd in stand_in.received]
+
+    ids = run_with_file_bridge(tmp_path, scenario)
+    assert len(set(ids)) == 5
+    assert ids == sorted(ids)
+
+
+def test_many_calls_in_flight_resolve_to_their_own_results(tmp_path):
+    async def scenario(bridge, stand_in):
+        futures = [await bridge.submit("echo", {"i": i}) for i in range(50)]
+        assert len(bridge._pending) == 50
+        records = await asyncio.wait_for(asyncio.gather(*futures), 5)
+        assert not bridge._pending
+        return records
+
+    records = run_with_file_bridge(tmp_path, scenario)
+    assert [r["result"] for r in records] == [{"i": i} for i in range(50)]
+
+
+def test_concurrent_calls_with_gather(tmp_path):
+    async def scenario(bridge, stand_in):
+        return await asyncio.gather(*(bridge.call("echo", {"i": i}) for i in range(20)))
+
+    assert run_with_file_bridge(tmp_path, scenario) == [{"i": i} for i in range(20)]
+
+
+def test_timeout_applies_per_call(tmp_path):
+    async def scenario(bridge, stand_in):
+        hanging = asyncio.ensure_future(bridge.call("hang", timeout=0.2))
+        # Other calls complete while the hanging one waits
+        assert await bridge.call("echo", {"ok": True}, timeout=2) == {"ok": True}
+        with pytest.raises(asyncio.TimeoutError):
+            await hanging
+        assert not bridge._pending
+        return stand_in.received
+
+    received = run_with_file_bridge(tmp_path, scenario)
+    hang = next(cmd for cmd in received if cmd["action"] == "hang")
+    # The timeout is also sent as a deadline so the add-in can skip it
+    assert "deadline" in hang
+
+
+def test_default_timeout(tmp_path):
+    async def scenario(bridge, stand_in):
+        with pytest.raises(asyncio.TimeoutError):
+            await bridge.call("hang")
+
+    run_with_file_bridge(tmp_path, scenario, default_timeout=0.1)
+
+
+def test_failure_raises_command_error(tmp_path):
+    async def scenario(bridge, stand_in):
+        with pytest.raises(CommandError) as info:
+            await bridge.call("fail")
+        assert info.value.action == "fail"
+        assert info.value.record["error"] == "boom"
+
+    run_with_file_bridge(tmp_path, scenario)
+
+
+def test_results_of_other_clients_are_ignored(tmp_path):
+    async def scenario(bridge, stand_in):
+        future = await bridge.submit("hang")
+        await asyncio.sleep(0.05)
+        command_id = stand_in.received[-1]["id"]
+        # Same id, but another client's result
+        with open(stand_in.results_path, 'ab') as f:
+            f.write((json.dumps({"command_id": command_id, "client": "other",
+                                 "success": True, "result": 1}) + "\n").encode())
+        await asyncio.sleep(0.05)
+        assert not future.done()
+        future.cancel()
+        return stand_in.received
+
+    received = run_with_file_bridge(tmp_path, scenario, client="agent-1")
+    assert all(cmd["client"] == "agent-1" for cmd in received)
+
+
+def test_results_from_before_connect_are_not_reported(tmp_path):
+    stale = {"command_id": 1, "success": True, "result": "stale", "error": None}
+    (tmp_path / "results.jsonl").write_text(json.dumps(stale) + "\n")
+
+    async def scenario(bridge, stand_in):
+        assert await bridge.call("echo", {"fresh": True}) == {"fresh": True}
+
+    run_with_file_bridge(tmp_path, scenario)
+
+
+def test_results_journal_truncated_in_place(tmp_path):
+    # Rotation without backups truncates results.jsonl and keeps its inode
+    stale = {"command_id": 1, "success": True, "result": "x" * 1000, "error": None}
+    (tmp_path / "results.jsonl").write_text(json.dumps(stale) + "\n")
+
+    async def scenario(bridge, stand_in):
+        assert await bridge.call("echo", {"before": True}, timeout=2) == {"before": True}
+        with open(tmp_path / "results.jsonl", 'r+b') as f:
+            f.truncate(0)
+        assert await bridge.call("echo", {"after": True}, timeout=2) == {"after": True}
+
+    run_with_file_bridge(tmp_path, scenario)
+
+
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+def test_socket_transport(tmp_path, encoding):
+    header = struct.Struct(">I")
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                (length,) = header.unpack(await reader.readexactly(header.size))
+                cmd, used = decode_message(await reader.readexactly(length))
+                record = _answer(cmd)
+                if record is not None:
+                    body = encode_message(record, used)
+                    writer.write(header.pack(len(body)) + body)
+                    await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        transport = SocketTransport(host="127.0.0.1", port=port, encoding=encoding)
+        try:
+            async with BridgeClient(transport) as bridge:
+                results = await asyncio.gather(
+                    *(bridge.call("echo", {"p": [float(i), 0.5]}) for i in range(10)))
+                with pytest.raises(asyncio.TimeoutError):
+                    await bridge.call("hang", timeout=0.1)
+                return results
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    assert asyncio.run(main()) == [{"p": [float(i), 0.5]} for i in range(10)]
+
+
+def test_ring_transport(tmp_path):
+    path = str(tmp_path / "bridge.ring")
+    add_in = SharedRings(path, 4096, create=True)
+
+    async def serve():
+        while True:
+            entry = add_in.requests.read()
+            if entry is None:
+                await asyncio.sleep(0.001)
+                continue
+            cmd, used = decode_message(entry[1])
+            record = _answer(cmd)
+            if record is not None:
+                add_in.responses.write(encode_message(record, used))
+
+    async def main():
+        task = asyncio.ensure_future(serve())
+        try:
+            async with BridgeClient(RingTransport(path, encoding="msgpack")) as bridge:
+                # More data than the ring holds, so both rings wrap around
+                return await asyncio.gather(
+                    *(bridge.call("echo", {"i": i, "pad": "x" * 100}) for i in range(200)))
+        finally:
+            task.cancel()
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        add_in.remove()
+    assert [r["i"] for r in results] == list(range(200))
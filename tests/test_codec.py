@@ -0,0 +1,150 @@
+"""Round trips through bridge_client.codec."""
+
+import json
+import struct
+
+import pytest
+
+from bridge_client.codec import (
+    EXT_FLOAT_ARRAY, EXT_POINT_ARRAY, packb, unpackb, encode_message, decode_message,
+    compress_record, decompress_record, load_file,
+)
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False,
+    0, 1, 127, 128, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1,
+    -1, -32, -33, -128, -2**15, -2**31, -2**31 - 1, -2**63,
+    0.0, -1.5, 1e300,
+    "", "a", "x" * 31, "x" * 32, "x" * 255, "x" * 256, "x" * 70000, "héllo ✓",
+    b"", b"\x00\xff", b"y" * 300, b"z" * 70000,
+    [], [1, "a", None], list(range(15)), list(range(16)), list(range(70000)),
+    {}, {"a": 1}, {str(i): i for i in range(15)}, {str(i): i for i in range(16)},
+    {"nested": {"list": [{"x": 1}, [2, [3]]], "empty": {}}},
+])
+def test_round_trip(value):
+    assert unpackb(packb(value)) == value
+
+
+def test_tuple_decodes_as_list():
+    assert unpackb(packb((1, 2, "a"))) == [1, 2, "a"]
+
+
+def test_non_string_keys_become_strings():
+    assert unpackb(packb({1: "a"})) == {"1": "a"}
+
+
+def test_unsupported_type():
+    with pytest.raises(TypeError):
+        packb(object())
+
+
+def test_float_array_extension():
+    values = [0.5, -1.25, 3.0, 1e-9]
+    data = packb(values)
+    # ext 8 header + code, then packed little-endian float64
+    assert data[:3] == bytes((0xc7, 8 * len(values), EXT_FLOAT_ARRAY))
+    assert data[3:] == struct.pack("<4d", *values)
+    assert unpackb(data) == values
+
+
+def test_point_array_extension():
+    points = [[0.0, 1.0, 2.0], [3.5, -4.5, 5.25], [6.0, 7.0, 8.0]]
+    data = packb(points)
+    assert data[2] == EXT_POINT_ARRAY
+    assert unpackb(data) == points
+
+
+def test_large_float_array_uses_wider_ext_headers():
+    for n in (40, 9000):
+        values = [float(i) / 3 for i in range(n)]
+        assert unpackb(packb(values)) == values
+
+
+@pytest.mark.parametrize("value", [
+    [1.0],                    # too short to pack
+    [1.0, 2],                 # mixed int/float
+    [[1.0, 2.0], [3.0]],      # ragged rows
+    [[1.0, 2.0], [3.0, 4]],   # int inside a row
+    [[], []],                 # zero-width rows
+])
+def test_lists_that_are_not_float_arrays(value):
+    data = packb(value)
+    assert data[0] not in (0xc7, 0xc8, 0xc9)
+    assert unpackb(data) == value
+
+
+def test_unknown_extension_decodes_as_code_and_bytes():
+    assert unpackb(bytes((0xd4, 9, 0x2a))) == (9, b"\x2a")
+
+
+def test_truncated_and_extra_data():
+    data = packb({"a": [1, 2, 3]})
+    with pytest.raises(ValueError):
+        unpackb(data[:-1])
+    with pytest.raises(ValueError):
+        unpackb(data + b"\x00")
+
+
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+def test_message_round_trip(encoding):
+    message = {"id": 7, "action": "draw_line", "params": {"x1": 0.5, "points": [[0.0, 1.0]] * 3}}
+    decoded, detected = decode_message(encode_message(message, encoding))
+    assert detected == encoding
+    assert decoded == message
+
+
+@pytest.mark.parametrize("value", [123, 91, -1, None, True, "{x", 1.5, [{"a": 1}] * 20,
+                                   {str(i): i for i in range(20)}])
+def test_msgpack_message_that_looks_like_json(value):
+    # 123 packs to b"{" and 91 to b"["
+    assert decode_message(packb(value)) == (value, "msgpack")
+
+
+@pytest.mark.parametrize("body", [
+    b"{not json",
+    b"\xc7\x02\x02ab",                                     # point array without a width
+    b"\xc7\x03\x01abc",                                    # float array of 3 bytes
+    b"\xc7\x0c\x02" + struct.pack("<I", 0) + b"\0" * 8,    # width 0
+    b"\xc7\x14\x02" + struct.pack("<I", 3) + b"\0" * 16,   # 2 values, width 3
+    b"\x81\x90\x01",                                       # list as map key
+    b"\x91" * 100000,                                       # nested too deep
+    b"\xdc\x00",                                            # truncated length
+])
+def test_invalid_message(body):
+    with pytest.raises(ValueError):
+        decode_message(body)
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zlib"])
+def test_compressed_record_round_trip(codec):
+    record = {"command_id": 1, "success": True, "result": {"points": list(range(1000))},
+              "error": None}
+    packed = compress_record(record, codec, min_bytes=100)
+    assert packed["compression"] == codec
+    assert isinstance(packed["result"], str)
+    assert decompress_record(packed) == record
+
+
+def test_small_record_is_not_compressed():
+    record = {"command_id": 1, "success": True, "result": {"a": 1}, "error": None}
+    assert compress_record(record, "gzip", min_bytes=100) is record
+    assert decompress_record(record) is record
+
+
+@pytest.mark.parametrize("name, encode", [
+    ("data.json", lambda v: json.dumps(v).encode()),
+    ("data.msgpack", packb),
+])
+@pytest.mark.parametrize("codec", [None, "gzip", "zlib"])
+def test_load_file(tmp_path, name, encode, codec):
+    from bridge_client.codec import COMPRESSIONS, compress
+
+    value = {"bodies": [{"bbox": [0.0, 1.0, 2.0]}]}
+    data = encode(value)
+    if codec:
+        name += COMPRESSIONS[codec]
+        data = compress(data, codec)
+    path = tmp_path / name
+    path.write_bytes(data)
+    assert load_file(str(path)) == value
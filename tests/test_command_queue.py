@@ -0,0 +1,129 @@
+"""core/command_queue.py: lane priority, per-origin ordering, inline answers, wake-ups."""
+
+import pytest
+
+from addin.core.command_queue import CommandQueue, QueuedCommand
+from addin.utils import write_result
+
+LANE_OF = {"ping": "control", "status": "control", "look": "read", "export": "export"}
+
+
+class FakeApp:
+    def __init__(self):
+        self.fired = 0
+
+    def fireCustomEvent(self, event_id, info):
+        self.fired += 1
+
+
+@pytest.fixture
+def queue():
+    return CommandQueue(FakeApp(), lambda action: LANE_OF.get(action, "mutate"))
+
+
+def put(queue, command_id, action, client):
+    queue.put(QueuedCommand({"id": command_id, "action": action, "client": client}, "test"))
+
+
+def drain(queue):
+    ids = []
+    while True:
+        item = queue.pop()
+        if item is None:
+            return ids
+        ids.append(item.cmd["id"])
+
+
+def test_lanes_are_served_by_priority(queue):
+    put(queue, 1, "draw", "a")
+    put(queue, 2, "look", "b")
+    put(queue, 3, "status", "c")
+    assert drain(queue) == [3, 2, 1]
+    lanes = queue.stats()["lanes"]
+    assert lanes["control"]["served"] == lanes["read"]["served"] == lanes["mutate"]["served"] == 1
+
+
+def test_read_waits_for_own_earlier_mutation_only(queue):
+    put(queue, 1, "draw", "a")
+    put(queue, 2, "draw", "b")
+    put(queue, 3, "look", "a")
+    put(queue, 4, "look", "c")
+    # c's read overtakes everything; a's read waits for a's draw
+    assert drain(queue) == [4, 1, 3, 2]
+
+
+def test_origins_take_turns(queue):
+    for i in range(3):
+        put(queue, i, "draw", "a")
+    for i in range(10, 13):
+        put(queue, i, "draw", "b")
+    assert drain(queue) == [0, 10, 1, 11, 2, 12]
+
+
+def test_export_keeps_its_place_within_an_origin(queue):
+    put(queue, 1, "draw", "a")
+    put(queue, 2, "export", "a")
+    put(queue, 3, "draw", "a")
+    put(queue, 4, "look", "a")
+    # The export waits for draw 1, draw 3 waits for the export, and the
+    # read waits for draw 3
+    assert drain(queue) == [1, 2, 3, 4]
+
+
+def test_export_is_not_starved_by_other_origins(queue):
+    for i in range(5):
+        put(queue, i, "draw", "a")
+        put(queue, 10 + i, "draw", "c")
+    put(queue, 100, "export", "b")
+    order = drain(queue)
+    # One round of the round-robin (a, c), then the export
+    assert order.index(100) == 2
+
+
+def test_inline_actions_are_answered_without_queueing():
+    app = FakeApp()
+    answered = []
+
+    def responder(cmd):
+        answered.append(cmd["id"])
+        if cmd["id"] == 2:
+            raise RuntimeError("broken handler")
+        write_result(cmd["id"], True, {"message": "pong"})
+
+    queue = CommandQueue(app, lambda action: LANE_OF.get(action, "mutate"), ("ping",), responder)
+    replies = []
+    done = []
+
+    def bad_reply(record):
+        raise OSError("socket closed")
+
+    queue.put_many([
+        QueuedCommand({"id": 1, "action": "ping"}, "socket", on_done=lambda: done.append(1),
+                      reply=replies.append),
+        QueuedCommand({"id": 2, "action": "ping"}, "socket", reply=replies.append),
+        QueuedCommand({"id": 3, "action": "ping"}, "socket", reply=bad_reply),
+        QueuedCommand({"id": 4, "action": "ping"}, "socket", reply=replies.append),
+    ])
+    assert answered == [1, 2, 3, 4]
+    assert [r["command_id"] for r in replies] == [1, 4]
+    assert done == [1]
+    # Nothing for the main thread: no event, nothing queued
+    assert app.fired == 0 and len(queue) == 0
+    assert queue.stats()["lanes"]["control"]["served"] == 4
+
+
+def test_inline_actions_are_queued_without_a_responder(queue):
+    queue.put(QueuedCommand({"id": 1, "action": "ping"}, "socket"))
+    assert drain(queue) == [1]
+
+
+def test_wake_ups_are_coalesced_and_rearms_counted_apart(queue):
+    put(queue, 1, "draw", "a")
+    put(queue, 2, "draw", "a")
+    assert (queue.fired_events, queue.suppressed_events) == (1, 1)
+    queue.begin_drain()
+    queue.pop()
+    queue.wake(rearm=True)
+    queue.wake(rearm=True)
+    assert (queue.fired_events, queue.suppressed_events, queue.rearmed_events) == (1, 1, 1)
+    assert queue.app.fired == 2
@@ -0,0 +1,107 @@
+"""core/journal.py (command journal) and result_journal.py (result journal)."""
+
+import json
+
+from addin.core.journal import CommandJournal
+from addin.result_journal import ResultJournal
+
+
+def append_commands(path, *ids):
+    with open(path, 'ab') as f:
+        for command_id in ids:
+            f.write((json.dumps({"id": command_id, "action": "draw"}) + "\n").encode())
+
+
+def test_reads_complete_lines_only(tmp_path):
+    path = tmp_path / "commands.jsonl"
+    journal = CommandJournal(str(path), str(tmp_path / "offset"))
+    append_commands(path, 1)
+    with open(path, 'ab') as f:
+        f.write(b'{"id": 2, "act')
+    assert [cmd["id"] for cmd, _ in journal.read_new()] == [1]
+    with open(path, 'ab') as f:
+        f.write(b'ion": "draw"}\nnot json\n[1]\n')
+    assert [cmd["id"] for cmd, _ in journal.read_new()] == [2]
+    assert journal.read_new() == []
+
+
+def test_commit_advances_over_contiguous_finished_commands(tmp_path):
+    path = tmp_path / "commands.jsonl"
+    journal = CommandJournal(str(path), str(tmp_path / "offset"))
+    append_commands(path, 1, 2, 3)
+    offsets = [offset for _, offset in journal.read_new()]
+    journal.commit(offsets[1])
+    assert journal.committed_offset == 0  # Command 1 has not run yet
+    journal.commit(offsets[0])
+    assert journal.committed_offset == offsets[1]
+    journal.commit(offsets[2])
+    assert journal.committed_offset == offsets[2]
+
+
+def test_offset_survives_a_restart(tmp_path):
+    path = tmp_path / "commands.jsonl"
+    offset_path = str(tmp_path / "offset")
+    journal = CommandJournal(str(path), offset_path)
+    append_commands(path, 1, 2)
+    for _, offset in journal.read_new():
+        journal.commit(offset, journal.generation)
+    journal.save_offset()
+    append_commands(path, 3)
+    restarted = CommandJournal(str(path), offset_path)
+    assert [cmd["id"] for cmd, _ in restarted.read_new()] == [3]
+
+
+def test_stale_commits_after_truncation_are_ignored(tmp_path):
+    path = tmp_path / "commands.jsonl"
+    journal = CommandJournal(str(path), str(tmp_path / "offset"))
+    append_commands(path, 1, 2)
+    old = journal.read_new()
+    old_generation = journal.generation
+    stale_end = old[0][1]
+
+    # The client starts a new journal; the first line ends where command 1 did
+    path.write_bytes(b"")
+    assert journal.read_new() == []
+    append_commands(path, 7, 8)
+    new = journal.read_new()
+    assert new[0][1] == stale_end
+
+    # Command 1 finishes only now: it must not count as command 7
+    journal.commit(stale_end, old_generation)
+    journal.commit(new[1][1], journal.generation)
+    assert journal.committed_offset == 0
+    journal.commit(new[0][1], journal.generation)
+    assert journal.committed_offset == new[1][1]
+
+
+def test_result_lookup_by_client_and_id(tmp_path):
+    journal = ResultJournal(str(tmp_path / "results.jsonl"), 10_000, 2)
+    journal.append({"command_id": 1, "result": "default"})
+    journal.append({"command_id": 1, "client": "a", "result": "a"})
+    assert journal.get(1)["result"] == "default"
+    assert journal.get(1, "a")["result"] == "a"
+    assert journal.get(2) is None
+
+
+def test_rotation_keeps_backups(tmp_path):
+    path = tmp_path / "results.jsonl"
+    journal = ResultJournal(str(path), 200, 1)
+    for i in range(10):
+        journal.append({"command_id": i, "result": "x" * 40})
+    assert (tmp_path / "results.1.jsonl").exists()
+    assert path.stat().st_size <= 200
+    assert journal.get(9)["command_id"] == 9
+    # Rotated out of both files
+    assert journal.get(0) is None
+
+
+def test_rotation_without_backups_truncates_in_place(tmp_path):
+    path = tmp_path / "results.jsonl"
+    journal = ResultJournal(str(path), 200, 0)
+    for i in range(10):
+        journal.append({"command_id": i, "result": "x" * 40})
+        assert path.stat().st_size <= 200
+    assert not (tmp_path / "results.1.jsonl").exists()
+    # Offsets recorded after the truncation point into the new contents
+    assert journal.get(9)["command_id"] == 9
+    assert journal.get(0) is None
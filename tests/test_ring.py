@@ -0,0 +1,107 @@
+"""bridge_client.ring: shared-memory SPSC rings, including wrap-around."""
+
+import pytest
+
+from bridge_client.ring import SharedRings, RECORD_HEADER, WRAP_MARKER
+
+
+@pytest.fixture
+def rings(tmp_path):
+    path = str(tmp_path / "bridge.ring")
+    server = SharedRings(path, 256, create=True)
+    client = SharedRings(path)
+    yield server, client
+    client.close()
+    server.remove()
+
+
+def test_attach_sees_created_layout(rings):
+    server, client = rings
+    assert client.capacity == server.capacity == 256
+
+
+def test_request_and_response_directions(rings):
+    server, client = rings
+    assert client.requests.write(b"ping") == 0
+    assert server.requests.read() == (0, b"ping")
+    assert server.requests.read() is None
+    assert server.responses.write(b"pong") == 0
+    assert client.responses.read() == (0, b"pong")
+
+
+def test_wraps_around_many_times_in_order(rings):
+    server, client = rings
+    ring_in, ring_out = client.requests, server.requests
+    expected = []
+    received = []
+    # Sizes that are not a divisor of the capacity force wrap markers
+    for i in range(500):
+        payload = bytes([i % 251]) * (1 + (i * 7) % 90)
+        seq = ring_in.write(payload)
+        while seq is None:
+            received.append(ring_out.read())
+            seq = ring_in.write(payload)
+        expected.append((seq, payload))
+    while ring_out.pending():
+        received.append(ring_out.read())
+    assert received == expected
+    assert [seq for seq, _ in received] == list(range(500))
+
+
+def test_wrap_marker_is_written_when_record_does_not_fit_at_end(rings):
+    server, client = rings
+    ring, consumer = client.requests, server.requests
+    # 3 records of 72 bytes fill 216 of 256; the next 72-byte record wraps
+    for _ in range(3):
+        assert ring.write(b"a" * (72 - RECORD_HEADER.size)) is not None
+    consumer.read()
+    consumer.read()
+    assert ring.write(b"b" * (72 - RECORD_HEADER.size)) == 3
+    marker = int.from_bytes(client.buf[ring.data_offset + 216:ring.data_offset + 220], "little")
+    assert marker == WRAP_MARKER
+    assert consumer.read()[0] == 2
+    assert consumer.read() == (3, b"b" * (72 - RECORD_HEADER.size))
+    assert consumer.read() is None
+
+
+def test_full_ring_refuses_writes_until_read(rings):
+    server, client = rings
+    payload = b"x" * 40
+    written = 0
+    while client.requests.write(payload) is not None:
+        written += 1
+    assert written == 256 // 56
+    assert server.requests.read() == (0, payload)
+    assert client.requests.write(payload) == written
+
+
+def test_oversized_message_is_rejected(rings):
+    _, client = rings
+    with pytest.raises(ValueError):
+        client.requests.write(b"x" * 200)
+
+
+def test_attaching_to_a_foreign_file_fails(tmp_path):
+    path = tmp_path / "other.ring"
+    path.write_bytes(b"\0" * 512)
+    with pytest.raises(ValueError):
+        SharedRings(str(path))
+
+
+def test_only_one_client_can_attach(tmp_path):
+    path = str(tmp_path / "bridge.ring")
+    server = SharedRings(path, 256, create=True)
+    first = SharedRings(path)
+    with pytest.raises(ConnectionError):
+        SharedRings(path)
+    first.close()
+    # Detaching lets the next client in
+    SharedRings(path).close()
+    server.remove()
+
+
+def test_failed_attach_releases_the_lock(tmp_path):
+    path = str(tmp_path / "missing.ring")
+    for _ in range(2):
+        with pytest.raises(OSError):
+            SharedRings(path)
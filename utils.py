@@ -3,9 +3,32 @@ Utility functions for file I/O operations.
 """
 
 import json
+import os
+import threading
 import time
+from contextlib import contextmanager
 
-from .config import RESULTS_FILE
+from .bridge_client.codec import compress_record
+from .config import (
+    RESULTS_FILE, RESULTS_JOURNAL_FILE, RESULTS_JOURNAL_MAX_BYTES, RESULTS_JOURNAL_BACKUPS,
+    COMPRESSION, COMPRESSION_MIN_BYTES
+)
+from .result_journal import ResultJournal
+
+# Every result is also appended here (see result_journal.py)
+result_journal = ResultJournal(
+    RESULTS_JOURNAL_FILE, RESULTS_JOURNAL_MAX_BYTES, RESULTS_JOURNAL_BACKUPS
+)
+
+
+# Per-thread stack of lists that capture results instead of writing files
+_capture = threading.local()
+
+# Client whose command is running on this thread (added to its result records)
+_client = threading.local()
+
+# Serializes results.json writes (control commands can run off the main thread)
+_results_lock = threading.Lock()
 
 
 def write_json(filepath, data):
@@ -14,12 +37,125 @@ def write_json(filepath, data):
         json.dump(data, f, indent=2)
 
 
-def write_result(command_id, success, result, error=None):
-    """Write command result."""
-    write_json(RESULTS_FILE, {
+def write_json_atomic(filepath, data):
+    """Write JSON via a temp file + rename so readers never see a partial file."""
+    tmp_path = f"{filepath}.tmp"
+    write_json(tmp_path, data)
+    os.replace(tmp_path, filepath)
+
+
+@contextmanager
+def result_client(client):
+    """
+    Tag results written on this thread with a client id for the duration of the block.
+
+    Command ids are only unique per client, so records carry the client that
+    sent the command (omitted for the default, unnamed client).
+    """
+    previous = getattr(_client, "name", None)
+    _client.name = client
+    try:
+        yield
+    finally:
+        _client.name = previous
+
+
+def current_client():
+    """Return the client of the command running on this thread (None if unnamed)."""
+    return getattr(_client, "name", None)
+
+
+@contextmanager
+def capture_results(on_partial=None):
+    """
+    Collect results written on this thread instead of writing result files.
+
+    Used by transports that return results directly to the caller (e.g. the
+    socket server). Captures nest; the innermost one receives the records.
+
+    Args:
+        on_partial: Optional callable that receives partial records from
+                    streaming commands (see write_partial) as they are made.
+                    Without it, streaming commands return one full result.
+
+    Usage:
+        with capture_results() as results:
+            execute_command(cmd, app, ui)
+        record = results[-1]
+    """
+    stack = getattr(_capture, "stack", None)
+    if stack is None:
+        stack = _capture.stack = []
+    captured = []
+    stack.append((captured, on_partial))
+    try:
+        yield captured
+    finally:
+        stack.pop()
+
+
+def write_result(command_id, success, result, error=None, **fields):
+    """
+    Write command result to results.json and append it to the result journal.
+
+    With COMPRESSION set, large payloads are stored compressed (see
+    bridge_client/codec.py compress_record).
+
+    Args:
+        **fields: Extra record fields, e.g. skipped="expired" for commands
+                  that did not run, or cached=True for cache hits
+    """
+    record = {
         "command_id": command_id,
         "success": success,
         "result": result,
         "error": error,
         "timestamp": time.time()
-    })
+    }
+    record.update(fields)
+    client = current_client()
+    if client is not None:
+        record["client"] = client
+    stack = getattr(_capture, "stack", None)
+    if stack:
+        stack[-1][0].append(record)
+        return
+    record = compress_record(record, COMPRESSION, COMPRESSION_MIN_BYTES)
+    with _results_lock:
+        write_json(RESULTS_FILE, record)
+        result_journal.append(record)
+
+
+def can_stream():
+    """Return True if partial results written on this thread reach the caller."""
+    stack = getattr(_capture, "stack", None)
+    return not stack or stack[-1][1] is not None
+
+
+def write_partial(command_id, result, chunk):
+    """
+    Emit one chunk of a streaming command's result before the command finishes.
+
+    Partial records look like normal results plus "partial": true and a
+    "chunk" number. They go to the capturing transport's on_partial callback,
+    or to the result journal only (results.json keeps holding final results).
+    """
+    record = {
+        "command_id": command_id,
+        "success": True,
+        "result": result,
+        "error": None,
+        "partial": True,
+        "chunk": chunk,
+        "timestamp": time.time()
+    }
+    client = current_client()
+    if client is not None:
+        record["client"] = client
+    stack = getattr(_capture, "stack", None)
+    if stack:
+        on_partial = stack[-1][1]
+        if on_partial:
+            on_partial(record)
+        return
+    result_journal.append(compress_record(record, COMPRESSION, COMPRESSION_MIN_BYTES))